@@ -1,29 +1,244 @@
 # FastAPI 启动入口
     # - 接收 OneBot 推送的所有事件（message、notice、meta_event 等）
+    # - meta_event (心跳 / 生命周期) 在字节层由 IngressFilter 处理, 不做 JSON 解码
+    # - 事件入队后立即应答, 由 DispatchQueue 的 worker 池调用 Dispatcher 处理
+    # - 请求体不是合法 JSON 或不是 JSON 对象时返回 400, 不进入 ACL / 去重 / 队列
+    # - [Dedup] 按 (self_id, message_id) / 请求体摘要丢弃 Napcat 的重发, 多 worker 时再经 SharedStore 跨进程判重
+    # - 快速回复模式下, 在截止时间内产出的回复直接作为 OneBot 快速操作写进响应体
+    # - [Reload] enabled 时由 ConfigWatcher 监视配置文件, 变更后在新快照上重建 ACL / 触发词 / 模板再原子切换
+    # - [FastAPI_Server] workers > 1 时由 uvicorn 主进程预先 fork 多个 worker 共用监听端口,
+    #   需要全局一致的状态 (命令 single-flight / 限流令牌桶) 放在 Unix socket 上的 SharedStore 协调进程里
+    # - [Napcat_Client] transport = ws / ws_reverse 时事件与 API 调用走同一条 WebSocket 长连接,
+    #   事件帧经过与 webhook 相同的 预过滤 / ACL / 去重 / 入队 流程, 回复经同一条连接发出
     # - 调用 Parser 层完成数据解析
     # - 调用 Dispatcher 分发给具体的消息处理器
+import asyncio
+import os
+import socket
+import tempfile
+
 import uvicorn
-from fastapi import FastAPI, Request
+from uvicorn.protocols.http.h11_impl import H11Protocol
+from fastapi import FastAPI, Request, WebSocket
+from fastapi.responses import JSONResponse, Response
 
-from mylib import Cerebrum
+from mylib import Cerebrum, ConfigLoader
+from mylib.api import StarletteConnection, WSClient
+from mylib.config import ConfigWatcher
+from mylib.command import registry
+from mylib.handler import DispatchQueue
+from mylib.parser import EventDeduplicator, IngressFilter
+from mylib.utils import SharedStore, codec
 
 
 class Yosa:
     def __init__(self,app: FastAPI):
         self.app = app
+        self.cfg = ConfigLoader.init_global()
         self.crm = Cerebrum()
+        self.ingress = IngressFilter()
+        self.dedup = EventDeduplicator.from_config(self.cfg) \
+            if self.cfg.get_option("Dedup", "enabled", True) else None
+        self.queue = DispatchQueue.from_config(self.crm.command_mind, self.cfg)
+        self.quick_reply = bool(self.cfg.get_option("Dispatcher", "quick_reply", True))
+        self.quick_deadline = float(self.cfg.get_option("Dispatcher", "quick_deadline", 1.0))
+        self.quick_stats = {"inline": 0, "empty": 0, "timeout": 0}
+        self.watcher = None
+        if self.cfg.get_option("Reload", "enabled", False):
+            self.watcher = ConfigWatcher.from_config(self.cfg)
+            self.watcher.subscribe(self.crm.prepare_reload)
+            self.watcher.subscribe(self._prepare_reload)
+            self.app.add_event_handler("startup", self.watcher.start)
+            self.app.add_event_handler("shutdown", self.watcher.stop)
         self._register_routes(self.app)
+        self.app.add_event_handler("startup", self.queue.start)
+        self.app.add_event_handler("shutdown", self.queue.stop)
+        client = self.crm.msgsdr.client
+        if isinstance(client, WSClient):
+            client.on_event = self._on_ws_event
+            self._register_ws_route(self.app, client)
+            self.app.add_event_handler("startup", client.start)
+            self.app.add_event_handler("shutdown", client.stop)
+        self.app.add_event_handler("shutdown", self.crm.close)
+
+    def _prepare_reload(self, cfg: ConfigLoader):
+        """快速回复开关与截止时间随配置重载切换"""
+        quick_reply = bool(cfg.get_option("Dispatcher", "quick_reply", True))
+        quick_deadline = float(cfg.get_option("Dispatcher", "quick_deadline", 1.0))
+
+        def commit() -> None:
+            self.cfg = cfg
+            self.quick_reply, self.quick_deadline = quick_reply, quick_deadline
+        return commit
     
     def _register_routes(self, app: FastAPI):
         @app.post("/")
         async def stm_msg(request: Request):
-            data = await request.json()
+            body = await request.body()
+            if not self.ingress.admit(body):
+                return Response(status_code=204)
+
+            try:
+                data = codec.loads(body)
+            except ValueError:
+                return Response(status_code=400)
+            if not isinstance(data, dict):
+                return Response(status_code=400)
             # print("接收到:", data)
-            self.crm.command_mind(data)
+            admitted, key = await self._screen(data, body)
+            if not admitted:
+                return {}
+
+            reply_to = asyncio.get_running_loop().create_future() if self.quick_reply else None
+            if not await self.queue.submit(data, reply_to):
+                if key is not None:
+                    await self._forget(key)
+                return JSONResponse(status_code=503, content={})
+            if reply_to is None:
+                return {}
+            return await self._await_quick_reply(reply_to)
+
+        @app.get("/stats")
+        async def stats():
+            return {
+                "ingress": self.ingress.snapshot(),
+                "dedup": self.dedup.snapshot() if self.dedup else None,
+                "queue": self.queue.snapshot(),
+                "quick_reply": dict(self.quick_stats),
+                "api": self.crm.msgsdr.client.stats(),
+                "ws": self.crm.msgsdr.client.snapshot() if isinstance(self.crm.msgsdr.client, WSClient) else None,
+                "commands": registry.executor.snapshot(),
+                "command_cache": registry.cache_stats(),
+                "shared": await self.crm.shared.snapshot(),
+                "info_cache": {
+                    "group": self.crm.groups.snapshot(),
+                    "user": self.crm.users.snapshot(),
+                    "notices": self.crm.events.snapshot(),
+                },
+                "config": {
+                    "reloads": self.watcher.reloads if self.watcher else 0,
+                    "reload_failures": self.watcher.failures if self.watcher else 0,
+                },
+            }
+
+    def _register_ws_route(self, app: FastAPI, client: WSClient):
+        if client.mode != "reverse":
+            return
+
+        @app.websocket(client.path)
+        async def onebot_ws(ws: WebSocket):
+            if not client.authorized(ws.headers.get("authorization"), ws.query_params.get("access_token")):
+                await ws.close(code=1008)
+                return
+            await ws.accept()
+            await client.attach(StarletteConnection(ws))
+
+    async def _on_ws_event(self, body: bytes, data: dict) -> None:
+        """WebSocket 事件帧 (WSClient 已解码): 没有 HTTP 响应可以承载快速操作, 回复都经 WSClient 发出"""
+        if not isinstance(data, dict) or not self.ingress.admit(body):
+            return
+        admitted, key = await self._screen(data, body)
+        if admitted and not await self.queue.submit(data, None) and key is not None:
+            await self._forget(key)
+
+    async def _screen(self, data: dict, body: bytes):
+        """访问控制 + 去重, 返回 (是否放行, 去重键)"""
+        if not self.crm.acl.permits_event(data):
+            return False, None
+        key = None
+        if self.dedup is not None:
+            key = self.dedup.key(data, body)
+            if await self._duplicate(key):
+                return False, key
+        return True, key
+
+    async def _duplicate(self, key) -> bool:
+        """先查本进程的环形缓冲, 多 worker 时再到协调进程 claim (重试可能落在别的 worker 上)"""
+        if self.dedup.seen(key):
+            return True
+        shared = self.crm.shared
+        if not shared.remote:
+            return False
+        try:
+            if await shared.claim(("dedup", key), self.dedup.ttl):
+                return False
+        except Exception:
+            return False
+        self.dedup.shared_duplicates += 1
+        return True
+
+    async def _forget(self, key) -> None:
+        self.dedup.forget(key)
+        if self.crm.shared.remote:
+            try:
+                await self.crm.shared.release(("dedup", key))
+            except Exception:
+                pass
+
+    async def _await_quick_reply(self, reply_to: asyncio.Future):
+        """在截止时间内等待回复; 超时则取消 future, 之后的回复由 Cerebrum 走出站接口发送"""
+        try:
+            reply = await asyncio.wait_for(asyncio.shield(reply_to), self.quick_deadline)
+        except asyncio.TimeoutError:
+            if reply_to.cancel():
+                self.quick_stats["timeout"] += 1
+                return {}
+            # 恰好在超时的同时完成, 回复仍然有效
+            reply = reply_to.result()
+
+        if reply is None:
+            self.quick_stats["empty"] += 1
             return {}
+        self.quick_stats["inline"] += 1
+        if reply.template is not None:
+            return Response(content=reply.template.quick, media_type="application/json")
+        return reply.quick_operation()
 
 
-if __name__ == "__main__":
+def create_app() -> FastAPI:
+    """uvicorn 应用工厂, 多 worker 模式下每个 worker 进程各调用一次"""
     app = FastAPI()
-    yosa = Yosa(app)
-    uvicorn.run(app, port=8080, host="0.0.0.0")
+    Yosa(app)
+    return app
+
+
+class NoDelayH11Protocol(H11Protocol):
+    """
+    多 worker 模式下监听 socket 经 pickle 传给子进程后 proto 变为 0, asyncio 不再自动设置 TCP_NODELAY,
+    响应头与响应体分两次写出时会撞上 Nagle + 延迟确认 (每个请求约 40ms), 这里在连接建立时手动打开
+    """
+    def connection_made(self, transport) -> None:
+        sock = transport.get_extra_info("socket")
+        if sock is not None and sock.family in (socket.AF_INET, socket.AF_INET6):
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        super().connection_made(transport)
+
+
+def serve(workers: int = 1, host: str = "0.0.0.0", port: int = 8080, log_level: str = "info") -> None:
+    """
+    workers == 1: 单进程, 状态都在进程内
+    workers > 1:  先启动 SharedStore 协调进程, 再由 uvicorn 主进程 fork 出 worker (共用同一个监听 socket)
+    """
+    if workers <= 1:
+        uvicorn.run(create_app(), host=host, port=port, log_level=log_level)
+        return
+
+    address = os.path.join(tempfile.gettempdir(), f"yosacat-{os.getpid()}.sock")
+    coordinator = SharedStore.serve(address, os.urandom(16))
+    try:
+        uvicorn.run("main:create_app", factory=True, workers=workers, host=host, port=port,
+                    http=NoDelayH11Protocol, log_level=log_level,
+                    app_dir=os.path.dirname(os.path.abspath(__file__)))
+    finally:
+        coordinator.shutdown()
+        if os.path.exists(address):
+            os.remove(address)
+
+
+if __name__ == "__main__":
+    cfg = ConfigLoader.init_global()
+    serve(
+        workers=int(cfg.get_option("FastAPI_Server", "workers", 1)),
+        host=cfg.fastapi_server_host,
+        port=int(cfg.fastapi_server_port),
+    )
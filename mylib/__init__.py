@@ -1,4 +1,5 @@
 from .config import ConfigLoader
 from .utils import Printer
+from .handler import Cerebrum
 
-__all__ = ["ConfigLoader", "Printer"]
+__all__ = ["ConfigLoader", "Printer", "Cerebrum"]
@@ -1,3 +1,13 @@
 # 全局库 api
 # 用于定义 Napcat 存在的接口
     # 例如 send_group_msg
+
+from .base import HTTPClient, EndpointStats, CachedInfoAPI
+from .group import GroupAPI
+from .user import UserAPI
+from .message import MessageSender
+from .template import PayloadTemplate, TemplateCache
+from .ws import WSClient, StarletteConnection, init_client
+
+__all__ = ["HTTPClient", "EndpointStats", "MessageSender", "PayloadTemplate", "TemplateCache",
+           "WSClient", "StarletteConnection", "init_client", "CachedInfoAPI", "GroupAPI", "UserAPI"]
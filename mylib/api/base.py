@@ -1,3 +1,278 @@
 # 基础 API 封装（例如统一的请求构建器、发送函数）
     # - 包含统一的 HTTPClient 封装
-    # - 例如 def post(endpoint, data): return requests.post(...)
+    # - 所有对 Napcat 的出站调用共用一个带连接池的 Session
+    # - 每次调用都有 connect/read 超时, 幂等接口失败后按指数退避 + 抖动重试
+    # - CachedInfoAPI: 群 / 用户资料等查询接口的读穿缓存基类
+import time
+import random
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+
+from mylib.etp import ApiError
+from mylib.utils import ReadThroughCache, codec
+
+
+Payload = Union[bytes, str, dict, None]
+
+
+def encode_payload(payload: Payload) -> bytes:
+    """请求体统一为字节: 已序列化的字节 / 字符串原样使用, dict 经 codec 编码"""
+    if payload is None:
+        return b"{}"
+    if isinstance(payload, bytes):
+        return payload
+    if isinstance(payload, str):
+        return payload.encode("utf-8")
+    return codec.dumps(payload)
+
+
+@dataclass
+class EndpointStats:
+    """单个接口的调用统计 (耗时单位: 秒)"""
+    calls: int = 0
+    errors: int = 0
+    retries: int = 0
+    total: float = 0.0
+    max: float = 0.0
+    last: float = 0.0
+
+    def record(self, latency: float, ok: bool) -> None:
+        self.calls += 1
+        if not ok:
+            self.errors += 1
+        self.total += latency
+        self.last = latency
+        if latency > self.max:
+            self.max = latency
+
+    def snapshot(self) -> Dict[str, Any]:
+        avg = self.total / self.calls if self.calls else 0.0
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "retries": self.retries,
+            "avg_ms": round(avg * 1000, 3),
+            "max_ms": round(self.max * 1000, 3),
+            "last_ms": round(self.last * 1000, 3),
+        }
+
+
+class HTTPClient:
+    """
+    Napcat HTTP 客户端 (支持全局单例模式)
+
+    - requests.Session + HTTPAdapter 维持 keep-alive 连接池
+    - call() 为协程接口, 实际请求在自带的线程池 (pool_size 个线程, 与连接池一样大) 中执行, 不阻塞事件循环;
+      不占用事件循环的默认线程池, Napcat 变慢时不会拖住 SharedStore 往返等其他 to_thread 调用
+    - 幂等接口 (get_* / can_*) 在超时、连接失败、5xx 时重试;
+      非幂等接口 (send_* 等) 只在连接阶段失败时重试, 避免重复发消息
+    """
+
+    IDEMPOTENT_PREFIXES = ("get_", "can_")
+
+    def __init__(self,
+                base_url: str,
+                headers: Optional[Dict[str, str]] = None,
+                connect_timeout: float = 3.0,
+                read_timeout: float = 10.0,
+                retries: int = 3,
+                backoff: float = 0.2,
+                backoff_max: float = 5.0,
+                pool_size: int = 16):
+        self.base_url = base_url.rstrip("/")
+        self.timeout: Tuple[float, float] = (connect_timeout, read_timeout)
+        self.retries = retries
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+
+        self.session = requests.Session()
+        self.session.headers.update(headers or {"Content-Type": "application/json"})
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="napcat-http")
+        self._stats: Dict[str, EndpointStats] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, cfg) -> "HTTPClient":
+        """根据 ConfigLoader 构建客户端, URL/Header 优先取 .env, 否则由 [Napcat_Server] 拼出"""
+        base_url = getattr(cfg, "url", None) or \
+            f"http://{cfg.napcat_server_host}:{cfg.napcat_server_port}"
+
+        headers = getattr(cfg, "header", None)
+        if headers is None:
+            headers = {"Content-Type": "application/json"}
+            token = getattr(cfg, "napcat_server_token", "")
+            if token:
+                headers["Authorization"] = f"Bearer {token}"
+
+        return cls(
+            base_url,
+            headers=dict(headers),
+            connect_timeout=float(cfg.get_option("Napcat_Client", "connect_timeout", 3.0)),
+            read_timeout=float(cfg.get_option("Napcat_Client", "read_timeout", 10.0)),
+            retries=int(cfg.get_option("Napcat_Client", "retries", 3)),
+            backoff=float(cfg.get_option("Napcat_Client", "backoff", 0.2)),
+            backoff_max=float(cfg.get_option("Napcat_Client", "backoff_max", 5.0)),
+            pool_size=int(cfg.get_option("Napcat_Client", "pool_size", 16)),
+        )
+
+
+    # ------------------- 全局单例模式 -------------------
+    _global_instance: Optional["HTTPClient"] = None
+
+    @classmethod
+    def init_global(cls, cfg) -> "HTTPClient":
+        """初始化全局客户端"""
+        if cls._global_instance is None:
+            cls._global_instance = cls.from_config(cfg)
+        return cls._global_instance
+
+    @classmethod
+    def get_global(cls) -> "HTTPClient":
+        """获取全局客户端"""
+        if cls._global_instance is None:
+            raise RuntimeError("HTTPClient 未初始化，请先调用 init_global()")
+        return cls._global_instance
+
+
+    # ------------------- 对外接口 -------------------
+    async def call(self,
+                action: str,
+                payload: Payload = None,
+                idempotent: Optional[bool] = None,
+                timeout: Optional[Tuple[float, float]] = None) -> Dict[str, Any]:
+        """异步调用 OneBot 接口, 例如 await client.call("send_group_msg", data)"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.request, action, payload, idempotent, timeout)
+
+    def request(self,
+                action: str,
+                payload: Payload = None,
+                idempotent: Optional[bool] = None,
+                timeout: Optional[Tuple[float, float]] = None) -> Dict[str, Any]:
+        """同步调用 OneBot 接口, 返回响应 JSON"""
+        if idempotent is None:
+            idempotent = action.startswith(self.IDEMPOTENT_PREFIXES)
+
+        action = action.lstrip("/")
+        url = f"{self.base_url}/{action}"
+        body = self._encode(payload)
+        stats = self._endpoint(action)
+
+        attempt = 0
+        while True:
+            start = time.perf_counter()
+            try:
+                response = self.session.post(url, data=body, timeout=timeout or self.timeout)
+                if response.status_code >= 500 and idempotent:
+                    raise _RetryableStatus(response.status_code)
+                response.raise_for_status()
+                self._record(stats, time.perf_counter() - start, True)
+                return codec.loads(response.content) if response.content else {}
+
+            except (requests.ConnectionError, requests.Timeout, _RetryableStatus) as e:
+                self._record(stats, time.perf_counter() - start, False)
+                if attempt >= self.retries or not self._retryable(e, idempotent):
+                    raise ApiError(f"调用 {action} 失败 (重试 {attempt} 次): {e}") from e
+
+            except (requests.RequestException, ValueError) as e:
+                self._record(stats, time.perf_counter() - start, False)
+                raise ApiError(f"调用 {action} 失败: {e}") from e
+
+            attempt += 1
+            with self._lock:
+                stats.retries += 1
+            time.sleep(self._delay(attempt))
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """各接口的调用次数、错误数与耗时统计"""
+        with self._lock:
+            return {name: s.snapshot() for name, s in self._stats.items()}
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
+        self.session.close()
+
+
+    # ------------------- 内部工具 -------------------
+    def _encode(self, payload: Payload) -> bytes:
+        return encode_payload(payload)
+
+    def _retryable(self, error: Exception, idempotent: bool) -> bool:
+        """非幂等接口只有在请求确定没有发出时 (连接超时 / 连接被拒绝) 才重试"""
+        if idempotent or isinstance(error, requests.ConnectTimeout):
+            return True
+        reason = getattr(error.args[0], "reason", None) if error.args else None
+        return isinstance(reason, NewConnectionError)
+
+    def _delay(self, attempt: int) -> float:
+        """指数退避 + full jitter"""
+        ceiling = min(self.backoff_max, self.backoff * (2 ** (attempt - 1)))
+        return random.uniform(0, ceiling)
+
+    def _endpoint(self, action: str) -> EndpointStats:
+        stats = self._stats.get(action)
+        if stats is None:
+            with self._lock:
+                stats = self._stats.setdefault(action, EndpointStats())
+        return stats
+
+    def _record(self, stats: EndpointStats, latency: float, ok: bool) -> None:
+        with self._lock:
+            stats.record(latency, ok)
+
+
+class _RetryableStatus(Exception):
+    """幂等接口收到 5xx, 交给重试逻辑处理"""
+    def __init__(self, status: int):
+        super().__init__(f"HTTP {status}")
+        self.status = status
+
+
+class CachedInfoAPI:
+    """
+    查询类接口的基类 (群资料 / 用户资料等)
+
+    - 结果经 ReadThroughCache 缓存, 并发的相同查询只请求一次 Napcat
+    - retcode 非 0 时抛出 ApiError, 失败结果不缓存
+    - 由 [Info_Cache] maxsize / ttl 控制容量与存活时间
+    """
+    def __init__(self, client, maxsize: int = 1024, ttl: float = 300.0):
+        self.client = client
+        self.cache = ReadThroughCache(maxsize, ttl)
+
+    @classmethod
+    def from_config(cls, client, cfg):
+        return cls(
+            client,
+            maxsize=int(cfg.get_option("Info_Cache", "maxsize", 1024)),
+            ttl=float(cfg.get_option("Info_Cache", "ttl", 300.0)),
+        )
+
+    async def _lookup(self, key: Tuple[Any, ...], action: str, params: Dict[str, Any], no_cache: bool = False) -> Any:
+        """key 的第一项为查询种类, 其余为参数, 便于按群 / 用户批量失效"""
+        def loader():
+            return self._fetch(action, params)
+        if no_cache:
+            return await self.cache.refresh(key, loader)
+        return await self.cache.get(key, loader)
+
+    async def _fetch(self, action: str, params: Dict[str, Any]) -> Any:
+        response = await self.client.call(action, params)
+        retcode = response.get("retcode", 0)
+        if retcode != 0:
+            raise ApiError(f"{action} 返回 retcode={retcode}: {response.get('wording') or response.get('message', '')}")
+        return response.get("data")
+
+    def snapshot(self) -> Dict[str, Any]:
+        return self.cache.snapshot()
@@ -1 +1,40 @@
 # 群组相关接口封装（/set_group_card, /get_group_info 等）
+    # - 查询接口走 CachedInfoAPI 的读穿缓存, 缓存键第一项为种类: group / member / members / groups
+    # - 成员变动 / 管理员变动 / 名片修改等 notice 由 EventHandler 调用 invalidate_* 失效对应条目
+    # - no_cache=True 强制回源并刷新缓存
+from typing import Any, Dict, List
+
+from .base import CachedInfoAPI
+
+
+class GroupAPI(CachedInfoAPI):
+    async def get_group_info(self, group_id: int, no_cache: bool = False) -> Dict[str, Any]:
+        return await self._lookup(("group", group_id), "get_group_info",
+                                  {"group_id": group_id}, no_cache)
+
+    async def get_group_member_info(self, group_id: int, user_id: int, no_cache: bool = False) -> Dict[str, Any]:
+        return await self._lookup(("member", group_id, user_id), "get_group_member_info",
+                                  {"group_id": group_id, "user_id": user_id}, no_cache)
+
+    async def get_group_member_list(self, group_id: int, no_cache: bool = False) -> List[Dict[str, Any]]:
+        return await self._lookup(("members", group_id), "get_group_member_list",
+                                  {"group_id": group_id}, no_cache)
+
+    async def get_group_list(self, no_cache: bool = False) -> List[Dict[str, Any]]:
+        return await self._lookup(("groups",), "get_group_list", {}, no_cache)
+
+    # ------------------- 失效 -------------------
+    def invalidate_member(self, group_id: int, user_id: int) -> None:
+        """成员资料变化 (名片 / 头衔 / 权限 / 禁言): 成员详情与成员列表"""
+        self.cache.invalidate(("member", group_id, user_id))
+        self.cache.invalidate(("members", group_id))
+
+    def invalidate_group(self, group_id: int) -> None:
+        """群资料变化 (人数等): 群信息与群列表"""
+        self.cache.invalidate(("group", group_id))
+        self.cache.invalidate(("groups",))
+
+    def forget_group(self, group_id: int) -> int:
+        """机器人退群 / 被踢: 丢弃该群的全部缓存"""
+        self.cache.invalidate(("groups",))
+        return self.cache.invalidate_where(lambda key: len(key) > 1 and key[0] != "groups" and key[1] == group_id)
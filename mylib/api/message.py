@@ -2,3 +2,179 @@
     # - build_text_message()
     # - build_image_message()
     # - send_group_message()
+from typing import Literal, Optional, Union
+
+from mylib.config import ConfigLoader
+from mylib.typ.message import TextMessage, TextMessageData, ImageMessage, ImageMessageData
+from mylib.typ.base import BaseSend
+from mylib.typ.send_types import SendGroupMsg, SendPrivateMsg
+from mylib.typ import Reply
+from mylib.utils import codec
+
+from .template import TemplateCache
+from .ws import init_client
+
+
+def _build_json(data: SendGroupMsg) -> str:
+    """转为JSON字符串"""
+    return data.model_dump_json(indent=2, ensure_ascii=False)
+
+
+def build_text_message(text: str) -> TextMessage:
+    return TextMessage(type="text", data=TextMessageData(text=text))
+
+
+def build_image_message(file: str) -> ImageMessage:
+    return ImageMessage(type="image", data=ImageMessageData(file=file))
+
+
+def build_group_model(
+        group_id: int,
+        mode: Literal["text", "image"],
+        text_data: str = "miss you~",
+        image_file_data: str = "https://www.loliapi.com/bg/",
+) -> SendGroupMsg:
+    if mode == "text":
+        msg = build_text_message(text_data)
+
+    if mode == "image":
+        msg = build_image_message(image_file_data)
+
+    return SendGroupMsg(
+        group_id=group_id,
+        message=msg
+    )
+
+
+def build_private_model(user_id: int, text_data: str) -> SendPrivateMsg:
+    return SendPrivateMsg(user_id=user_id, message=build_text_message(text_data))
+
+
+def build_group_message(
+        group_id: int,
+        mode: Literal["text", "image"],
+        text_data: str = "miss you~",
+        image_file_data: str = "https://www.loliapi.com/bg/",
+) -> str:
+    return _build_json(build_group_model(group_id, mode, text_data, image_file_data))
+
+
+class MessageSender:
+    """消息发送, 所有请求经由共享的出站客户端发出 (HTTPClient 或 WSClient, 见 [Napcat_Client] transport)"""
+    def __init__(self):
+        self.cfg = ConfigLoader.init_global()
+        self.client = init_client(self.cfg)
+        self.ascii_json = bool(self.cfg.get_option("Napcat_Client", "ascii_json", False))
+        self.templates = TemplateCache(self.ascii_json)
+
+    async def _send(self,
+                    action: str,
+                    payload: Union[BaseSend, dict],
+                    ascii_only: Optional[bool] = None) -> dict:
+        """
+        编码一次后直接发出; ascii_only 默认跟随 [Napcat_Client] ascii_json
+        发送模型走自身的编译序列化器, 普通 dict 走 codec
+        """
+        if ascii_only is None:
+            ascii_only = self.ascii_json
+        if isinstance(payload, BaseSend):
+            body = payload.to_bytes(ascii_only=ascii_only)
+        else:
+            body = codec.dumps(payload, ascii_only=ascii_only)
+        return await self.client.call(action, body)
+
+
+    # ------------------- 回复构造 (可直接作为快速操作返回) -------------------
+    def text_reply(self, msg: str = "miss you~") -> Reply:
+        return Reply([build_text_message(msg).model_dump()])
+
+    def image_reply(self, file: str = "https://www.loliapi.com/bg/") -> Reply:
+        return Reply([build_image_message(file).model_dump()])
+
+    def file_image_reply(self, path: str = "test_image") -> Reply:
+        """图片地址保存在本地文件中"""
+        with open(path, 'r', encoding='utf-8') as f:
+            img = f.read()
+        return Reply([{"type": "image", "data": {"file": img}}])
+
+    def freeze(self, reply: Reply, templates: Optional[TemplateCache] = None) -> Reply:
+        """
+        把固定回复登记进模板缓存, 之后发送 / 快速回复都直接使用预序列化字节
+        templates: 重载时传入为新配置准备的缓存, 默认使用当前缓存
+        """
+        reply.template = (self.templates if templates is None else templates).get(reply)
+        return reply
+
+    def reconfigure(self, cfg, templates: TemplateCache) -> None:
+        """切换到新配置快照 (由 MessageHandler 在重载提交时调用)"""
+        self.cfg = cfg
+        self.ascii_json = templates.ascii_only
+        self.templates = templates
+
+    async def send_reply(self, group_id: Optional[int], reply: Reply, user_id: Optional[int] = None) -> dict:
+        """
+        发出一条 Reply: 有 group_id 时走 /send_group_msg, 否则 (私聊) 走 /send_private_msg 发给 user_id;
+        有模板时只拼接群号 / QQ 号
+        """
+        if group_id is None:
+            if reply.template is not None:
+                return await self.client.call("send_private_msg", reply.template.render_private(user_id))
+            return await self._send("send_private_msg", {"user_id": user_id, "message": reply.segments})
+        if reply.template is not None:
+            return await self.client.call("send_group_msg", reply.template.render(group_id))
+        return await self._send("send_group_msg", {"group_id": group_id, "message": reply.segments})
+
+    async def send_text(self,
+                        group_id: Optional[int],
+                        user_id: Optional[int],
+                        msg: str,
+                        ascii_only: Optional[bool] = None) -> dict:
+        """回复一段文本: 群聊发到 group_id, 私聊 (group_id 为 None) 发给 user_id"""
+        if group_id is None:
+            return await self._send("send_private_msg", build_private_model(user_id, msg), ascii_only)
+        return await self._send("send_group_msg", build_group_model(group_id, "text", text_data=msg), ascii_only)
+
+
+    # ------------------- 主动发送 -------------------
+    async def send_group_img(self, group_id: int):
+        return await self.send_reply(group_id, self.file_image_reply())
+
+    async def send_group_img_loli(self, group_id: int):
+        return await self.send_reply(group_id, self.image_reply("https://www.loliapi.com/bg/"))
+
+    async def send_group_msg(
+            self,
+            group_id: int,
+            msg: str = "miss you~"
+    ) -> dict:
+        send_msg = build_group_model(group_id, "text", text_data=msg)
+        return await self._send("send_group_msg", send_msg)
+
+    async def send_msg(
+            self,
+            id: int,
+            msg: str = ""
+    ) -> dict:
+        send_msg = build_group_model(id, "text", text_data=msg)
+        return await self._send("send_group_msg", send_msg)
+
+    async def send_private_msg(
+            self,
+            user_id: int,
+            msg: str = "miss you~"
+    ) -> dict:
+        return await self._send("send_private_msg", build_private_model(user_id, msg))
+
+    async def send_msg_test(
+            self,
+            id: int,
+            msg: str = ""
+    ) -> dict:
+        """
+        本地转义 Unicode 形式发送消息，用于 Napcat 不支持 UTF-8 的情况。
+        """
+        # --- 先构造消息 ---
+        send_msg = build_group_model(id, "text", text_data=msg)
+
+        # --- 编码时一次性把中文等非 ASCII 字符转义成 \uXXXX ---
+        return await self._send("send_group_msg", send_msg, ascii_only=True)
@@ -0,0 +1,62 @@
+# 预序列化的回复模板
+    # - 固定回复 (关键词触发的文本 / 图片) 在编译期校验并序列化一次, 之后只做字节拼接
+    # - /send_group_msg 请求体 = 前缀 + 群号 + 后缀, group_id 是唯一的拼接点; /send_private_msg 同理拼接 user_id
+    # - 快速操作响应体与群号无关, 直接缓存整段字节
+    # - 配置重载时由 MessageHandler.rebuild() 清空缓存, 旧模板随旧索引一起释放
+from typing import Dict, Optional, Tuple
+
+from mylib.typ import Reply
+from mylib.utils import codec
+
+
+class PayloadTemplate:
+    """
+    一条固定回复的请求体模板 (只读)
+
+    render(group_id) / render_private(user_id) 只做一次 bytes 格式化, 不再构造模型 / dict, 也不再走 JSON 编码
+    """
+    __slots__ = ("_send_fmt", "_private_fmt", "quick")
+
+    def __init__(self, reply: Reply, ascii_only: bool = False):
+        message = codec.dumps(reply.segments, ascii_only=ascii_only)
+        # 群号放在最前面, 后面的内容里的 % 需要转义
+        tail = b',"message":' + message.replace(b"%", b"%%") + b"}"
+        self._send_fmt: bytes = b'{"group_id":%d' + tail
+        self._private_fmt: bytes = b'{"user_id":%d' + tail
+        self.quick: bytes = codec.dumps(reply.quick_operation(), ascii_only=ascii_only)
+
+    def render(self, group_id: int) -> bytes:
+        """拼出发往 group_id 的 /send_group_msg 请求体"""
+        return self._send_fmt % group_id
+
+    def render_private(self, user_id: int) -> bytes:
+        """拼出发给 user_id 的 /send_private_msg 请求体"""
+        return self._private_fmt % user_id
+
+
+class TemplateCache:
+    """
+    固定回复 -> 模板 的缓存
+
+    按序列化后的内容去重, 内容相同的规则共用一份模板;
+    ascii_only 跟随 [Napcat_Client] ascii_json, 配置重载后需要 clear()
+    """
+    def __init__(self, ascii_only: bool = False):
+        self.ascii_only = ascii_only
+        self._templates: Dict[Tuple[bytes, bool], PayloadTemplate] = {}
+
+    def get(self, reply: Reply) -> PayloadTemplate:
+        key = (codec.dumps(reply.segments), reply.at_sender)
+        template = self._templates.get(key)
+        if template is None:
+            template = self._templates[key] = PayloadTemplate(reply, self.ascii_only)
+        return template
+
+    def clear(self, ascii_only: Optional[bool] = None) -> None:
+        """丢弃全部模板; 传入 ascii_only 时顺带切换编码模式"""
+        if ascii_only is not None:
+            self.ascii_only = ascii_only
+        self._templates.clear()
+
+    def __len__(self) -> int:
+        return len(self._templates)
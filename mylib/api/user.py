@@ -1 +1,26 @@
 # 用户相关接口封装（/get_login_info, /get_stranger_info, /get_group_member_info 等）
+    # - 查询接口走 CachedInfoAPI 的读穿缓存, 缓存键第一项为种类: stranger / friends / login
+    # - 群成员资料 (get_group_member_info) 按群区分, 见 GroupAPI
+    # - 加好友等 notice 由 EventHandler 调用 invalidate_* 失效对应条目
+from typing import Any, Dict, List
+
+from .base import CachedInfoAPI
+
+
+class UserAPI(CachedInfoAPI):
+    async def get_login_info(self, no_cache: bool = False) -> Dict[str, Any]:
+        return await self._lookup(("login",), "get_login_info", {}, no_cache)
+
+    async def get_stranger_info(self, user_id: int, no_cache: bool = False) -> Dict[str, Any]:
+        return await self._lookup(("stranger", user_id), "get_stranger_info",
+                                  {"user_id": user_id}, no_cache)
+
+    async def get_friend_list(self, no_cache: bool = False) -> List[Dict[str, Any]]:
+        return await self._lookup(("friends",), "get_friend_list", {}, no_cache)
+
+    # ------------------- 失效 -------------------
+    def invalidate_user(self, user_id: int) -> None:
+        self.cache.invalidate(("stranger", user_id))
+
+    def invalidate_friends(self) -> None:
+        self.cache.invalidate(("friends",))
@@ -0,0 +1,339 @@
+# WebSocket 传输 (OneBot v11)
+    # - 一条长连接同时承载事件上报与 API 调用, 取代 webhook + /send_* 两段 HTTP
+    # - forward: 主动连接 Napcat 的 WebSocket 服务 (ws_url), 断线后按指数退避 + 抖动自动重连
+    # - reverse: Napcat 连接我们的 FastAPI 路由 (ws_path), 连接由 attach() 接管, 重连由 Napcat 负责
+    # - API 帧: {"action": ..., "echo": n, "params": <请求体>}, 请求体字节直接拼进帧里, 模板回复不再重新编码
+    # - 响应帧按 echo 找到对应的 future; 顶层带 post_type 的帧是事件, 连同解码结果交给 on_event (与 webhook 共用入口流程)
+    # - 与 HTTPClient 相同的 call() / stats() / close() 接口, MessageSender 不需要区分传输方式
+    # - 重试规则与 HTTPClient 一致: 幂等接口断线 / 超时后重试, 非幂等接口只在帧确定没有发出时重试
+import asyncio
+import itertools
+import random
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Literal, Optional, Set, Tuple, Union
+
+from mylib.etp import ApiError
+from mylib.utils import Printer, codec
+
+from .base import EndpointStats, HTTPClient, Payload, encode_payload
+
+
+Mode = Literal["forward", "reverse"]
+EventHandler = Callable[[bytes, Dict[str, Any]], Awaitable[None]]
+
+
+class WebsocketsConnection:
+    """websockets 库的客户端连接 (forward 模式)"""
+    def __init__(self, ws):
+        self.ws = ws
+
+    async def send(self, frame: bytes) -> None:
+        await self.ws.send(frame.decode("utf-8"))
+
+    async def __aiter__(self) -> AsyncIterator[Union[str, bytes]]:
+        async for message in self.ws:
+            yield message
+
+
+class StarletteConnection:
+    """FastAPI / Starlette 的服务端连接 (reverse 模式)"""
+    def __init__(self, ws):
+        self.ws = ws
+
+    async def send(self, frame: bytes) -> None:
+        await self.ws.send_text(frame.decode("utf-8"))
+
+    async def __aiter__(self) -> AsyncIterator[Union[str, bytes]]:
+        while True:
+            message = await self.ws.receive()
+            if message["type"] == "websocket.disconnect":
+                return
+            data = message.get("text")
+            yield data if data is not None else message.get("bytes", b"")
+
+
+class WSClient:
+    """
+    Napcat WebSocket 客户端 (支持全局单例模式)
+
+    mode: forward (主动连接 url) / reverse (等待 Napcat 连接 path)
+    on_event: 事件帧回调, 参数为 (原始帧字节, 解码后的事件)
+    """
+
+    IDEMPOTENT_PREFIXES = HTTPClient.IDEMPOTENT_PREFIXES
+
+    def __init__(self,
+                mode: Mode = "forward",
+                url: Optional[str] = None,
+                path: str = "/onebot/v11/ws",
+                token: str = "",
+                connect_timeout: float = 3.0,
+                read_timeout: float = 10.0,
+                retries: int = 3,
+                backoff: float = 0.2,
+                backoff_max: float = 5.0):
+        if mode not in ("forward", "reverse"):
+            raise ValueError(f"未知的 WebSocket 模式: {mode}")
+        if mode == "forward" and not url:
+            raise ValueError("forward 模式需要 ws_url")
+        self.mode = mode
+        self.url = url
+        self.path = path
+        self.token = token
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+        self.on_event: Optional[EventHandler] = None
+
+        self.connects = 0
+        self.events = 0
+        self.printer = Printer()
+        self._conn: Optional[Any] = None
+        self._connected = asyncio.Event()
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._echo = itertools.count(1)
+        self._stats: Dict[str, EndpointStats] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self._runner: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_config(cls, cfg) -> "WSClient":
+        """[Napcat_Client] transport = ws (forward) / ws_reverse, 地址默认由 [Napcat_Server] 拼出"""
+        mode: Mode = "reverse" if cfg.get_option("Napcat_Client", "transport") == "ws_reverse" else "forward"
+        url = cfg.get_option("Napcat_Client", "ws_url") or \
+            f"ws://{cfg.napcat_server_host}:{cfg.napcat_server_port}"
+        return cls(
+            mode,
+            url=url,
+            path=cfg.get_option("Napcat_Client", "ws_path", "/onebot/v11/ws"),
+            token=getattr(cfg, "napcat_server_token", "") or "",
+            connect_timeout=float(cfg.get_option("Napcat_Client", "connect_timeout", 3.0)),
+            read_timeout=float(cfg.get_option("Napcat_Client", "read_timeout", 10.0)),
+            retries=int(cfg.get_option("Napcat_Client", "retries", 3)),
+            backoff=float(cfg.get_option("Napcat_Client", "backoff", 0.2)),
+            backoff_max=float(cfg.get_option("Napcat_Client", "backoff_max", 5.0)),
+        )
+
+
+    # ------------------- 全局单例模式 -------------------
+    _global_instance: Optional["WSClient"] = None
+
+    @classmethod
+    def init_global(cls, cfg) -> "WSClient":
+        """初始化全局客户端"""
+        if cls._global_instance is None:
+            cls._global_instance = cls.from_config(cfg)
+        return cls._global_instance
+
+    @classmethod
+    def get_global(cls) -> "WSClient":
+        """获取全局客户端"""
+        if cls._global_instance is None:
+            raise RuntimeError("WSClient 未初始化，请先调用 init_global()")
+        return cls._global_instance
+
+
+    # ------------------- 连接生命周期 -------------------
+    @property
+    def connected(self) -> bool:
+        return self._conn is not None
+
+    async def start(self) -> None:
+        """forward 模式启动连接 / 重连循环; reverse 模式等待 attach()"""
+        if self.mode == "forward" and self._runner is None:
+            self._runner = asyncio.create_task(self._run_forward())
+
+    async def stop(self) -> None:
+        runner, self._runner = self._runner, None
+        if runner is not None:
+            runner.cancel()
+            try:
+                await runner
+            except asyncio.CancelledError:
+                pass
+        self._fail_pending(ApiError("WebSocket 客户端已关闭"))
+
+    def close(self) -> None:
+        """同步关闭 (与 HTTPClient.close 对应): 取消连接循环, 等待中的调用立即失败"""
+        if self._runner is not None:
+            self._runner.cancel()
+            self._runner = None
+        self._fail_pending(ApiError("WebSocket 客户端已关闭"))
+
+    def authorized(self, authorization: Optional[str], access_token: Optional[str]) -> bool:
+        """reverse 模式校验 Napcat 带来的 Authorization: Bearer <token> 或 ?access_token="""
+        if not self.token:
+            return True
+        return authorization == f"Bearer {self.token}" or access_token == self.token
+
+    async def attach(self, conn) -> None:
+        """reverse 模式: 接管一条已 accept 的连接, 直到对端断开才返回"""
+        await self._serve(conn)
+
+    async def _run_forward(self) -> None:
+        from websockets.asyncio.client import connect
+
+        headers = {"Authorization": f"Bearer {self.token}"} if self.token else None
+        attempt = 0
+        while True:
+            try:
+                async with connect(self.url, additional_headers=headers,
+                                   open_timeout=self.connect_timeout, max_size=None) as ws:
+                    attempt = 0
+                    try:
+                        await self._serve(WebsocketsConnection(ws))
+                    except asyncio.CancelledError:
+                        # 主动关闭时正常挥手 (1000), 不让对端看到 1011
+                        await ws.close()
+                        raise
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.printer.cprint("yellow", f"[WSClient] 连接 {self.url} 失败: {e}")
+            attempt += 1
+            await asyncio.sleep(self._delay(attempt))
+
+    async def _serve(self, conn) -> None:
+        self._conn = conn
+        self._connected.set()
+        self.connects += 1
+        try:
+            async for frame in conn:
+                self._dispatch(frame if isinstance(frame, bytes) else frame.encode("utf-8"))
+        finally:
+            if self._conn is conn:
+                self._conn = None
+                self._connected.clear()
+                self._fail_pending(ConnectionError("WebSocket 连接断开"))
+
+    def _dispatch(self, frame: bytes) -> None:
+        """
+        每帧只解码一次, 按顶层键分流: 带 post_type 的是事件帧, 其余按 echo 唤醒对应的调用
+        (get_msg 等接口的响应 data 里嵌着完整的消息事件, 不能只在字节里找 "post_type");
+        不是合法 JSON 对象的帧直接丢弃, 不中断读循环
+        """
+        try:
+            data = codec.loads(frame)
+        except ValueError:
+            self.printer.cprint("yellow", f"[WSClient] 丢弃无法解码的帧: {frame[:64]!r}")
+            return
+        if not isinstance(data, dict):
+            return
+        if "post_type" in data:
+            self.events += 1
+            if self.on_event is not None:
+                # 事件入口可能在队列满时等待, 不能阻塞读循环 (否则 API 响应也收不到)
+                task = asyncio.create_task(self.on_event(frame, data))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+            return
+
+        future = self._pending.pop(data.get("echo"), None)
+        if future is not None and not future.done():
+            future.set_result(data)
+
+    def _fail_pending(self, error: Exception) -> None:
+        pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(error)
+
+
+    # ------------------- 对外接口 -------------------
+    async def call(self,
+                action: str,
+                payload: Payload = None,
+                idempotent: Optional[bool] = None,
+                timeout: Optional[Tuple[float, float]] = None) -> Dict[str, Any]:
+        """与 HTTPClient.call 相同: 返回 OneBot 响应 (status / retcode / data); timeout 取 (connect, read)"""
+        if idempotent is None:
+            idempotent = action.startswith(self.IDEMPOTENT_PREFIXES)
+        connect_timeout, read_timeout = timeout or (self.connect_timeout, self.read_timeout)
+
+        action = action.lstrip("/")
+        frame_head = b'{"action":' + codec.dumps(action) + b',"echo":'
+        frame_tail = b',"params":' + encode_payload(payload) + b"}"
+        stats = self._endpoint(action)
+        loop = asyncio.get_running_loop()
+
+        attempt = 0
+        while True:
+            start = time.perf_counter()
+            sent = False
+            echo = next(self._echo)
+            future = self._pending[echo] = loop.create_future()
+            try:
+                conn = await self._connection(connect_timeout)
+                try:
+                    await conn.send(frame_head + str(echo).encode() + frame_tail)
+                except Exception as e:
+                    # websockets 的 ConnectionClosed / Starlette 的 RuntimeError 统一按连接失败处理
+                    raise ConnectionError(f"发送失败: {e!r}") from e
+                sent = True
+                data = await asyncio.wait_for(future, read_timeout)
+                stats.record(time.perf_counter() - start, True)
+                return data
+
+            except (ConnectionError, asyncio.TimeoutError, OSError) as e:
+                stats.record(time.perf_counter() - start, False)
+                if attempt >= self.retries or (sent and not idempotent):
+                    raise ApiError(f"调用 {action} 失败 (重试 {attempt} 次): {e!r}") from e
+
+            finally:
+                self._pending.pop(echo, None)
+                if not future.done():
+                    future.cancel()
+
+            attempt += 1
+            stats.retries += 1
+            await asyncio.sleep(self._delay(attempt))
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """各接口的调用次数、错误数与耗时统计"""
+        return {name: s.snapshot() for name, s in self._stats.items()}
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "connected": self.connected,
+            "connects": self.connects,
+            "events": self.events,
+            "pending": len(self._pending),
+        }
+
+
+    # ------------------- 内部工具 -------------------
+    async def _connection(self, timeout: float):
+        """等待可用连接, timeout 秒内没有连上则按连接失败处理"""
+        if self._conn is None:
+            try:
+                await asyncio.wait_for(self._connected.wait(), timeout)
+            except asyncio.TimeoutError:
+                raise ConnectionError("WebSocket 未连接") from None
+        conn = self._conn
+        if conn is None:
+            raise ConnectionError("WebSocket 未连接")
+        return conn
+
+    def _delay(self, attempt: int) -> float:
+        """指数退避 + full jitter"""
+        ceiling = min(self.backoff_max, self.backoff * (2 ** (attempt - 1)))
+        return random.uniform(0, ceiling)
+
+    def _endpoint(self, action: str) -> EndpointStats:
+        stats = self._stats.get(action)
+        if stats is None:
+            stats = self._stats[action] = EndpointStats()
+        return stats
+
+
+def init_client(cfg) -> Union[HTTPClient, WSClient]:
+    """按 [Napcat_Client] transport 选择出站传输: http (默认) / ws / ws_reverse"""
+    transport = cfg.get_option("Napcat_Client", "transport", "http")
+    if transport in ("ws", "ws_reverse"):
+        return WSClient.init_global(cfg)
+    if transport != "http":
+        raise ValueError(f"未知的传输方式: {transport}")
+    return HTTPClient.init_global(cfg)
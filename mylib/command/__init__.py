@@ -6,11 +6,12 @@
 # 启发于 GNU/Linux
 
 
-from .parser import CommandParser
+from mylib.parser import CommandParser
 from .registry import registry
 from .decorators import simple_command, command, argument
 
 
-registry.auto_import()
+# 只读取命令清单, 命令模块首次使用时才导入
+registry.load_manifest()
 
 __all__ = ["CommandParser", "registry", "simple_command", "command", "argument"]
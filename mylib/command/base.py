@@ -1,5 +1,5 @@
 from dataclasses import dataclass, field
-from typing import List, Type, Any
+from typing import List, Literal, Type, Any, Optional
 
 
 @dataclass
@@ -7,7 +7,7 @@ class Param:
     """表示一个命令参数/选项的定义。
     short: 短形式 (例如 '-o' ) 
     long: 长形式 (例如 '--object' ) 
-    value_type: 期望的值类型 (用于转换，当前实现不自动转换 ) 
+    value_type: 期望的值类型 (执行前由 CommandSpec 统一转换 ) 
     required: 是否为必填参数
     """
     short: str
@@ -23,71 +23,57 @@ class CommandMeta:
     description: 命令说明
     params: 参数定义列表 (Param ) 
     cls: 对应的命令实现类 (子类继承自 BaseCommand ) 
+    mode: 执行方式 sync / async / process (由 @command 根据 execute 与 cpu_bound 决定)
+    timeout: 单次执行超时秒数, None 表示使用 [Command].timeout
+    max_concurrency: 同时执行的上限, None 表示使用 [Command].max_concurrency
+    cache_ttl: 结果缓存秒数, None 表示不缓存 (只适合幂等的查询类命令)
+    cache_size: 结果缓存的条目上限
+    spec: 注册时编译出的 CommandSpec
     """
     name: str
     description: str
     params: List[Param] = field(default_factory=list)
     cls: Type = None
+    mode: Literal["sync", "async", "process"] = "sync"
+    timeout: Optional[float] = None
+    max_concurrency: Optional[int] = None
+    cache_ttl: Optional[float] = None
+    cache_size: int = 128
+    spec: Any = field(default=None, compare=False, repr=False)
 
 
 class BaseCommand:
     """高级命令实现的基类。
-    构造时接收解析后的 params (dict)，提供 get(*names, default=None) 按多个别名查找参数值并根据 CommandMeta.Param.value_type 自动转换。
+    构造时接收解析后的原始 params 与 CommandSpec.bind() 产出的 ns (不可变命名元组),
+    execute() 中直接读 self.ns.<长参数名> 即可; get(*names, default=None) 按别名读取, 保留兼容。
+    execute() 可以是普通方法 (在命令线程池中执行) 或 async def (在事件循环中执行)。
     """
-    def __init__(self, params):
+    def __init__(self, params, ns: Optional[tuple] = None):
         self.params = params
+        if ns is None:
+            spec = self._spec()
+            if spec is not None:
+                ns, error = spec.bind(params)
+                if error is not None:
+                    raise ValueError(error)
+        self.ns = ns
 
-    def _find_param_meta(self, name: str) -> Param | None:
-        """根据短/长名在类上绑定的 _command_meta 中查找 Param 元数据。"""
-        meta = getattr(self.__class__, "_command_meta", None)
-        if not meta:
-            return None
-        for p in meta.params:
-            if p.short == name or p.long == name:
-                return p
-        return None
-
-    def _convert_value(self, raw: Any, target_type: Any) -> Any:
-        """尝试将 raw 转换为 target_type。若失败则返回 raw。"""
-        try:
-            if target_type is bool:
-                if raw is True or raw is False:
-                    return bool(raw)
-                if isinstance(raw, str):
-                    r = raw.strip().lower()
-                    if r in ("1", "true", "yes", "on"):
-                        return True
-                    if r in ("0", "false", "no", "off"):
-                        return False
-                    return True
-                return bool(raw)
-
-            if target_type is list:
-                if isinstance(raw, list):
-                    return raw
-                if isinstance(raw, str):
-                    return [s.strip() for s in raw.split(",") if s.strip() != ""]
-                return [raw]
-
-            if target_type is int:
-                return int(raw)
-            if target_type is float:
-                return float(raw)
-
-            if callable(target_type):
-                return target_type(raw)
-
-            return raw
-        except Exception:
-            return raw
+    @classmethod
+    def _spec(cls):
+        meta = getattr(cls, "_command_meta", None)
+        return meta.spec if meta else None
 
     def get(self, *names, default=None):
-        """按别名依次查找参数值；若找到并有对应 Param 定义，则做类型转换后返回。"""
+        """按别名依次查找参数值；已声明的参数返回转换后的值，其余返回原始值。"""
+        spec = self._spec()
         for n in names:
+            if spec is not None and self.ns is not None:
+                i = spec.aliases.get(n)
+                if i is not None:
+                    value = self.ns[i]
+                    if value is not None:
+                        return value
+                    continue
             if n in self.params:
-                raw = self.params[n]
-                param_meta = self._find_param_meta(n)
-                if param_meta:
-                    return self._convert_value(raw, param_meta.value_type)
-                return raw
+                return self.params[n]
         return default
@@ -7,6 +7,6 @@ from ...base import BaseCommand
 @command(name="msg", description="发送消息")
 class MsgCommand(BaseCommand):
     def execute(self):
-        obj = self.get('-i', '--id')
-        msg = self.get('-m', '--message')
+        obj = self.ns.id
+        msg = self.ns.message
         print(f"📨 发送到 {obj} : {msg}")
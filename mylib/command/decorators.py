@@ -1,9 +1,23 @@
+import inspect
+from typing import Optional
+
 from .base import Param, CommandMeta
 from .registry import registry
 
 
-def command(name: str, description: str = ""):
-    """注册高级命令"""
+def command(name: str,
+            description: str = "",
+            cpu_bound: bool = False,
+            timeout: Optional[float] = None,
+            max_concurrency: Optional[int] = None,
+            cache_ttl: Optional[float] = None,
+            cache_size: int = 128):
+    """
+    注册高级命令
+    cpu_bound: 放进进程池执行 (execute 与返回值需要能在子进程中导入 / pickle)
+    timeout / max_concurrency: 覆盖 [Command] 中的默认超时与并发上限
+    cache_ttl / cache_size: 按转换后的参数缓存执行结果 (秒 / 条目数), 只用于幂等命令
+    """
     def decorator(cls):
         meta = getattr(cls, "_command_meta", None)
         if not meta:
@@ -12,6 +26,16 @@ def command(name: str, description: str = ""):
             meta.name = name
             meta.description = description
             meta.cls = cls
+        if cpu_bound:
+            meta.mode = "process"
+        elif inspect.iscoroutinefunction(getattr(cls, "execute", None)):
+            meta.mode = "async"
+        else:
+            meta.mode = "sync"
+        meta.timeout = timeout
+        meta.max_concurrency = max_concurrency
+        meta.cache_ttl = cache_ttl
+        meta.cache_size = cache_size
         setattr(cls, "_command_meta", meta)
         registry.register_advanced(meta)
         return cls
@@ -26,6 +50,9 @@ def argument(short: str, long: str, type=str, required=False):
             meta = CommandMeta(name="", description="", cls=cls)
             setattr(cls, "_command_meta", meta)
         meta.params.append(Param(short, long, type, required))
+        if meta.name:
+            # @argument 写在 @command 上方时, 命令已经注册过, 需要重新编译规格
+            registry.register_advanced(meta)
         return cls
     return decorator
 
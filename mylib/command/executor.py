@@ -0,0 +1,220 @@
+# 高级命令执行器
+    # - 按 CommandMeta.mode 选择执行方式:
+    #     async   -> async def execute, 直接在事件循环里 await
+    #     sync    -> 普通 execute, 放进命令专用线程池, 不阻塞事件循环
+    #     process -> @command(cpu_bound=True), 放进进程池, 子进程按命令名重新导入并绑定参数
+    # - 每个命令有独立的并发上限 (信号量) 和超时, 超时后取消等待并尽量取消尚未开始的任务
+    # - 线程 / 进程任务的并发名额在任务真正结束时才归还, 超时不会让同一个命令越过上限
+    # - single-flight: (命令名, 转换后的参数, 作用域) 相同的请求在执行期间只跑一次, 重复请求共享结果
+    #   fanout = once 时只有第一个请求者收到回复, each 时每个请求者都收到
+    # - 多 worker 部署时, 进程内合并之后再经 SharedStore 在 worker 之间合并: 先 claim 的 worker 执行并发布结果,
+    #   其他 worker 等待结果; 结果无法跨进程传递或协调进程不可用时各自执行
+    # - 进程池用 forkserver (不支持的平台用 spawn) 启动子进程, 不 fork 持有事件循环 / 线程 / 连接的主进程
+import asyncio
+import contextlib
+import inspect
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, Hashable, Literal, Mapping, Optional, Tuple
+
+from mylib.utils import SharedStore, SingleFlight
+
+from .base import CommandMeta
+from .spec import args_key
+
+
+Fanout = Literal["once", "each"]
+
+
+def _run_sync(cls, params: Mapping[str, Any], ns: tuple) -> Any:
+    return cls(params, ns).execute()
+
+
+def _run_in_process(name: str, params: Dict[str, Any]) -> Any:
+    """子进程入口: 只传命令名与原始参数 (可 pickle), 在子进程内导入命令并重新绑定"""
+    from mylib.command import registry
+
+    meta = registry.get_advanced(name)
+    if meta is None:
+        raise LookupError(f"子进程中找不到命令 <{name}>")
+    ns, error = meta.spec.bind(params)
+    if error is not None:
+        raise ValueError(error)
+    result = meta.cls(params, ns).execute()
+    if inspect.isawaitable(result):
+        result = asyncio.run(result)
+    return result
+
+
+class CommandExecutor:
+    """
+    命令执行器
+
+    timeout: 默认超时秒数 (@command(timeout=...) 优先)
+    max_concurrency: 单个命令默认的并发上限 (@command(max_concurrency=...) 与 limits 优先)
+    limits: 命令名 -> 并发上限, 来自 [Command.limits]
+    thread_workers / process_workers: 线程池 / 进程池大小
+    singleflight: 是否合并进行中的相同请求; fanout: once / each, 见模块说明
+    shared: 跨进程共享状态, 只有连接到协调进程 (remote) 时才参与合并
+    """
+    def __init__(self,
+                timeout: float = 10.0,
+                max_concurrency: int = 4,
+                limits: Optional[Dict[str, int]] = None,
+                thread_workers: int = 8,
+                process_workers: int = 2,
+                singleflight: bool = True,
+                fanout: Fanout = "once",
+                shared: Optional[SharedStore] = None):
+        if fanout not in ("once", "each"):
+            raise ValueError(f"未知的 fanout 方式: {fanout}")
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self.limits: Dict[str, int] = {str(k): int(v) for k, v in (limits or {}).items()}
+        self.thread_workers = thread_workers
+        self.process_workers = process_workers
+        self.singleflight = singleflight
+        self.fanout = fanout
+        self.flights = SingleFlight()
+        self.shared = shared if shared is not None and shared.remote else None
+        self.stats: Dict[str, int] = {"ok": 0, "timeout": 0, "error": 0, "remote_shared": 0}
+        self.running: Dict[str, int] = {}
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._threads: Optional[ThreadPoolExecutor] = None
+        self._processes: Optional[ProcessPoolExecutor] = None
+
+    @classmethod
+    def from_config(cls, cfg) -> "CommandExecutor":
+        """读取 [Command]: timeout / max_concurrency / thread_workers / process_workers / limits / singleflight / fanout"""
+        return cls(
+            timeout=float(cfg.get_option("Command", "timeout", 10.0)),
+            max_concurrency=int(cfg.get_option("Command", "max_concurrency", 4)),
+            limits=cfg.get_option("Command", "limits"),
+            thread_workers=int(cfg.get_option("Command", "thread_workers", 8)),
+            process_workers=int(cfg.get_option("Command", "process_workers", 2)),
+            singleflight=bool(cfg.get_option("Command", "singleflight", True)),
+            fanout=cfg.get_option("Command", "fanout", "once"),
+            shared=SharedStore.init_global(),
+        )
+
+
+    # ------------------- 执行 -------------------
+    async def run(self,
+                meta: CommandMeta,
+                params: Mapping[str, Any],
+                ns: tuple,
+                scope: Hashable = None) -> Tuple[str, Any, bool]:
+        """
+        执行一次已绑定参数的命令, 返回 (状态, 值, 是否共享了别人的执行结果):
+        ("ok", 返回值) / ("timeout", None) / ("error", 异常)
+        scope 为合并请求的作用域 (通常是群号), 不同作用域互不合并
+        """
+        args = args_key(ns) if self.singleflight else None
+        if args is None:
+            status, value = await self._timed(meta, params, ns)
+            return status, value, False
+        key = (meta.name, args, scope)
+        (status, value, remote), shared = await self.flights.do(key, lambda: self._across(key, meta, params, ns))
+        return status, value, shared or remote
+
+    async def _across(self, key: Hashable, meta: CommandMeta, params: Mapping[str, Any], ns: tuple) -> Tuple[str, Any, bool]:
+        """跨 worker 合并, 返回 (状态, 值, 是否来自其他 worker)"""
+        store = self.shared
+        if store is None:
+            return (*await self._timed(meta, params, ns), False)
+
+        timeout = meta.timeout if meta.timeout is not None else self.timeout
+        try:
+            leader = await store.claim(key, timeout + 1.0)
+            if not leader:
+                found, result = await store.wait(key, timeout)
+                if found:
+                    self.stats["remote_shared"] += 1
+                    return (*result, True)
+        except Exception:
+            # 协调进程不可用: 退回到只在进程内合并
+            return (*await self._timed(meta, params, ns), False)
+
+        status, value = await self._timed(meta, params, ns)
+        if leader:
+            try:
+                await store.publish(key, (status, value))
+            except Exception:
+                # 结果无法 pickle 等: 释放 claim, 等待者各自执行
+                with contextlib.suppress(Exception):
+                    await store.release(key)
+        return status, value, False
+
+    async def _timed(self, meta: CommandMeta, params: Mapping[str, Any], ns: tuple) -> Tuple[str, Any]:
+        """排队等待并发名额的时间也计入超时"""
+        timeout = meta.timeout if meta.timeout is not None else self.timeout
+        try:
+            value = await asyncio.wait_for(self._run(meta, params, ns), timeout)
+        except asyncio.TimeoutError:
+            self.stats["timeout"] += 1
+            return "timeout", None
+        except Exception as e:
+            self.stats["error"] += 1
+            return "error", e
+        self.stats["ok"] += 1
+        return "ok", value
+
+    async def _run(self, meta: CommandMeta, params: Mapping[str, Any], ns: tuple) -> Any:
+        sem = self._semaphore(meta)
+        await sem.acquire()
+        self.running[meta.name] = self.running.get(meta.name, 0) + 1
+
+        def release(*_):
+            self.running[meta.name] -= 1
+            sem.release()
+
+        if meta.mode == "async":
+            try:
+                return await meta.cls(params, ns).execute()
+            finally:
+                release()
+
+        if meta.mode == "process":
+            future = self._pool("process").submit(_run_in_process, meta.name, dict(params))
+        else:
+            future = self._pool("thread").submit(_run_sync, meta.cls, params, ns)
+        loop = asyncio.get_running_loop()
+        # 挂在 concurrent future 上: 任务真正结束 (或在开始前被取消) 时才归还名额
+        future.add_done_callback(lambda _: loop.call_soon_threadsafe(release))
+        return await asyncio.wrap_future(future)
+
+    def _semaphore(self, meta: CommandMeta) -> asyncio.Semaphore:
+        sem = self._semaphores.get(meta.name)
+        if sem is None:
+            limit = self.limits.get(meta.name) or meta.max_concurrency or self.max_concurrency
+            sem = self._semaphores[meta.name] = asyncio.Semaphore(limit)
+        return sem
+
+    def _pool(self, kind: str) -> Executor:
+        """线程池 / 进程池在第一次用到时才创建"""
+        if kind == "process":
+            if self._processes is None:
+                method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+                self._processes = ProcessPoolExecutor(max_workers=self.process_workers,
+                                                      mp_context=multiprocessing.get_context(method))
+            return self._processes
+        if self._threads is None:
+            self._threads = ThreadPoolExecutor(max_workers=self.thread_workers, thread_name_prefix="command")
+        return self._threads
+
+
+    # ------------------- 状态 / 关闭 -------------------
+    def snapshot(self) -> Dict[str, Any]:
+        """执行计数与各命令当前占用的并发名额 (用于 /stats)"""
+        return {
+            **self.stats,
+            "running": {k: v for k, v in self.running.items() if v},
+            "singleflight": self.flights.snapshot(),
+        }
+
+    def close(self) -> None:
+        """取消尚未开始的任务并关闭线程池 / 进程池"""
+        for pool in (self._threads, self._processes):
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+        self._threads = self._processes = None
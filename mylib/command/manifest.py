@@ -0,0 +1,150 @@
+# 命令清单 (manifest)
+    # - 用 ast 静态扫描 commands 目录, 不导入任何命令模块:
+    #     简单命令名 -> 模块路径
+    #     高级命令名 -> 模块路径 + 说明 + 参数规格
+    # - 清单持久化为 commands/.manifest.json, 附带目录指纹 (相对路径, mtime_ns, size)
+    # - 指纹不一致 (增删改了命令文件) 时自动重新扫描并写回
+    # - 装饰器参数不是字面量、无法静态解析的模块记入 eager, 启动时照常导入
+import ast
+import importlib
+import json
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+MANIFEST_NAME = ".manifest.json"
+MANIFEST_VERSION = 1
+
+_DECORATORS = ("simple_command", "command", "argument")
+
+
+def fingerprint(root: str) -> List[Tuple[str, int, int]]:
+    """commands 目录下所有 .py 文件的 (相对路径, mtime_ns, size), 按路径排序"""
+    entries = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith((".", "__")))
+        for filename in filenames:
+            if not filename.endswith(".py"):
+                continue
+            path = os.path.join(dirpath, filename)
+            st = os.stat(path)
+            entries.append((os.path.relpath(path, root).replace(os.sep, "/"), st.st_mtime_ns, st.st_size))
+    entries.sort()
+    return entries
+
+
+def _module_name(package: str, rel: str) -> str:
+    parts = rel[:-3].split("/")
+    if parts[-1] == "__init__":
+        parts.pop()
+    return ".".join([package] + parts)
+
+
+def _decorator(node: ast.expr) -> Optional[Tuple[str, list, dict]]:
+    """识别 @simple_command(...) / @command(...) / @argument(...), 返回 (名字, args, kwargs)"""
+    if not isinstance(node, ast.Call):
+        return None
+    func = node.func
+    name = func.id if isinstance(func, ast.Name) else func.attr if isinstance(func, ast.Attribute) else None
+    if name not in _DECORATORS:
+        return None
+
+    def literal(value: ast.expr) -> Any:
+        # 类型参数写的是 int / str 等名字, 按名字记录
+        if isinstance(value, ast.Name):
+            return value.id
+        return ast.literal_eval(value)
+
+    return name, [literal(a) for a in node.args], {k.arg: literal(k.value) for k in node.keywords}
+
+
+def scan_module(path: str) -> Tuple[Dict[str, None], Dict[str, Dict[str, Any]]]:
+    """
+    静态解析一个命令文件, 返回 (简单命令, 高级命令)
+    遇到无法静态求值的装饰器参数时抛出 ValueError
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=path)
+
+    simple: Dict[str, None] = {}
+    advanced: Dict[str, Dict[str, Any]] = {}
+    for node in tree.body:
+        if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            continue
+        cmd: Optional[Dict[str, Any]] = None
+        params: List[List[Any]] = []
+        for dec in node.decorator_list:
+            parsed = _decorator(dec)
+            if parsed is None:
+                continue
+            name, args, kwargs = parsed
+            if name == "simple_command":
+                simple[kwargs.get("name", args[0] if args else None)] = None
+            elif name == "command":
+                cmd = {
+                    "name": kwargs.get("name", args[0] if args else None),
+                    "description": kwargs.get("description", args[1] if len(args) > 1 else ""),
+                }
+            else:
+                values = dict(zip(("short", "long", "type", "required"), args), **kwargs)
+                params.append([values.get("short"), values.get("long"),
+                               values.get("type", "str"), bool(values.get("required", False))])
+        if cmd is not None:
+            # 装饰器自下而上执行, 与运行时 CommandMeta.params 的顺序保持一致
+            cmd["params"] = params[::-1]
+            advanced[cmd.pop("name")] = cmd
+    return simple, advanced
+
+
+def build_manifest(root: str, package: str, prints: List[Tuple[str, int, int]]) -> Dict[str, Any]:
+    """扫描整个 commands 目录生成清单"""
+    manifest: Dict[str, Any] = {
+        "version": MANIFEST_VERSION,
+        "fingerprint": [list(p) for p in prints],
+        "simple": {},
+        "advanced": {},
+        "eager": [],
+    }
+    for rel, _, _ in prints:
+        module = _module_name(package, rel)
+        try:
+            simple, advanced = scan_module(os.path.join(root, rel))
+        except (SyntaxError, ValueError, IndexError):
+            manifest["eager"].append(module)
+            continue
+        for name in simple:
+            manifest["simple"][name] = module
+        for name, info in advanced.items():
+            info["module"] = module
+            manifest["advanced"][name] = info
+    return manifest
+
+
+def load_manifest(package: str) -> Dict[str, Any]:
+    """读取 package 对应目录的清单; 不存在或指纹过期时重新生成并尽量写回磁盘"""
+    pkg = importlib.import_module(package)
+    root = list(pkg.__path__)[0]
+    path = os.path.join(root, MANIFEST_NAME)
+    prints = fingerprint(root)
+
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("version") == MANIFEST_VERSION and manifest.get("fingerprint") == [list(p) for p in prints]:
+            return manifest
+    except (OSError, ValueError):
+        pass
+
+    manifest = build_manifest(root, package, prints)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        # 先写临时文件再替换, 多 worker 同时启动时不会读到写了一半的清单
+        os.replace(tmp, path)
+    except OSError:
+        # 只读部署时每次启动重新扫描, 仍然不需要导入命令模块
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+    return manifest
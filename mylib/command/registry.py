@@ -1,30 +1,145 @@
-from typing import Dict, Callable
+import importlib
+import pkgutil
+from typing import Any, Callable, Dict, Hashable, Mapping, Optional, Tuple
+
+from mylib.utils import Printer, TTLCache
+from mylib.utils.cache import MISSING
+
 from .base import CommandMeta
+from .executor import CommandExecutor
+from .manifest import load_manifest
+from .spec import CommandSpec, args_key
 
 
 class CommandRegistry:
+    """
+    命令注册表
+
+    启动时只读取命令清单 (load_manifest), 命令模块在第一次被用到时才导入;
+    模块导入时装饰器照常调用 register_simple / register_advanced 完成注册;
+    高级命令由 executor 按 CommandMeta.mode 选择协程 / 线程池 / 进程池执行;
+    声明了 cache_ttl 的命令在执行前先查结果缓存 (按转换后的参数), 命中时不再进入执行器。
+    """
     def __init__(self):
         self.simple_commands: Dict[str, Callable] = {}
         self.advanced_commands: Dict[str, CommandMeta] = {}
+        self.manifest: Dict[str, Any] = {"simple": {}, "advanced": {}, "eager": []}
+        self.executor = CommandExecutor()
+        self.caches: Dict[str, TTLCache] = {}
+        self.printer = Printer()
+
+    def configure(self, cfg) -> None:
+        """按 [Command] 配置替换执行器 (旧执行器的线程池 / 进程池会被关闭)"""
+        old, self.executor = self.executor, CommandExecutor.from_config(cfg)
+        old.close()
+
+    async def run(self,
+                meta: CommandMeta,
+                params: Mapping[str, Any],
+                ns: tuple,
+                scope: Hashable = None) -> Tuple[str, Any, bool]:
+        """执行已绑定参数的高级命令, 返回 (状态, 值, 是否共享结果), 见 CommandExecutor.run"""
+        cache = self.caches.get(meta.name)
+        key = args_key(ns) if cache is not None else None
+        if key is not None:
+            value = cache.get(key)
+            if value is not MISSING:
+                return "ok", value, False
+
+        status, value, shared = await self.executor.run(meta, params, ns, scope)
+        # 合并请求的等待者拿到的是同一份结果, 只由真正执行的那一次写入缓存
+        if key is not None and status == "ok" and not shared:
+            cache.set(key, value)
+        return status, value, shared
+
+
+    # ------------------- 结果缓存 -------------------
+    def invalidate(self, name: str, **params: Any) -> int:
+        """
+        使命令的缓存失效, 返回删除的条目数
+        不带参数时清空该命令的全部缓存; 带参数时按参数属性名与转换后的值 (与 self.ns 相同, 如 id=1) 定位单个条目, 未给出的参数视为 None;
+        参数名不在命令规格中时抛出 KeyError
+        """
+        cache = self.caches.get(name)
+        if cache is None:
+            return 0
+        if not params:
+            count = len(cache)
+            cache.clear()
+            return count
+        spec = self.advanced_commands[name].spec
+        fields = spec.Args._fields
+        unknown = [field for field in params if field not in fields]
+        if unknown:
+            raise KeyError(f"命令 {name} 没有参数: {', '.join(unknown)} (可用: {', '.join(fields)})")
+        # 直接按字段组装命名元组, 不再经过 bind 的转换 / 必填校验, 与 run() 走同一条 args_key 路径
+        values = [params.get(field) for field in fields]
+        key = args_key(spec.Args(*values))
+        return int(key is not None and cache.invalidate(key))
+
+    def invalidate_all(self) -> None:
+        for cache in self.caches.values():
+            cache.clear()
+
+    def cache_stats(self) -> Dict[str, Dict[str, Any]]:
+        return {name: cache.snapshot() for name, cache in self.caches.items()}
 
     def register_simple(self, name, func):
         self.simple_commands[name] = func
 
     def register_advanced(self, meta: CommandMeta):
+        """注册 (或参数变化后重新注册) 高级命令, 同时编译 CommandSpec 并按需创建结果缓存"""
+        meta.spec = CommandSpec(meta)
         self.advanced_commands[meta.name] = meta
+        if meta.cache_ttl:
+            self.caches[meta.name] = TTLCache(maxsize=meta.cache_size, ttl=meta.cache_ttl)
+        else:
+            self.caches.pop(meta.name, None)
+
+    def get_simple(self, name: str) -> Optional[Callable]:
+        func = self.simple_commands.get(name)
+        if func is None and self._import(self.manifest["simple"].get(name)):
+            func = self.simple_commands.get(name)
+        return func
 
-    def get_advanced(self, name: str):
-        return self.advanced_commands.get(name)
+    def get_advanced(self, name: str) -> Optional[CommandMeta]:
+        meta = self.advanced_commands.get(name)
+        if meta is None:
+            info = self.manifest["advanced"].get(name)
+            if info is not None and self._import(info["module"]):
+                meta = self.advanced_commands.get(name)
+        return meta
 
-    def auto_import(self):
+    def _import(self, module: Optional[str]) -> bool:
+        """按需导入命令模块; 导入失败时报告一次并从清单中移除对应命令"""
+        if module is None:
+            return False
+        try:
+            importlib.import_module(module)
+            return True
+        except Exception as e:
+            self.printer.cprint("red", f"[CommandRegistry] 命令模块 {module} 导入失败: {e!r}")
+            for kind in ("simple", "advanced"):
+                table = self.manifest[kind]
+                for name in [n for n, v in table.items() if (v if kind == "simple" else v["module"]) == module]:
+                    del table[name]
+            return False
+
+    def load_manifest(self, package: str = "mylib.command.commands"):
         """
-        自动导入 CAD.commands 目录下的模块和子包中的模块（ simple 和 advanced 下的命令模块）。
+        读取 (必要时重建) 命令清单, 只导入无法静态解析的模块
         """
-        import importlib
-        import pkgutil
+        self.manifest = load_manifest(package)
+        for module in self.manifest["eager"]:
+            self._import(module)
 
+    def auto_import(self, package: str = "mylib.command.commands"):
+        """
+        一次性导入 package 目录下的模块和子包中的模块（ simple 和 advanced 下的命令模块）。
+        清单可用时不再需要, 保留用于对比与排查。
+        """
         try:
-            import CAD.commands as commands_pkg
+            commands_pkg = importlib.import_module(package)
         except Exception:
             return
 
@@ -0,0 +1,139 @@
+# 编译后的命令规格
+    # - @command 注册时把 CommandMeta.params 编译成 别名 -> 参数下标 的字典和转换函数表
+    # - bind() 在执行命令之前一次性完成 类型转换 + 必填校验, 产出不可变的参数命名元组
+    # - 不合法的调用在这里就被拒绝, 命令代码只做属性读取
+    # - bool 开关只接受 true/false/1/0/yes/no/on/off 作为值; 分词器分给开关的其他 token (-f hello) 由 split_flags() 放回位置参数
+import keyword
+from collections import namedtuple
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Hashable, List, Mapping, Optional, Tuple
+
+from .base import CommandMeta, Param
+
+
+_TRUE = frozenset(("1", "true", "yes", "on"))
+_FALSE = frozenset(("0", "false", "no", "off"))
+
+
+def _to_bool(raw: Any) -> bool:
+    if raw is True or raw is False:
+        return raw
+    r = str(raw).strip().lower()
+    if r in _TRUE:
+        return True
+    if r in _FALSE:
+        return False
+    raise ValueError(f"无法识别的布尔值: {raw}")
+
+
+def _is_flag_value(raw: Any) -> bool:
+    """raw 能否作为 bool 开关的值 (True / False 或布尔字面量)"""
+    return raw is True or raw is False or (isinstance(raw, str) and raw.strip().lower() in _TRUE | _FALSE)
+
+
+def _to_list(raw: Any) -> list:
+    if isinstance(raw, str):
+        return [s.strip() for s in raw.split(",") if s.strip() != ""]
+    return [raw]
+
+
+def _converter(value_type: Any) -> Callable[[Any], Any]:
+    if value_type is bool:
+        return _to_bool
+    if value_type is list:
+        return _to_list
+    return value_type
+
+
+def dest_name(param: Param) -> str:
+    """参数在命名元组中的属性名: --output-format -> output_format"""
+    name = (param.long or param.short).lstrip("-").replace("-", "_")
+    if not name.isidentifier() or keyword.iskeyword(name):
+        name += "_"
+    return name
+
+
+class CommandSpec:
+    """
+    一个高级命令的编译结果 (只读)
+
+    aliases: 短 / 长名 -> 参数下标
+    Args: 参数命名元组类型, 字段顺序与 params 一致, 未提供的可选参数为 None
+    """
+    __slots__ = ("name", "params", "aliases", "converters", "required", "Args")
+
+    def __init__(self, meta: CommandMeta):
+        self.name = meta.name
+        self.params: Tuple[Param, ...] = tuple(meta.params)
+        self.aliases: Dict[str, int] = {}
+        for i, p in enumerate(self.params):
+            for alias in (p.short, p.long):
+                if alias:
+                    self.aliases[alias] = i
+        self.converters: Tuple[Callable[[Any], Any], ...] = tuple(
+            _converter(p.value_type) for p in self.params
+        )
+        self.required: Tuple[int, ...] = tuple(i for i, p in enumerate(self.params) if p.required)
+        self.Args = namedtuple(f"{meta.cls.__name__ if meta.cls else 'Command'}Args",
+                               [dest_name(p) for p in self.params])
+
+    def split_flags(self, raw: Mapping[str, Any], args: Tuple[str, ...]) -> Tuple[Mapping[str, Any], Tuple[str, ...]]:
+        """
+        分词器不知道哪些选项是开关, -f hello 会把 hello 当成 -f 的值;
+        bool 参数拿到非布尔字面量时记为 True, 该 token 放回位置参数最前面。没有需要调整的参数时原样返回
+        """
+        params = None
+        spilled = []
+        for key, value in raw.items():
+            i = self.aliases.get(key)
+            if i is None or self.converters[i] is not _to_bool or _is_flag_value(value):
+                continue
+            if params is None:
+                params = dict(raw)
+            params[key] = True
+            spilled.append(value)
+        if params is None:
+            return raw, args
+        return MappingProxyType(params), tuple(spilled) + tuple(args)
+
+    def bind(self, raw: Mapping[str, Any]) -> Tuple[Optional[tuple], Optional[str]]:
+        """
+        转换并校验原始参数, 返回 (Args, None); 不合法时返回 (None, 错误说明)
+        未在规格中声明的选项不参与绑定 (仍可通过 BaseCommand.params 读到)
+        bool 参数的非布尔值按开关处理 (True), 对应 token 由 split_flags() 归入位置参数
+        """
+        values: List[Any] = [None] * len(self.params)
+        aliases, converters, params = self.aliases, self.converters, self.params
+
+        for key, value in raw.items():
+            i = aliases.get(key)
+            if i is None or values[i] is not None:
+                continue
+            if converters[i] is _to_bool:
+                values[i] = _to_bool(value) if _is_flag_value(value) else True
+                continue
+            if value is True:
+                return None, f"参数 {params[i].short}/{params[i].long} 需要一个值"
+            try:
+                values[i] = converters[i](value)
+            except (TypeError, ValueError):
+                type_name = getattr(params[i].value_type, "__name__", params[i].value_type)
+                return None, f"参数 {params[i].short}/{params[i].long} 应为 {type_name}: {value}"
+
+        for i in self.required:
+            if values[i] is None:
+                return None, f"缺少必填参数 {params[i].short}/{params[i].long}"
+        return self.Args(*values), None
+
+
+def args_key(ns: tuple) -> Optional[Hashable]:
+    """
+    把绑定后的参数变成可哈希的 key (list -> tuple), 供合并执行 / 结果缓存使用;
+    转换后的值相同即视为同一请求 (-i 1 与 --id 01); 含不可哈希的值时返回 None
+    """
+    key = tuple(tuple(v) if isinstance(v, list) else v for v in ns)
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
@@ -3,5 +3,7 @@
     # 例如.toml/.env
 
 from .loader import ConfigLoader
+from .parse_cache import ParsedConfigCache, parsed_cache
+from .watcher import ConfigWatcher
 
-__all__ = ["ConfigLoader"]
+__all__ = ["ConfigLoader", "ConfigWatcher", "ParsedConfigCache", "parsed_cache"]
@@ -1,57 +1,83 @@
-from typing import Any
+from typing import Any, Dict, Optional
 
 
 class ConfigDictWrapper:
     """
     配置字典包装器
     支持链式访问嵌套的字典和列表
+
+    配置数据在加载后视为只读快照: 子节点 (包装器或标量) 第一次访问时创建并缓存,
+    之后同一路径的重复访问直接返回缓存, 不再分配新对象或拼接路径字符串;
+    通过属性访问过的键还会写进实例 __dict__, 再次访问走普通属性查找, 不再进入 __getattr__
     """
+
     def __init__(self, data: Any, path: str = ""):
         self._data = data
         self._path = path
-    
+        self._children: Optional[Dict[Any, Any]] = None
+
     def __getattr__(self, name: str) -> Any:
         """通过属性访问字典键"""
         if name == 'raw':
             return self._data
-            
+        if name.startswith("__") or name in _INTERNAL:
+            # 未初始化的实例 (copy / pickle) 不要递归进 __getattr__
+            raise AttributeError(name)
+
+        children = self._children
+        if children is not None and name in children:
+            return children[name]
         if isinstance(self._data, dict) and name in self._data:
-            value = self._data[name]
-            new_path = f"{self._path}.{name}" if self._path else name
-            return self._wrap_value(value, new_path)
-            
+            value = self._child(name)
+            if not name.startswith("_"):
+                # 与方法 / 内部字段同名的键只走 __getattr__, 不写进实例字典
+                self.__dict__[name] = value
+            return value
+
         raise AttributeError(f"'{self._path}' has no attribute '{name}'")
-    
+
     def __getitem__(self, key: Any) -> Any:
         """通过索引访问列表或字典"""
-        if isinstance(self._data, (dict, list)):
-            if (isinstance(self._data, dict) and key in self._data) or (isinstance(self._data, list) and 0 <= key < len(self._data)):
-                value = self._data[key]
-                new_path = f"{self._path}[{key}]"
-                return self._wrap_value(value, new_path)
+        children = self._children
+        if children is not None and key in children:
+            return children[key]
+        data = self._data
+        if (isinstance(data, dict) and key in data) or \
+                (isinstance(data, list) and isinstance(key, int) and 0 <= key < len(data)):
+            return self._child(key)
         raise KeyError(f"'{self._path}' has no key/index '{key}'")
-    
+
     def __repr__(self) -> str:
         return f"ConfigDictWrapper({self._data})"
-    
+
     def __str__(self) -> str:
         return str(self._data)
-    
+
     def __len__(self) -> int:
         """支持 len() 操作"""
         return len(self._data) if hasattr(self._data, '__len__') else 0
-    
+
     def __iter__(self):
         """支持迭代操作"""
         if isinstance(self._data, list):
-            for i, item in enumerate(self._data):
-                yield self._wrap_value(item, f"{self._path}[{i}]")
+            for i in range(len(self._data)):
+                yield self[i]
         elif isinstance(self._data, dict):
             for key in self._data:
-                yield self._wrap_value(self._data[key], f"{self._path}.{key}")
+                yield self[key]
         else:
             raise TypeError(f"'{self._path}' is not iterable")
-    
+
+    def _child(self, key: Any) -> Any:
+        """创建并缓存子节点, 路径字符串只在这里拼接一次"""
+        children = self._children
+        if children is None:
+            children = self._children = {}
+        path = f"{self._path}[{key}]" if isinstance(self._data, list) else \
+            (f"{self._path}.{key}" if self._path else str(key))
+        value = children[key] = self._wrap_value(self._data[key], path)
+        return value
+
     def _wrap_value(self, value: Any, path: str) -> Any:
         """包装值，如果是字典或列表则返回包装器，否则直接返回值"""
         if isinstance(value, (dict, list)):
@@ -62,32 +88,36 @@ class ConfigDictWrapper:
     def _get(self, key: Any, default: Any = None) -> Any:
         """类似字典的 get 方法"""
         if isinstance(self._data, dict):
-            value = self._data.get(key, default)
-            return self._wrap_value(value, f"{self._path}.{key}")
+            if key in self._data:
+                return self[key]
+            return self._wrap_value(default, f"{self._path}.{key}")
         return default
-    
+
     def _items(self):
         """类似字典的 items 方法"""
         if isinstance(self._data, dict):
-            for k, v in self._data.items():
-                yield k, self._wrap_value(v, f"{self._path}.{k}")
+            for k in self._data:
+                yield k, self[k]
         else:
             raise TypeError(f"'{self._path}' is not a dictionary")
-    
+
     def _keys(self):
         """类似字典的 keys 方法"""
         if isinstance(self._data, dict):
             return self._data.keys()
         raise TypeError(f"'{self._path}' is not a dictionary")
-    
+
     def _values(self):
         """类似字典的 values 方法"""
         if isinstance(self._data, dict):
-            for v in self._data.values():
-                yield self._wrap_value(v, f"{self._path}[value]")
+            for k in self._data:
+                yield self[k]
         else:
             raise TypeError(f"'{self._path}' is not a dictionary")
-    
+
     def _dict(self):
         """获取原始字典"""
         return self._data
+
+
+_INTERNAL = frozenset(("_data", "_path", "_children"))
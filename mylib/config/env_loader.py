@@ -7,6 +7,9 @@ if TYPE_CHECKING:
 
 from mylib.etp import EnvError
 
+# load_dotenv 不覆盖已存在的变量, 重复调用只是重复读文件, 每个进程执行一次即可
+_dotenv_loaded = False
+
 
 class EnvLoader:
     """负责加载和校验 .env 环境变量"""
@@ -18,8 +21,11 @@ class EnvLoader:
 
     def load(self) -> None:
         """加载环境变量"""
+        global _dotenv_loaded
         try:
-            load_dotenv()
+            if not _dotenv_loaded:
+                load_dotenv()
+                _dotenv_loaded = True
 
             url = os.getenv("URL")
             token = os.getenv("TOKEN")
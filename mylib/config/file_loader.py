@@ -8,9 +8,11 @@ if TYPE_CHECKING:
 
 from mylib.etp import ConfigError
 
+from .parse_cache import parsed_cache
+
 
 class FileLoader:
-    """负责加载和解析 TOML / JSON 配置文件"""
+    """负责加载和解析 TOML / JSON 配置文件, 文件未变化时复用 parsed_cache 中的解析结果"""
     def __init__(self, parent: "ConfigLoader"):
         self.parent = parent
 
@@ -28,10 +30,9 @@ class FileLoader:
 
     def _load_toml(self, path: str) -> None:
         try:
-            with open(path, "rb") as f:
-                data = tomllib.load(f)
-                self.parent.toml_data = data
-                self.parent._record_source("toml_data", "config -> toml")
+            data = parsed_cache.load(path, _parse_toml)
+            self.parent.toml_data = data
+            self.parent._record_source("toml_data", "config -> toml")
 
             fastapi = data.get("FastAPI_Server", {})
             if isinstance(fastapi, dict):
@@ -49,10 +50,9 @@ class FileLoader:
 
     def _load_json(self, path: str) -> None:
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                self.parent.json_data = data
-                self.parent._record_source("json_data", "config -> json")
+            data = parsed_cache.load(path, _parse_json)
+            self.parent.json_data = data
+            self.parent._record_source("json_data", "config -> json")
 
             fastapi = data.get("FastAPI_Server", {})
             if isinstance(fastapi, dict):
@@ -72,3 +72,13 @@ class FileLoader:
         """通过父类接口注册属性"""
         if value is not None:
             self.parent._register_attribute(name, value, "config -> file_loader")
+
+
+def _parse_toml(path: str) -> Any:
+    with open(path, "rb") as f:
+        return tomllib.load(f)
+
+
+def _parse_json(path: str) -> Any:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
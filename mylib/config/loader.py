@@ -1,6 +1,6 @@
 # config_loader.py
 import os
-import inspect
+import sys
 from typing import Literal, Optional, Any
 
 from .base import ConfigDictWrapper
@@ -35,13 +35,14 @@ class ConfigLoader:
     ]
 
     def __setattr__(self, name: str, value: Any) -> None:
-        """记录属性设置来源"""
+        """调试模式下记录属性设置来源 (生产模式只保留显式登记的来源)"""
         super().__setattr__(name, value)
-        if not name.startswith('_') and hasattr(self, "tracker"):
-            if name not in self.tracker.map:
-                caller_frame = inspect.stack()[1]
-                caller_func = caller_frame.function
-                self._record_source(name, f"{self.__class__.__name__} -> {caller_func}")
+        if name.startswith('_'):
+            return
+        tracker = self.__dict__.get("tracker")
+        if tracker is not None and tracker.debug and name not in tracker.map:
+            caller_func = sys._getframe(1).f_code.co_name
+            self._record_source(name, f"{self.__class__.__name__} -> {caller_func}")
 
     def __getattr__(self, name: str) -> Any:
         """
@@ -66,13 +67,20 @@ class ConfigLoader:
         except AttributeError:
             json_data = None
         
+        # 同一个顶层键只包装一次, 之后的访问直接命中缓存
+        wrappers = self.__dict__.setdefault("_wrappers", {})
+        if name in wrappers:
+            return wrappers[name]
+
         if isinstance(toml_data, dict) and name in toml_data:
             data = toml_data[name]
-            return ConfigDictWrapper(data, f"toml.{name}")
+            wrappers[name] = ConfigDictWrapper(data, f"toml.{name}")
+            return wrappers[name]
         
         if isinstance(json_data, dict) and name in json_data:
             data = json_data[name]
-            return ConfigDictWrapper(data, f"json.{name}")
+            wrappers[name] = ConfigDictWrapper(data, f"json.{name}")
+            return wrappers[name]
         
         raise AttributeError(f"'{self.__class__.__name__}' object has no attribute '{name}'")
 
@@ -80,8 +88,10 @@ class ConfigLoader:
     # ------------------- 实例化吧! -------------------
     def __init__(self,
                 mode: Literal["env", "config", "discovery"] = "discovery",
-                config_path: Optional[str] = None):
-        self.tracker = SourceTracker()
+                config_path: Optional[str] = None,
+                debug: bool = False):
+        """debug=True 时追踪每个公开属性的赋值位置 (见 SourceTracker)"""
+        self.tracker = SourceTracker(debug=debug)
         self.summary = Summary(self)
         self._mode = mode
 
@@ -91,8 +101,7 @@ class ConfigLoader:
             )
             self._record_source("config_path", "__init__ -> default (mylib/config/config.toml)")
         else:
-            caller_frame = inspect.stack()[1]
-            caller_file = os.path.abspath(caller_frame.filename)
+            caller_file = os.path.abspath(sys._getframe(1).f_code.co_filename)
             caller_dir = os.path.dirname(caller_file)
             if not os.path.isabs(config_path):
                 resolved_path = os.path.abspath(os.path.join(caller_dir, config_path))
@@ -111,12 +120,18 @@ class ConfigLoader:
 
     @classmethod
     def init_global(cls, mode: Literal["env", "config", "discovery"] = "discovery",
-                    config_path: Optional[str] = None) -> "ConfigLoader":
+                    config_path: Optional[str] = None,
+                    debug: bool = False) -> "ConfigLoader":
         """初始化全局实例"""
         if cls._global_instance is None:
-            cls._global_instance = cls(mode=mode, config_path=config_path)
+            cls._global_instance = cls(mode=mode, config_path=config_path, debug=debug)
         return cls._global_instance
 
+    @classmethod
+    def publish(cls, cfg: "ConfigLoader") -> None:
+        """用新加载的实例替换全局实例 (单次引用赋值, 由 ConfigWatcher 在订阅者提交后调用)"""
+        cls._global_instance = cfg
+
     @classmethod
     def get_global(cls) -> "ConfigLoader":
         """获取全局实例"""
@@ -137,6 +152,32 @@ class ConfigLoader:
             raise ConfigError(f"缺少必须配置项: {missing_configs}")
 
 
+    # ------------------- 可选配置项读取喵 -------------------
+    def get_value(self, key: str, default: Any = None) -> Any:
+        """读取顶层 key 的原始值 (不经过 ConfigDictWrapper), 不存在时返回 default"""
+        for source in ("toml_data", "json_data"):
+            try:
+                data = object.__getattribute__(self, source)
+            except AttributeError:
+                continue
+            if isinstance(data, dict) and key in data:
+                return data[key]
+        return default
+
+    def get_option(self, section: str, key: str, default: Any = None) -> Any:
+        """读取 [section].key 的原始值, 配置节或键不存在时返回 default"""
+        for source in ("toml_data", "json_data"):
+            try:
+                data = object.__getattribute__(self, source)
+            except AttributeError:
+                continue
+            if isinstance(data, dict):
+                sec = data.get(section)
+                if isinstance(sec, dict) and key in sec:
+                    return sec[key]
+        return default
+
+
     # ------------------- 实例属性注册喵 -------------------
     def _register_attribute(self, name: str, value: Any, source: str) -> None:
         """注册实例属性"""
@@ -0,0 +1,95 @@
+# 已解析配置缓存
+    # - 以 (路径, mtime_ns, size) 为键, 文件未变化时直接复用上次的解析结果
+    # - 进程内: 同一进程里重复构造 ConfigLoader (热重载预检 / 测试 / 各组件 init) 只做一次 os.stat
+    # - 跨进程: 解析结果 pickle 到配置文件旁的 __pycache__/<文件名>.pickle,
+    #   重启或多 worker 启动时命中则跳过 TOML / JSON 解析; 目录不可写时静默跳过
+    # - 缓存的数据是只读快照, 调用方不要原地修改 (ConfigDictWrapper 同样按只读处理)
+import os
+import pickle
+from typing import Any, Callable, Dict, Optional, Tuple
+
+Stamp = Tuple[int, int]
+
+_VERSION = 1
+
+
+class ParsedConfigCache:
+    """
+    sidecar: 是否读写磁盘上的 pickle 副本
+    hits / sidecar_hits / misses: 进程内命中、磁盘命中、重新解析计数
+    """
+    def __init__(self, sidecar: bool = True):
+        self.sidecar = sidecar
+        self.hits = 0
+        self.sidecar_hits = 0
+        self.misses = 0
+        self._entries: Dict[str, Tuple[Stamp, Any]] = {}
+
+    def load(self, path: str, parse: Callable[[str], Any]) -> Any:
+        """返回 path 的解析结果, 文件未变化时不再调用 parse"""
+        path = os.path.abspath(path)
+        st = os.stat(path)
+        stamp = (st.st_mtime_ns, st.st_size)
+
+        entry = self._entries.get(path)
+        if entry is not None and entry[0] == stamp:
+            self.hits += 1
+            return entry[1]
+
+        data = self._read_sidecar(path, stamp) if self.sidecar else None
+        if data is not None:
+            self.sidecar_hits += 1
+        else:
+            self.misses += 1
+            data = parse(path)
+            if self.sidecar:
+                self._write_sidecar(path, stamp, data)
+
+        self._entries[path] = (stamp, data)
+        return data
+
+    def clear(self) -> None:
+        """只清空进程内缓存, 磁盘副本会在文件变化后自然失效"""
+        self._entries.clear()
+
+    def snapshot(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "sidecar_hits": self.sidecar_hits,
+            "misses": self.misses,
+        }
+
+
+    # ------------------- 磁盘副本 -------------------
+    @staticmethod
+    def sidecar_path(path: str) -> str:
+        return os.path.join(os.path.dirname(path), "__pycache__", os.path.basename(path) + ".pickle")
+
+    def _read_sidecar(self, path: str, stamp: Stamp) -> Optional[Any]:
+        try:
+            with open(self.sidecar_path(path), "rb") as f:
+                version, cached_stamp, data = pickle.load(f)
+        except Exception:
+            return None
+        if version != _VERSION or tuple(cached_stamp) != stamp:
+            return None
+        return data
+
+    def _write_sidecar(self, path: str, stamp: Stamp, data: Any) -> None:
+        target = self.sidecar_path(path)
+        tmp = f"{target}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with open(tmp, "wb") as f:
+                pickle.dump((_VERSION, stamp, data), f, protocol=pickle.HIGHEST_PROTOCOL)
+            # 先写临时文件再替换, 并发启动的 worker 不会读到写了一半的副本
+            os.replace(tmp, target)
+        except OSError:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+
+
+parsed_cache = ParsedConfigCache()
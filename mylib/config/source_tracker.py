@@ -2,8 +2,14 @@ from typing import List, Dict
 
 
 class SourceTracker:
-    """统一管理配置属性的来源追踪"""
-    def __init__(self):
+    """
+    统一管理配置属性的来源追踪
+
+    debug=False (生产模式): 只记录加载器通过 _register_attribute / _record_source 显式登记的来源
+    debug=True (调试模式): 额外记录其余公开属性是在哪个函数里被赋值的 (sys._getframe, 不读源码)
+    """
+    def __init__(self, debug: bool = False):
+        self.debug = debug
         self.map: Dict[str, str] = {}
         self.discovered_attrs: List[str] = []
 
@@ -0,0 +1,98 @@
+# 配置热重载
+    # - 后台协程按 interval 轮询配置文件的 (mtime_ns, size), 变化后才重新加载
+    # - 新的 ConfigLoader 在线程里构造 (解析 + _validate_required_configs), 不占用事件循环
+    # - 两阶段发布:
+    #     prepare: 每个订阅者基于新快照编译好自己的结构 (触发词索引 / ACL / 回复模板), 同样在线程里完成
+    #     commit:  全部 prepare 成功后, 在事件循环里依次执行各订阅者的提交函数并替换全局实例,
+    #              中间没有 await, 其他协程看到的要么全是旧配置, 要么全是新配置
+    # - 任一阶段失败都保留旧配置, 直到文件再次变化才重试
+import asyncio
+import os
+from typing import Callable, List, Optional, Tuple
+
+from mylib.utils import Printer
+
+from .loader import ConfigLoader
+
+Commit = Callable[[], None]
+Subscriber = Callable[[ConfigLoader], Commit]
+
+
+class ConfigWatcher:
+    """
+    配置文件监视器
+
+    subscribe(fn): fn(new_cfg) 在线程中被调用, 返回一个无参的提交函数;
+    提交函数在事件循环中执行, 只做引用替换, 不应再做耗时工作
+    """
+    def __init__(self, cfg: ConfigLoader, interval: float = 2.0):
+        self.cfg = cfg
+        self.interval = interval
+        self.reloads = 0
+        self.failures = 0
+        self.printer = Printer()
+        self._subscribers: List[Subscriber] = []
+        self._stamp = self._stat()
+        self._task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_config(cls, cfg: ConfigLoader) -> "ConfigWatcher":
+        """读取 [Reload] interval"""
+        return cls(cfg, interval=float(cfg.get_option("Reload", "interval", 2.0)))
+
+    def subscribe(self, fn: Subscriber) -> None:
+        self._subscribers.append(fn)
+
+
+    # ------------------- 生命周期 -------------------
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._watch())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _watch(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            stamp = self._stat()
+            if stamp is not None and stamp != self._stamp:
+                self._stamp = stamp
+                await self.reload()
+
+
+    # ------------------- 重载 -------------------
+    async def reload(self) -> bool:
+        """加载新配置并原子发布, 成功返回 True"""
+        try:
+            cfg, commits = await asyncio.to_thread(self._prepare)
+        except Exception as e:
+            self.failures += 1
+            self.printer.cprint("red", f"[ConfigWatcher] 配置重载失败, 继续使用旧配置: {e}")
+            return False
+
+        for commit in commits:
+            commit()
+        self.cfg = cfg
+        ConfigLoader.publish(cfg)
+        self.reloads += 1
+        self.printer.cprint("green", f"[ConfigWatcher] 配置已重载: {cfg.config_path}")
+        return True
+
+    def _prepare(self) -> Tuple[ConfigLoader, List[Commit]]:
+        old = self.cfg
+        cfg = ConfigLoader(mode=old._mode, config_path=old.config_path, debug=old.tracker.debug)
+        return cfg, [fn(cfg) for fn in self._subscribers]
+
+    def _stat(self) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(self.cfg.config_path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
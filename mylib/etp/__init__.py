@@ -2,6 +2,6 @@
 # 用于定义错误类型
     # 例如 ConfigError
 
-from .etp import ConfigError, EnvError
+from .etp import ConfigError, EnvError, ApiError
 
-__all__ = ["ConfigError", "EnvError"]
+__all__ = ["ConfigError", "EnvError", "ApiError"]
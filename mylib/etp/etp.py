@@ -12,3 +12,8 @@ class ConfigError(RedError):
 class EnvError(RedError):
     """环境变量文件加载失败"""
     pass
+
+
+class ApiError(RedError):
+    """调用 Napcat (OneBot) 接口失败"""
+    pass
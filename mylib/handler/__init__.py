@@ -2,3 +2,8 @@
 # 调用关系 parser -> handler -> function --- command
 # 用于分发命令
     # 例如 <命令> 依赖于command解析与function执行
+
+from .dispatch_queue import DispatchQueue, QueueStats
+from .dispatcher import Cerebrum
+
+__all__ = ["DispatchQueue", "QueueStats", "Cerebrum"]
@@ -0,0 +1,86 @@
+# 群 / 用户访问控制
+    # - 启动 / 配置变更时把 allow / deny 列表编译成 frozenset, 每个事件只做 O(1) 哈希查找
+    # - 在入队之前就判定, 被拒绝的事件不会进入解析与命令流程
+    # - notice 事件只过群名单 (没有群的 notice 如 friend_add 直接放行), 用户名单与 private 只约束消息
+    # - [Access.features."<群号>"] 可以按群关闭 trigger / command 等功能
+from typing import Any, Dict, FrozenSet, Iterable, Optional
+
+
+class AccessControl:
+    """
+    编译后的访问控制表 (只读)
+
+    group_allow 为 None 表示不限制群; 没有 group_id 的事件 (私聊等) 只在 private=True 时放行
+    """
+    __slots__ = ("group_allow", "group_deny", "user_allow", "user_deny", "private", "_disabled")
+
+    def __init__(self,
+                group_allow: Optional[Iterable[Any]] = None,
+                group_deny: Iterable[Any] = (),
+                user_allow: Optional[Iterable[Any]] = None,
+                user_deny: Iterable[Any] = (),
+                private: bool = False,
+                features: Optional[Dict[Any, Dict[str, bool]]] = None):
+        self.group_allow: Optional[FrozenSet[int]] = _id_set(group_allow) if group_allow is not None else None
+        self.group_deny: FrozenSet[int] = _id_set(group_deny)
+        self.user_allow: Optional[FrozenSet[int]] = _id_set(user_allow) if user_allow is not None else None
+        self.user_deny: FrozenSet[int] = _id_set(user_deny)
+        self.private = private
+        self._disabled: Dict[int, FrozenSet[str]] = {
+            int(gid): frozenset(name for name, on in flags.items() if not on)
+            for gid, flags in (features or {}).items()
+        }
+
+    @classmethod
+    def from_config(cls, cfg) -> "AccessControl":
+        """
+        群白名单沿用顶层 group 列表, 其余来自 [Access]:
+        group_deny / user_allow / user_deny / private / features
+        """
+        group_allow = cfg.get_value("group")
+        extra_allow = cfg.get_option("Access", "group_allow")
+        if extra_allow is not None:
+            group_allow = list(group_allow or []) + list(extra_allow)
+
+        return cls(
+            group_allow=group_allow,
+            group_deny=cfg.get_option("Access", "group_deny", ()),
+            user_allow=cfg.get_option("Access", "user_allow"),
+            user_deny=cfg.get_option("Access", "user_deny", ()),
+            private=bool(cfg.get_option("Access", "private", False)),
+            features=cfg.get_option("Access", "features"),
+        )
+
+    def permits(self, group_id: Optional[int], user_id: Optional[int] = None) -> bool:
+        """事件是否允许进入后续流程"""
+        if user_id is not None:
+            if user_id in self.user_deny:
+                return False
+            if self.user_allow is not None and user_id not in self.user_allow:
+                return False
+
+        if group_id is None:
+            return self.private
+        if group_id in self.group_deny:
+            return False
+        return self.group_allow is None or group_id in self.group_allow
+
+    def permits_event(self, data: dict) -> bool:
+        """
+        直接对 OneBot 原始事件判定, 不做任何解析
+        notice 只按群过滤: 成员变动 / 加好友等要让资料缓存失效, 与当事人是否在用户名单里无关
+        """
+        if data.get("post_type") == "notice":
+            group_id = data.get("group_id")
+            return group_id is None or self.permits(group_id)
+        return self.permits(data.get("group_id"), data.get("user_id"))
+
+    def feature(self, group_id: Optional[int], name: str) -> bool:
+        """群功能开关, 未配置时默认开启"""
+        disabled = self._disabled.get(group_id)
+        return disabled is None or name not in disabled
+
+
+def _id_set(ids: Iterable[Any]) -> FrozenSet[int]:
+    return frozenset(int(i) for i in ids)
+
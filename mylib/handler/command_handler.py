@@ -1,2 +1,74 @@
 # 处理指令类消息（如 /help, /image, /ping）
     # - 内部可以注册命令映射表 cmd_map: { "help": func_help, "ping": func_ping }
+    # - 语法解析交给共享的 command_parser (带 LRU 缓存), 这里只负责查注册表并执行
+    # - 控制流全部走 CommandResult, 普通聊天 / 未知命令都不抛异常、不打印
+    # - 高级命令先经 CommandSpec.bind() 转换并校验参数, 不合法的调用不会进入命令代码
+    # - 绑定后交给 registry.run(), 按命令声明的方式 (协程 / 线程池 / 进程池) 执行, 带超时与并发上限
+    # - 同一作用域内进行中的相同命令只执行一次; fanout = once 时重复请求的结果标记为 silent, 不再回复
+import inspect
+from types import MappingProxyType
+from typing import Any, Hashable, Literal, Mapping, NamedTuple, Tuple
+
+from mylib.command import registry
+from mylib.parser import NOT_COMMAND, command_parser
+
+
+CommandStatus = Literal["ok", "not_command", "unknown", "invalid", "timeout", "error"]
+
+
+class CommandResult(NamedTuple):
+    """
+    一次命令处理的结果
+    status: ok 已执行 / not_command 不是命令 / unknown 未注册的命令 / invalid 参数不合法 (未执行)
+            timeout 执行超时 (已取消) / error 命令执行时抛出异常
+    value: 命令的返回值
+    error: invalid / error 时的说明
+    args: 位置参数 (含 bool 开关后面被放回的 token)
+    shared: 结果来自同一时间另一个相同请求的执行
+    silent: 无需回复 (fanout = once 下的重复请求)
+    """
+    status: CommandStatus
+    name: str = ""
+    params: Mapping[str, Any] = MappingProxyType({})
+    error: str = ""
+    value: Any = None
+    args: Tuple[str, ...] = ()
+    shared: bool = False
+    silent: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.status == "ok"
+
+
+NOT_A_COMMAND = CommandResult("not_command")
+
+
+async def execute_command(text: str, scope: Hashable = None) -> CommandResult:
+    """解析并执行一条命令; scope 为相同命令合并执行的作用域 (通常是群号)"""
+    cmd = command_parser.parse(text)
+    if cmd is NOT_COMMAND:
+        return NOT_A_COMMAND
+
+    if cmd.kind == "simple":
+        func = registry.get_simple(cmd.name)
+        if func is None:
+            return CommandResult("unknown", cmd.name)
+        value = func()
+        if inspect.isawaitable(value):
+            value = await value
+        return CommandResult("ok", cmd.name, cmd.params, value=value)
+
+    meta = registry.get_advanced(cmd.name)
+    if not meta:
+        return CommandResult("unknown", cmd.name)
+    params, args = meta.spec.split_flags(cmd.params, cmd.args)
+    ns, error = meta.spec.bind(params)
+    if error is not None:
+        return CommandResult("invalid", cmd.name, params, error, args=args)
+
+    status, value, shared = await registry.run(meta, params, ns, scope)
+    silent = shared and registry.executor.fanout == "once"
+    if status == "error":
+        return CommandResult("error", cmd.name, params, repr(value), args=args, shared=shared, silent=silent)
+    return CommandResult(status, cmd.name, params, value=value, args=args, shared=shared, silent=silent)
@@ -0,0 +1,189 @@
+# 事件分发队列
+    # - stm_msg 只负责入队并立刻应答, 由 worker 池异步消费
+    # - 队列有界, 满载时按 overflow 策略处理 (drop_oldest / reject / block)
+import asyncio
+import inspect
+from dataclasses import dataclass, asdict
+from typing import Any, Callable, Dict, List, Literal, Optional
+
+from mylib.utils import Printer
+
+
+Overflow = Literal["drop_oldest", "reject", "block"]
+
+
+@dataclass
+class QueueStats:
+    """分发队列计数器
+    submitted: 成功入队的事件数
+    processed: 处理完成的事件数
+    failed: 处理时抛出异常的事件数
+    dropped: drop_oldest 策略下被挤掉的旧事件数
+    rejected: reject / block 策略下被拒绝的事件数
+    max_depth: 队列深度的历史峰值
+    """
+    submitted: int = 0
+    processed: int = 0
+    failed: int = 0
+    dropped: int = 0
+    rejected: int = 0
+    max_depth: int = 0
+
+
+class DispatchQueue:
+    """
+    有界事件队列 + worker 池
+
+    handler 可以是普通函数 (放到线程里跑, 不阻塞事件循环) 也可以是协程函数。
+    submit(*args) 入队的参数会原样传给 handler(*args)。
+    """
+    OVERFLOWS = ("drop_oldest", "reject", "block")
+
+    def __init__(self,
+                handler: Callable[..., Any],
+                workers: int = 4,
+                maxsize: int = 1024,
+                overflow: Overflow = "drop_oldest",
+                block_timeout: float = 5.0):
+        if overflow not in self.OVERFLOWS:
+            raise ValueError(f"未知的 overflow 策略: {overflow}")
+        if workers < 1 or maxsize < 1:
+            raise ValueError("workers 与 maxsize 必须为正整数")
+
+        self.handler = handler
+        self.workers = workers
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self.block_timeout = block_timeout
+        self.stats = QueueStats()
+        self.printer = Printer()
+
+        self._is_async = inspect.iscoroutinefunction(handler)
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+
+    @classmethod
+    def from_config(cls, handler: Callable[..., Any], cfg) -> "DispatchQueue":
+        """从 [Dispatcher] 配置节构建"""
+        return cls(
+            handler,
+            workers=int(cfg.get_option("Dispatcher", "workers", 4)),
+            maxsize=int(cfg.get_option("Dispatcher", "queue_size", 1024)),
+            overflow=cfg.get_option("Dispatcher", "overflow", "drop_oldest"),
+            block_timeout=float(cfg.get_option("Dispatcher", "block_timeout", 5.0)),
+        )
+
+
+    # ------------------- 生命周期 -------------------
+    async def start(self) -> None:
+        """在事件循环内创建队列并启动 worker"""
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue(maxsize=self.maxsize)
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"dispatch-worker-{i}")
+            for i in range(self.workers)
+        ]
+
+    async def stop(self) -> None:
+        """停止所有 worker, 未处理的事件直接丢弃 (其中等待中的 future 以 None 完成)"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        while self._queue is not None and not self._queue.empty():
+            _abandon(self._queue.get_nowait())
+            self._queue.task_done()
+
+
+    # ------------------- 入队 -------------------
+    async def submit(self, *args: Any) -> bool:
+        """
+        提交一个事件
+        返回 False 表示事件被拒绝 (调用方应回 503)
+        """
+        queue = self._queue
+        if queue is None:
+            raise RuntimeError("DispatchQueue 未启动，请先调用 start()")
+
+        if queue.full():
+            if self.overflow == "reject":
+                self.stats.rejected += 1
+                return False
+
+            if self.overflow == "drop_oldest":
+                try:
+                    _abandon(queue.get_nowait())
+                    queue.task_done()
+                    self.stats.dropped += 1
+                except asyncio.QueueEmpty:
+                    pass
+
+            elif self.overflow == "block":
+                try:
+                    await asyncio.wait_for(queue.put(args), timeout=self.block_timeout)
+                except asyncio.TimeoutError:
+                    self.stats.rejected += 1
+                    return False
+                self._accepted(queue)
+                return True
+
+        queue.put_nowait(args)
+        self._accepted(queue)
+        return True
+
+    def _accepted(self, queue: asyncio.Queue) -> None:
+        self.stats.submitted += 1
+        depth = queue.qsize()
+        if depth > self.stats.max_depth:
+            self.stats.max_depth = depth
+
+
+    # ------------------- 消费 -------------------
+    async def _worker(self) -> None:
+        queue = self._queue
+        while True:
+            args = await queue.get()
+            try:
+                if self._is_async:
+                    await self.handler(*args)
+                else:
+                    await asyncio.to_thread(self.handler, *args)
+                self.stats.processed += 1
+            except asyncio.CancelledError as e:
+                # 只有 worker 自身被取消 (stop) 才退出; handler 内部漏出的 CancelledError 按失败处理
+                if asyncio.current_task().cancelling():
+                    raise
+                self._failed(e)
+            except Exception as e:
+                self._failed(e)
+            finally:
+                queue.task_done()
+
+    def _failed(self, e: BaseException) -> None:
+        self.stats.failed += 1
+        self.printer.cprint("red", f"[DispatchQueue] 事件处理失败: {e!r}")
+
+
+    # ------------------- 状态 -------------------
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """当前队列状态 (用于 /stats)"""
+        data = asdict(self.stats)
+        data.update(
+            depth=self.depth,
+            maxsize=self.maxsize,
+            workers=self.workers,
+            overflow=self.overflow,
+        )
+        return data
+
+
+def _abandon(args: tuple) -> None:
+    """事件被丢弃时, 完成参数里还在等待的 future (例如 webhook 的快速回复), 让等待方立即返回"""
+    for arg in args:
+        if isinstance(arg, asyncio.Future) and not arg.done():
+            arg.set_result(None)
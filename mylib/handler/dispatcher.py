@@ -1,51 +1,124 @@
 # 消息分发调度器
     # - 接收 Parser 层返回的结构体
     # - 调用对应 Command 层或插件
-from fastapi import Request
+    # - 关键词回复优先通过 reply_to 交还给 webhook 作为快速操作, 来不及时再走出站接口
+    # - 群消息回复走 /send_group_msg, 私聊回复走 /send_private_msg (发给 user_id)
+    # - [Command] rate / burst: 每个群 (私聊按用户) 的命令令牌桶, 多 worker 时桶在协调进程里共用
+    # - notice 事件交给 EventHandler, 使群 / 用户资料缓存失效
+import asyncio
+from typing import Callable, Optional, Tuple
 
-from message_sender import MessageSender
+from mylib.api import GroupAPI, MessageSender, UserAPI
+from mylib.command import registry
+from mylib.parser import EventParser, ParsedEvent, is_command
+from mylib.typ import Reply
+from mylib.utils import Printer, SharedStore
+
+from .access import AccessControl
+from .command_handler import execute_command
+from .event_handler import EventHandler
+from .message_handler import MessageHandler
 
-from message_excute import execute_command
 
 class Cerebrum:
     def __init__(self):
         self.msgsdr = MessageSender()
+        self.parser = EventParser()
+        self.acl = AccessControl.from_config(self.msgsdr.cfg)
+        self.msg_handler = MessageHandler(self.msgsdr, self.msgsdr.cfg)
+        self.printer = Printer()
+        self.shared = SharedStore.init_global()
+        self.rate, self.burst = _rate_limit(self.msgsdr.cfg)
+        self.groups = GroupAPI.from_config(self.msgsdr.client, self.msgsdr.cfg)
+        self.users = UserAPI.from_config(self.msgsdr.client, self.msgsdr.cfg)
+        self.events = EventHandler(self.groups, self.users)
+        registry.configure(self.msgsdr.cfg)
 
-    def command_mind(self, data: Request):
-        flag = 1
-        if self._get_id(data) in self.msgsdr.cfg.group:
-            if self._get_text(data) in self.msgsdr.cfg.message_list:
-                self.msgsdr.send_group_msg(self._get_id(data))
-                flag = 0
-            if self._get_text(data) in self.msgsdr.cfg.image_list:
-                self.msgsdr.send_group_img(self._get_id(data))
-                flag = 0
-            if self._get_text(data) in self.msgsdr.cfg.test_list:
-                self.msgsdr.send_group_img_loli(self._get_id(data))
-                flag = 0
-            if self._get_text(data) == "<yb> -p x --output all":
-                # text = self.yb()
-                text = "Query Successful"
-                test_text = "测试中文"
-                self.msgsdr.send_msg(self._get_id(data), f"{text}")
-                self.msgsdr.send_msg_test(self._get_id(data), f"{test_text}")
-                flag = 0
-                
-            if flag:
-                print(data)
-                print(self._get_text(data))
-                name, parma = execute_command(self._get_text(data))
-                print(name, "\n\n", parma)
-                self.msgsdr.send_msg_test(self._get_id(data), f"{name}: {parma}")
-            
-    def _get_id(self, data: dict) -> str | None:
-        try:
-            return data["group_id"]
-        except (KeyError, IndexError, TypeError):
-            return None
+    def prepare_reload(self, cfg) -> Callable[[], None]:
+        """
+        ConfigWatcher 订阅者: 在新配置上编译 ACL 与触发词索引 (线程中执行),
+        返回的提交函数只做引用替换
+        """
+        acl = AccessControl.from_config(cfg)
+        rate = _rate_limit(cfg)
+        commit_triggers = self.msg_handler.prepare(cfg)
+
+        def commit() -> None:
+            self.acl = acl
+            self.rate, self.burst = rate
+            commit_triggers()
+        return commit
 
-    def _get_text(self, data: dict) -> str | None:
+    def close(self) -> None:
+        """关闭出站连接池与命令执行器"""
+        self.msgsdr.client.close()
+        registry.executor.close()
+
+    async def command_mind(self, data: dict, reply_to: Optional[asyncio.Future] = None):
+        """
+        处理一个事件 (访问控制已在入队前由 self.acl 判定)
+        reply_to: webhook 正在等待的快速回复 future, 处理结束时一定会被完成 (无回复时为 None)
+        """
         try:
-            return str(data["message"][0]["data"]["text"])
-        except (KeyError, IndexError, TypeError):
-            return None
\ No newline at end of file
+            event = self.parser.parse(data)
+            if event.is_message:
+                await self._think(event, reply_to)
+            elif event.post_type == "notice":
+                self.events.handle(event)
+        finally:
+            if reply_to is not None and not reply_to.done():
+                reply_to.set_result(None)
+
+    async def _think(self, event: ParsedEvent, reply_to: Optional[asyncio.Future]):
+        # 私聊 (含群临时会话) 的回复发给 user_id, 不按 group_id 发群消息
+        group_id = event.group_id if event.detail_type != "private" else None
+        user_id = event.user_id
+        text = event.text
+
+        responders = self.msg_handler.match(text) if self.acl.feature(group_id, "trigger") else ()
+        for responder in responders:
+            await self._deliver(group_id, user_id, responder(), reply_to)
+        # 只有触发词回复能走快速操作; 之后的命令执行与出站发送不再占着 webhook 响应
+        if reply_to is not None and not reply_to.done():
+            reply_to.set_result(None)
+
+        if text == "<yb> -p x --output all":
+            # text = self.yb()
+            text = "Query Successful"
+            test_text = "测试中文"
+            await self.msgsdr.send_text(group_id, user_id, f"{text}")
+            await self.msgsdr.send_text(group_id, user_id, f"{test_text}", ascii_only=True)
+
+        elif not responders and self.acl.feature(group_id, "command"):
+            scope = group_id if group_id is not None else ("private", user_id)
+            if self.rate > 0 and text and is_command(text) and \
+                    not await self.shared.take(("command", scope), self.rate, self.burst):
+                return
+            result = await execute_command(text, scope)
+            if result.silent:
+                return
+            if result.ok:
+                await self.msgsdr.send_text(group_id, user_id, f"{result.name}: {dict(result.params)}", ascii_only=True)
+            elif result.status == "invalid":
+                await self.msgsdr.send_text(group_id, user_id, f"<{result.name}> {result.error}")
+            elif result.status == "timeout":
+                await self.msgsdr.send_text(group_id, user_id, f"<{result.name}> 执行超时")
+            elif result.status == "error":
+                self.printer.cprint("red", f"[Cerebrum] 命令 <{result.name}> 执行失败: {result.error}")
+
+    async def _deliver(self,
+                       group_id: Optional[int],
+                       user_id: Optional[int],
+                       reply: Reply,
+                       reply_to: Optional[asyncio.Future]) -> None:
+        """webhook 仍在等待时交给它内联返回, 否则 (已超时 / 已有回复) 走出站接口; group_id 为 None 时私聊发给 user_id"""
+        if reply_to is not None and not reply_to.done():
+            reply_to.set_result(reply)
+            return
+        await self.msgsdr.send_reply(group_id, reply, user_id)
+
+
+def _rate_limit(cfg) -> Tuple[float, float]:
+    """[Command] rate (每秒补充的命令数, 0 为不限) 与 burst (桶容量)"""
+    rate = float(cfg.get_option("Command", "rate", 0) or 0)
+    return rate, float(cfg.get_option("Command", "burst", max(rate, 1.0)))
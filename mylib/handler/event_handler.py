@@ -1 +1,48 @@
 # 非指令事件（成员加群、管理员变动、群禁言等）
+    # - 目前负责让群 / 用户资料缓存随 notice 事件失效, 不产生回复
+    # - group_increase / group_decrease: 成员详情、成员列表、群信息 (人数); 机器人被踢 (kick_me) 时丢弃整个群
+    # - group_admin / group_card / group_ban / notify(title): 该成员的详情与成员列表
+    # - friend_add: 好友列表
+from typing import Dict
+
+from mylib.api import GroupAPI, UserAPI
+from mylib.parser import ParsedEvent
+
+
+class EventHandler:
+    """
+    groups / users: 需要随事件失效的资料缓存
+    handled: 按 notice_type 统计的已处理事件数
+    """
+    MEMBER_NOTICES = frozenset(("group_admin", "group_card", "group_ban"))
+
+    def __init__(self, groups: GroupAPI, users: UserAPI):
+        self.groups = groups
+        self.users = users
+        self.handled: Dict[str, int] = {}
+
+    def handle(self, event: ParsedEvent) -> bool:
+        """处理一个 notice 事件, 返回是否有缓存被失效"""
+        if event.post_type != "notice":
+            return False
+        notice = event.detail_type
+        group_id, user_id = event.group_id, event.user_id
+
+        if notice in ("group_increase", "group_decrease"):
+            if event.sub_type == "kick_me" or (user_id is not None and user_id == event.self_id):
+                self.groups.forget_group(group_id)
+            else:
+                self.groups.invalidate_member(group_id, user_id)
+                self.groups.invalidate_group(group_id)
+        elif notice in self.MEMBER_NOTICES or (notice == "notify" and event.sub_type == "title"):
+            self.groups.invalidate_member(group_id, user_id)
+        elif notice == "friend_add":
+            self.users.invalidate_friends()
+        else:
+            return False
+
+        self.handled[notice] = self.handled.get(notice, 0) + 1
+        return True
+
+    def snapshot(self) -> Dict[str, int]:
+        return dict(self.handled)
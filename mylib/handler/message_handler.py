@@ -1,2 +1,210 @@
 # 普通消息处理（非命令）
     # - 匹配触发关键词（你现在的 if _get_text(data) in cfg.image_list 就是这里）
+    # - 触发词在启动 / 配置变更时一次性编译成 TriggerIndex:
+    #     exact     -> dict 哈希查找
+    #     prefix    -> 字典树从根向下走
+    #     substring -> Aho-Corasick 多模式自动机, 一次扫描找出全部命中
+    # - prepare() 在新配置上编译好索引与模板缓存 (可在线程中执行), 返回的提交函数再一次性替换引用,
+    #   处理中的事件不会看到半成品; rebuild() 是两步连在一起的同步写法
+    # - 固定回复在编译期经 sender.freeze() 预序列化, 重载时换用新的模板缓存
+from collections import deque
+from typing import Any, Callable, Dict, Iterable, List, Literal, Optional, Tuple
+
+from mylib.api import TemplateCache
+from mylib.typ import Reply
+
+
+MatchMode = Literal["exact", "prefix", "substring"]
+Responder = Callable[[], Reply]
+
+
+class Automaton:
+    """
+    Aho-Corasick 自动机 (goto / fail / output 三张表)
+    link=False 时只建字典树, 用于前缀匹配 (output 只含本节点自己的值)
+    """
+    __slots__ = ("goto", "fail", "output")
+
+    def __init__(self, patterns: Iterable[Tuple[str, Any]], link: bool = True):
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.output: List[Tuple[Any, ...]] = [()]
+
+        for pattern, value in patterns:
+            if pattern:
+                self._add(pattern, value)
+        if link:
+            self._link()
+
+    def _add(self, pattern: str, value: Any) -> None:
+        state = 0
+        for ch in pattern:
+            nxt = self.goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self.goto)
+                self.goto[state][ch] = nxt
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append(())
+            state = nxt
+        self.output[state] = self.output[state] + (value,)
+
+    def _link(self) -> None:
+        """BFS 构建失败指针, 并把失败链上的输出合并进来"""
+        goto, fail, output = self.goto, self.fail, self.output
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0) if state else 0
+                if output[fail[nxt]]:
+                    output[nxt] = output[nxt] + output[fail[nxt]]
+
+    def search(self, text: str) -> List[Any]:
+        """返回 text 中所有子串命中的值 (按结束位置先后)"""
+        goto, fail, output = self.goto, self.fail, self.output
+        found: List[Any] = []
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if output[state]:
+                found.extend(output[state])
+        return found
+
+    def longest_prefix(self, text: str) -> Tuple[Any, ...]:
+        """只沿 goto 边从根向下走, 返回 text 最长的前缀命中对应的值"""
+        goto, output = self.goto, self.output
+        found: Tuple[Any, ...] = ()
+        state = 0
+        for ch in text:
+            state = goto[state].get(ch)
+            if state is None:
+                break
+            if output[state]:
+                found = output[state]
+        return found
+
+
+class TriggerIndex:
+    """
+    编译后的触发词索引 (只读)
+
+    add() 收集规则, compile() 之后通过 match() 查询:
+    精确命中优先, 其次最长前缀, 最后子串; 返回命中的值元组。
+    """
+    def __init__(self):
+        self._exact: Dict[str, Tuple[Any, ...]] = {}
+        self._prefix: List[Tuple[str, Any]] = []
+        self._substring: List[Tuple[str, Any]] = []
+        self._prefix_ac: Optional[Automaton] = None
+        self._substring_ac: Optional[Automaton] = None
+
+    def add(self, keyword: str, value: Any, mode: MatchMode = "exact") -> None:
+        if mode == "exact":
+            self._exact[keyword] = self._exact.get(keyword, ()) + (value,)
+        elif mode == "prefix":
+            self._prefix.append((keyword, value))
+        elif mode == "substring":
+            self._substring.append((keyword, value))
+        else:
+            raise ValueError(f"未知的触发词匹配方式: {mode}")
+
+    def compile(self) -> "TriggerIndex":
+        self._prefix_ac = Automaton(self._prefix, link=False) if self._prefix else None
+        self._substring_ac = Automaton(self._substring) if self._substring else None
+        return self
+
+    def match(self, text: Optional[str]) -> Tuple[Any, ...]:
+        if not text:
+            return ()
+
+        hit = self._exact.get(text)
+        if hit:
+            return hit
+
+        if self._prefix_ac is not None:
+            found = self._prefix_ac.longest_prefix(text)
+            if found:
+                return found
+
+        if self._substring_ac is not None:
+            found = self._substring_ac.search(text)
+            if found:
+                return tuple(dict.fromkeys(found))
+
+        return ()
+
+    def __len__(self) -> int:
+        return sum(len(v) for v in self._exact.values()) + len(self._prefix) + len(self._substring)
+
+
+class MessageHandler:
+    """
+    关键词触发回复
+
+    触发词来源:
+    - 顶层 message_list / image_list / test_list (精确匹配, 沿用原有行为)
+    - [[Trigger.rules]]: match = exact / prefix / substring, keywords = [...], text = "..." 或 image = "..."
+    """
+    def __init__(self, sender, cfg):
+        self.sender = sender
+        self.index: TriggerIndex = self.compile(cfg)
+
+    def prepare(self, cfg) -> Callable[[], None]:
+        """按新配置编译索引与模板缓存, 返回提交函数; 提交前旧索引与旧模板照常使用"""
+        templates = TemplateCache(bool(cfg.get_option("Napcat_Client", "ascii_json", False)))
+        index = self.compile(cfg, templates)
+
+        def commit() -> None:
+            self.sender.reconfigure(cfg, templates)
+            self.index = index
+        return commit
+
+    def rebuild(self, cfg) -> None:
+        """按新配置重新编译并原子替换索引, 旧模板随旧索引一起丢弃"""
+        self.prepare(cfg)()
+
+    def match(self, text: Optional[str]) -> Tuple[Responder, ...]:
+        """返回命中的回复构造函数, 未命中时为空元组"""
+        return self.index.match(text)
+
+    def compile(self, cfg, templates: Optional[TemplateCache] = None) -> TriggerIndex:
+        index = TriggerIndex()
+        sender = self.sender
+
+        def freeze(reply: Reply) -> Reply:
+            return sender.freeze(reply, templates)
+
+        text_reply = _static(freeze(sender.text_reply()))
+        for keyword in cfg.get_value("message_list", []):
+            index.add(str(keyword), text_reply)
+        for keyword in cfg.get_value("image_list", []):
+            index.add(str(keyword), sender.file_image_reply)
+        loli_reply = _static(freeze(sender.image_reply()))
+        for keyword in cfg.get_value("test_list", []):
+            index.add(str(keyword), loli_reply)
+
+        for rule in cfg.get_option("Trigger", "rules", []) or []:
+            if "text" in rule:
+                responder = _static(freeze(sender.text_reply(rule["text"])))
+            elif "image" in rule:
+                responder = _static(freeze(sender.image_reply(rule["image"])))
+            else:
+                continue
+            mode = rule.get("match", "exact")
+            for keyword in rule.get("keywords", []):
+                index.add(str(keyword), responder, mode)
+
+        return index.compile()
+
+
+def _static(reply: Reply) -> Responder:
+    """固定回复在编译期就构造 (并校验、序列化) 好"""
+    return lambda: reply
+
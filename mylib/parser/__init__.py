@@ -2,3 +2,15 @@
 # 调用关系 main -> parser -> handler
 # 用于初步解析消息，打包信息，分发
     # 例如将data中的group_id和message分别分发到id_handler和message_handler
+
+from .base_parser import BaseParser, ParsedEvent
+from .command_parser import CommandParser, ParsedCommand, NotCommand, NOT_COMMAND, command_parser, is_command
+from .dedup import EventDeduplicator
+from .event_parser import EventParser
+from .id_parser import IdParser
+from .message_parser import MessageParser
+from .prefilter import IngressFilter
+
+__all__ = ["BaseParser", "ParsedEvent", "CommandParser", "ParsedCommand", "NotCommand", "NOT_COMMAND",
+           "command_parser", "is_command",
+           "EventDeduplicator", "EventParser", "IdParser", "MessageParser", "IngressFilter"]
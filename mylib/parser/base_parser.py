@@ -1,2 +1,116 @@
 # 通用解析器基类
     # - 定义统一接口：parse(data: dict) -> ParsedResult
+    # - ParsedEvent 是解析结果: 每个 OneBot 事件只解析一次, handler 直接读属性
+    # - 构造时只取 post_type / user_id / group_id / text, 消息段与其他字段按需取用, 单 text 段消息的 text 不经过消息段列表
+from typing import Any, Dict, List, Optional
+
+
+# post_type -> 对应的 detail 字段名
+DETAIL_KEYS = {
+    "message": "message_type",
+    "message_sent": "message_type",
+    "notice": "notice_type",
+    "request": "request_type",
+    "meta_event": "meta_event_type",
+}
+
+
+def message_segments(message: Any) -> List[Dict[str, Any]]:
+    """
+    message 字段 -> 消息段列表
+    上报格式为 string (CQ 码) 时整体视为一个 text 段
+    """
+    if isinstance(message, list):
+        return message
+    if isinstance(message, str):
+        return [{"type": "text", "data": {"text": message}}]
+    if isinstance(message, dict):
+        return [message]
+    return []
+
+
+class ParsedEvent:
+    """
+    解析后的 OneBot 事件 (__slots__, 只存引用不拷贝)
+
+    构造时只取每个事件都会读到的 post_type / user_id / group_id / text, 其余字段首次访问时才从 raw 中取出
+    post_type: message / notice / request / meta_event
+    detail_type: message_type / notice_type / request_type / meta_event_type 中对应的一个
+    segments: 原始消息段列表, 非消息事件为空列表, 首次访问时才计算
+    text: 所有 text 段拼接出的纯文本, 非消息事件为空串; 只有一个 text 段时直接取该段, 不经过 segments
+    raw: 原始事件字典
+    """
+    __slots__ = ("post_type", "user_id", "group_id", "text", "raw", "_segments")
+
+    def __init__(self, raw: Dict[str, Any]):
+        get = raw.get
+        self.raw = raw
+        post_type = self.post_type = get("post_type", "")
+        self.user_id: Optional[int] = get("user_id")
+        self.group_id: Optional[int] = get("group_id")
+        self._segments: Optional[List[Dict[str, Any]]] = None
+        self.text: str = ""
+        if post_type != "message" and post_type != "message_sent":
+            return
+        message = get("message")
+        # 快速路径: 最常见的单个 text 段消息, 不经过 segments
+        if type(message) is list and len(message) == 1:
+            seg = message[0]
+            if seg.get("type") == "text":
+                data = seg.get("data")
+                if data:
+                    text = data.get("text", "")
+                    self.text = text if type(text) is str else str(text)
+                return
+        parts = [
+            str(seg["data"].get("text", ""))
+            for seg in self.segments
+            if seg.get("type") == "text" and seg.get("data")
+        ]
+        self.text = parts[0] if len(parts) == 1 else "".join(parts)
+
+    @property
+    def detail_type(self) -> Optional[str]:
+        key = DETAIL_KEYS.get(self.post_type)
+        return self.raw.get(key) if key else None
+
+    @property
+    def sub_type(self) -> Optional[str]:
+        return self.raw.get("sub_type")
+
+    @property
+    def time(self) -> Optional[int]:
+        return self.raw.get("time")
+
+    @property
+    def self_id(self) -> Optional[int]:
+        return self.raw.get("self_id")
+
+    @property
+    def message_id(self) -> Optional[int]:
+        return self.raw.get("message_id")
+
+    @property
+    def segments(self) -> List[Dict[str, Any]]:
+        segments = self._segments
+        if segments is None:
+            if DETAIL_KEYS.get(self.post_type) == "message_type":
+                segments = message_segments(self.raw.get("message"))
+            else:
+                segments = []
+            self._segments = segments
+        return segments
+
+    @property
+    def is_message(self) -> bool:
+        return self.post_type == "message"
+
+    def __repr__(self) -> str:
+        return (f"ParsedEvent({self.post_type}.{self.detail_type}, group={self.group_id}, "
+                f"user={self.user_id}, segments={len(self.segments)})")
+
+
+class BaseParser:
+    """解析器基类"""
+    def parse(self, data: Dict[str, Any]) -> Any:
+        raise NotImplementedError
@@ -1,108 +1,180 @@
-import shlex
-from .registry import registry
+# 命令解析器（纯语法层, 不关心命令是否已注册）
+    # - 简单命令: /ping
+    # - 高级命令: <msg> -o x -m y -df --set=123 "位置参数"
+    # - 手写单遍词法: 一次扫描完成分词、去引号 (含全角引号 “” ‘’)、--k=v / -k=v、-abc 连写与位置参数
+    # - parse() 带有界 LRU 缓存, 结果不可变 (MappingProxy + tuple), 重复的热门命令直接命中
+    # - 首字符分类器挡在解析与缓存之前: 普通聊天直接得到 NOT_COMMAND, 不抛异常、不占缓存
+import re
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Iterator, Mapping, NamedTuple, Tuple, Union
+
+
+# 引号 -> 可以结束它的字符; 全角引号不区分左右 (手机输入法经常打反)
+_QUOTES = {
+    '"': '"', "'": "'",
+    "“": "“”", "”": "“”",
+    "‘": "‘’", "’": "‘’",
+}
+_HAS_QUOTE = re.compile("[\"'“”‘’]")
+_EMPTY: Mapping[str, Any] = MappingProxyType({})
+
+
+class ParsedCommand(NamedTuple):
+    """
+    一次命令解析的结果 (不可变, 可以安全地被缓存共享)
+    kind: simple / advanced
+    name: 简单命令含前导 / (如 /ping), 高级命令为尖括号内的名字 (如 msg)
+    params: 选项 -> 值 (无值的开关为 True)
+    args: 位置参数
+    """
+    kind: str
+    name: str
+    params: Mapping[str, Any]
+    args: Tuple[str, ...]
+
+
+class NotCommand(NamedTuple):
+    """文本不是命令 (普通聊天); 全局只有 NOT_COMMAND 一个实例, 用 is 判断"""
+    kind: str = "none"
+
+
+NOT_COMMAND = NotCommand()
+
+
+def is_command(text: str) -> bool:
+    """
+    首字符分类: / 开头为简单命令, < 开头且含 > 为高级命令
+    只看前导空白之后的第一个字符, 绝大多数聊天文本在这里就被排除
+    """
+    head = text.lstrip()[:1]
+    if head == "/":
+        return True
+    return head == "<" and ">" in text
+
+
+def tokenize(text: str) -> Iterator[Tuple[str, bool]]:
+    """
+    单遍分词, 产出 (token, 首字符是否来自引号内)
+    引号内的空白与 - 都按字面保留, 未闭合的引号一直吃到行尾;
+    --name="a b" 这种选项中间带引号的 token 仍按选项归类, 只有以引号开头的 token ("-x") 才是字面量
+    """
+    if _HAS_QUOTE.search(text) is None:
+        for token in text.split():
+            yield token, False
+        return
+
+    buf = []
+    started = False     # 当前 token 已开始 (空引号 "" 也算一个 token)
+    quoted = False      # 当前 token 以引号开头
+    i, n = 0, len(text)
+    while i < n:
+        ch = text[i]
+        closers = _QUOTES.get(ch)
+        if closers is not None:
+            if not started:
+                started = quoted = True
+            j = i + 1
+            while j < n and text[j] not in closers:
+                j += 1
+            buf.append(text[i + 1:j])
+            i = j + 1
+        elif ch.isspace():
+            if started:
+                yield "".join(buf), quoted
+                buf, started, quoted = [], False, False
+            i += 1
+        else:
+            started = True
+            buf.append(ch)
+            i += 1
+    if started:
+        yield "".join(buf), quoted
 
 
 class CommandParser:
-    def parse(self, text: str):
+    """
+    命令语法解析器
+
+    parse(text) 返回 ParsedCommand, 不是命令时返回 NOT_COMMAND (不抛异常);
+    cache_size 为 LRU 缓存容量, 0 表示不缓存
+    """
+    def __init__(self, cache_size: int = 1024):
+        self.cache_size = cache_size
+        if cache_size > 0:
+            self._cached = lru_cache(maxsize=cache_size)(self._parse)
+        else:
+            self._cached = self._parse
+
+    def parse(self, text: str) -> Union[ParsedCommand, NotCommand]:
+        if not is_command(text):
+            return NOT_COMMAND
+        return self._cached(text)
+
+    def cache_info(self):
+        """LRU 命中统计 (未启用缓存时为 None)"""
+        info = getattr(self._cached, "cache_info", None)
+        return info() if info is not None else None
+
+    def _parse(self, text: str) -> Union[ParsedCommand, NotCommand]:
+        """已通过 is_command() 的文本"""
         text = text.strip()
 
         # 简单命令：/ping
-        if text.startswith("/"):
-            name = text.split()[0]
-            if name in registry.simple_commands:
-                return ("simple", name, {})
-            raise ValueError(f"未知简单命令: {name}")
+        if text[0] == "/":
+            return ParsedCommand("simple", text.split(None, 1)[0], _EMPTY, ())
 
         # 高级命令：<msg> -o x -m y -df --set=123
-        elif text.startswith("<") and ">" in text:
-            name = text[1:text.index(">")]
-            tokens = shlex.split(text[text.index(">") + 1:], posix=False)
-            params = self._parse_params(tokens)
-            return ("advanced", name, params)
-
-        else:
-            raise ValueError("无法识别的命令格式")
-
-    def _parse_params(self, tokens):
+        end = text.find(">")
+        if end <= 1:
+            return NOT_COMMAND
+        params, args = self._parse_params(tokenize(text[end + 1:]))
+        return ParsedCommand("advanced", text[1:end], MappingProxyType(params), args)
+
+    @staticmethod
+    def _parse_params(tokens: Iterator[Tuple[str, bool]]):
+        """
+        边分词边归类, 与 token 流一起只走一遍:
+        --key=value / -k=value 直接赋值; --key / -k 后面跟非选项 token 时取其为值, 否则为 True;
+        -abc 展开为 -a -b -c; --x 这种过短的长参数忽略; 其余 (以及以引号开头的) 都是位置参数
+        """
         params = {}
-        i = 0
-        while i < len(tokens):
-            token = tokens[i]
-
-            # 1️⃣ 长参数赋值 --key=value
-            if token.startswith("--") and "=" in token:
-                key, value = token.split("=", 1)
-                params[key] = value
-                i += 1
-
-            # 2️⃣ 长参数单独使用 --key value
-            elif token.startswith("--"):
-                # 注意：必须防止 "--o" 这种非法长参数通过
-                if len(token) <= 3:
-                    # "--" 或 "--o" 都视为非法长参数
-                    print(f"⚠️  忽略非法长参数: {token}")
-                    i += 1
+        args = []
+        pending = None      # 等待取值的选项名
+
+        for token, quoted in tokens:
+            is_option = not quoted and len(token) > 1 and token[0] == "-"
+            if pending is not None:
+                if not is_option:
+                    params[pending] = token
+                    pending = None
                     continue
-                if i + 1 < len(tokens) and not tokens[i + 1].startswith("-"):
-                    params[token] = tokens[i + 1]
-                    i += 2
-                else:
-                    params[token] = True
-                    i += 1
-
-            # 3️⃣ 短参数赋值 -k=value
-            elif token.startswith("-") and "=" in token:
-                key, value = token.split("=", 1)
-                params[key] = value
-                i += 1
-
-            # 4️⃣ 多短参数连写 -abc → {'-a': True, '-b': True, '-c': True}
-            elif token.startswith("-") and not token.startswith("--") and len(token) > 2 and "=" not in token:
+                params[pending] = True
+                pending = None
+
+            if not is_option:
+                args.append(token)
+                continue
+
+            eq = token.find("=")
+            if token[1] == "-":
+                if eq > 0:
+                    params[token[:eq]] = token[eq + 1:]
+                elif len(token) > 3:
+                    pending = token
+                # "--" 或 "--o" 视为非法长参数, 忽略
+            elif eq > 0:
+                params[token[:eq]] = token[eq + 1:]
+            elif len(token) > 2:
                 for ch in token[1:]:
                     params[f"-{ch}"] = True
-                i += 1
-
-            # 5️⃣ 单短参数 -o 123 或 -f
-            elif token.startswith("-") and not token.startswith("--"):
-                if i + 1 < len(tokens) and not tokens[i + 1].startswith("-"):
-                    params[token] = tokens[i + 1]
-                    i += 2
-                else:
-                    params[token] = True
-                    i += 1
-
-            # 6️⃣ 其他内容（忽略）
             else:
-                i += 1
-
-        return params
-
-import sys, os
-sys.path.append(os.path.dirname(__file__))
+                pending = token
 
-from CAD import CommandParser, registry
-
-def execute_command(text: str):
-    parser = CommandParser()
-    cmd_type, name, params = parser.parse(text)
-    print(cmd_type, name, params)
-
-    if cmd_type == "simple":
-        registry.simple_commands[name]()
-    elif cmd_type == "advanced":
-        meta = registry.get_advanced(name)
-        if not meta:
-            print(f"未知高级命令 <{name}>")
-            return
-        if hasattr(meta, "cls"):
-            cls = meta.cls
-        else:
-            cls = meta["cls"]
-        cmd = cls(params)
-        cmd.execute()
-    return name, params
+        if pending is not None:
+            params[pending] = True
+        return params, tuple(args)
 
 
-if __name__ == "__main__":
-    execute_command("/ping")
-    execute_command("<msg> -o 123456 -m ”hello 小恋“")
+# 模块级共享实例, 缓存跨调用复用
+command_parser = CommandParser()
@@ -0,0 +1,94 @@
+# 入口去重 (Napcat 在 webhook 响应慢时会重发同一事件)
+    # - message 事件以 (self_id, message_id) 为键, 其他事件 (notice / request) 以请求体的 blake2b 摘要为键
+    # - 固定容量的环形缓冲 + 键 -> 槽位 的哈希索引: 写满后覆盖最旧的槽位, 内存上限与事件速率无关
+    # - ttl 内再次出现的键判为重复; 过期条目不主动清理, 等被覆盖时随槽位一起移出索引
+    # - 尚未过期就被覆盖的条目计入 overflow, 持续偏高说明 capacity 小于 事件速率 x ttl
+    # - 事件最终没能入队 (503) 时调用 forget(), 让 Napcat 的重试能正常通过
+import hashlib
+import time
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+
+class EventDeduplicator:
+    """
+    capacity: 环形缓冲槽位数 (同时也是索引的最大条目数)
+    ttl: 重复判定窗口 (秒)
+    duplicates / unique / overflow: 丢弃的重复事件、放行的新事件、提前覆盖的未过期条目计数
+    shared_duplicates: 本地未命中、由其他 worker 判定的重复 (多 worker 模式下由调用方累加)
+    """
+    def __init__(self, capacity: int = 4096, ttl: float = 60.0, clock: Callable[[], float] = time.monotonic):
+        if capacity < 1 or ttl <= 0:
+            raise ValueError("capacity 与 ttl 必须为正数")
+        self.capacity = capacity
+        self.ttl = ttl
+        self.duplicates = 0
+        self.unique = 0
+        self.overflow = 0
+        self.shared_duplicates = 0
+        self._clock = clock
+        self._keys: List[Optional[Hashable]] = [None] * capacity
+        self._stamps: List[float] = [0.0] * capacity
+        self._index: Dict[Hashable, int] = {}
+        self._head = 0
+
+    @classmethod
+    def from_config(cls, cfg) -> "EventDeduplicator":
+        """读取 [Dedup] capacity / ttl"""
+        return cls(
+            capacity=int(cfg.get_option("Dedup", "capacity", 4096)),
+            ttl=float(cfg.get_option("Dedup", "ttl", 60.0)),
+        )
+
+    @staticmethod
+    def key(data: Dict[str, Any], body: bytes) -> Hashable:
+        """message 事件用 (self_id, message_id), 缺字段或其他事件用请求体摘要"""
+        if data.get("post_type") == "message":
+            message_id = data.get("message_id")
+            if message_id is not None:
+                return data.get("self_id"), message_id
+        return hashlib.blake2b(body, digest_size=16).digest()
+
+    def seen(self, key: Hashable) -> bool:
+        """ttl 内见过 key 返回 True (重复); 否则登记并返回 False"""
+        now = self._clock()
+        slot = self._index.get(key)
+        if slot is not None and now - self._stamps[slot] < self.ttl:
+            self.duplicates += 1
+            return True
+
+        if slot is not None:
+            # 同一个键过期后再次出现: 旧槽位作废, 在队头重新登记
+            self._keys[slot] = None
+        head = self._head
+        old = self._keys[head]
+        if old is not None:
+            del self._index[old]
+            if now - self._stamps[head] < self.ttl:
+                self.overflow += 1
+        self._keys[head] = key
+        self._stamps[head] = now
+        self._index[key] = head
+        self._head = (head + 1) % self.capacity
+        self.unique += 1
+        return False
+
+    def forget(self, key: Hashable) -> None:
+        """撤销一次登记 (事件没有被真正处理)"""
+        slot = self._index.pop(key, None)
+        if slot is not None:
+            self._keys[slot] = None
+            self.unique -= 1
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "size": len(self._index),
+            "capacity": self.capacity,
+            "ttl": self.ttl,
+            "unique": self.unique,
+            "duplicates": self.duplicates,
+            "shared_duplicates": self.shared_duplicates,
+            "overflow": self.overflow,
+        }
@@ -1 +1,15 @@
 # 判断事件类型（message / notice / meta_event）
+    # - EventParser 一次性把原始事件解析成 ParsedEvent, 字段提取规则与 IdParser / MessageParser 一致
+    # - parse() 在每个事件上都会跑, 所以构造时只取必读字段, 消息段等在 ParsedEvent 上按需计算
+from typing import Any, Dict
+
+from .base_parser import DETAIL_KEYS, BaseParser, ParsedEvent
+
+
+class EventParser(BaseParser):
+    """OneBot 原始事件 -> ParsedEvent"""
+
+    DETAIL_KEYS = DETAIL_KEYS
+
+    def parse(self, data: Dict[str, Any]) -> ParsedEvent:
+        return ParsedEvent(data)
@@ -1 +1,14 @@
 # 提取 user_id, group_id 等基础字段
+from typing import Any, Dict, Optional, Tuple
+
+from .base_parser import BaseParser
+
+
+Ids = Tuple[Optional[int], Optional[int], Optional[int], Optional[int]]
+
+
+class IdParser(BaseParser):
+    """提取 (self_id, user_id, group_id, message_id), 缺失的字段为 None"""
+    def parse(self, data: Dict[str, Any]) -> Ids:
+        get = data.get
+        return get("self_id"), get("user_id"), get("group_id"), get("message_id")
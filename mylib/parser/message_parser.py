@@ -1 +1,13 @@
 # 解析 message 字段：区分纯文本、图片、混合消息等
+from typing import Any, Dict, List
+
+from .base_parser import BaseParser, message_segments
+
+
+class MessageParser(BaseParser):
+    """
+    取出消息段列表
+    上报格式为 string (CQ 码) 时整体视为一个 text 段
+    """
+    def parse(self, data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        return message_segments(data.get("message"))
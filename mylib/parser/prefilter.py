@@ -0,0 +1,83 @@
+# 入口预过滤（在 JSON 解码之前）
+    # - 直接在请求体字节上嗅探 post_type / meta_event_type
+    # - meta_event (心跳 heartbeat / 生命周期 lifecycle) 只计数并刷新存活状态, 不构造 dict
+    # - 只有 message / notice / request 事件才继续完整解码
+import re
+import time
+from typing import Any, Dict, List
+
+
+_POST_META = re.compile(rb'"post_type"\s*:\s*"meta_event"')
+_SELF_ID = re.compile(rb'"self_id"\s*:\s*(\d+)')
+_INTERVAL = re.compile(rb'"interval"\s*:\s*(\d+)')
+
+
+class IngressFilter:
+    """
+    字节级事件预过滤 + 心跳存活表
+
+    消息内容里的引号在 JSON 中一定是 \\" 转义的, 所以 "post_type" 这样的模式
+    只会命中真正的键, 不会被聊天内容伪造。
+    """
+    def __init__(self):
+        self.heartbeats = 0
+        self.lifecycles = 0
+        self.passed = 0
+        # self_id -> [最后活跃时间 (monotonic), 心跳间隔 ms]
+        self._accounts: Dict[int, List[Any]] = {}
+
+    def admit(self, body: bytes) -> bool:
+        """
+        True: 事件需要完整解码并分发
+        False: meta_event, 已在字节层处理完毕, 直接应答即可
+        """
+        if b'"meta_event"' not in body or _POST_META.search(body) is None:
+            self.passed += 1
+            return True
+
+        if b'"heartbeat"' in body:
+            self.heartbeats += 1
+            self._touch(body, heartbeat=True)
+        else:
+            self.lifecycles += 1
+            self._touch(body, heartbeat=False)
+        return False
+
+    def _touch(self, body: bytes, heartbeat: bool) -> None:
+        """刷新账号的最后活跃时间, 心跳顺便记下上报间隔"""
+        match = _SELF_ID.search(body)
+        if match is None:
+            return
+        self_id = int(match.group(1))
+        account = self._accounts.get(self_id)
+        if account is None:
+            account = self._accounts[self_id] = [0.0, None]
+        account[0] = time.monotonic()
+        if heartbeat:
+            interval = _INTERVAL.search(body)
+            if interval is not None:
+                account[1] = int(interval.group(1))
+
+    def alive(self, self_id: int, grace: float = 2.0) -> bool:
+        """最近 grace 个心跳间隔内收到过该账号的 meta_event 即视为存活"""
+        account = self._accounts.get(self_id)
+        if account is None or account[1] is None:
+            return account is not None
+        return time.monotonic() - account[0] <= account[1] / 1000 * grace
+
+    def snapshot(self) -> Dict[str, Any]:
+        """当前计数与各账号存活状态 (用于 /stats)"""
+        now = time.monotonic()
+        return {
+            "heartbeats": self.heartbeats,
+            "lifecycles": self.lifecycles,
+            "passed": self.passed,
+            "accounts": {
+                self_id: {
+                    "alive": self.alive(self_id),
+                    "last_seen_s": round(now - last_seen, 3),
+                    "interval_ms": interval,
+                }
+                for self_id, (last_seen, interval) in self._accounts.items()
+            },
+        }
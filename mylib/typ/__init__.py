@@ -1,3 +1,7 @@
 # 全局库
 # 定义了所有数据传输模型
     # 例如给napcat/send_group_msg发信的数据需要满足SendGroupMsg模型结构
+
+from .reply import Reply
+
+__all__ = ["Reply"]
@@ -11,6 +11,13 @@ class BaseSend(BaseModel):
         populate_by_name = False
         extra = "ignore"
 
+    def to_bytes(self, ascii_only: bool = False) -> bytes:
+        """
+        直接序列化为最终请求体 (紧凑无缩进, 不再经过 str -> loads -> dumps)
+        校验只在构造时做一次; ascii_only=True 时非 ASCII 字符输出为 \\uXXXX
+        """
+        return self.__pydantic_serializer__.to_json(self, ensure_ascii=ascii_only)
+
 
 class BaseMessage(BaseModel):
     """消息基类"""
@@ -0,0 +1,23 @@
+# 回复结构体
+    # - handler 只负责产出 Reply, 由 Cerebrum 决定怎么送出去
+    # - 能在 webhook 截止时间内完成的, 直接作为 OneBot 快速操作 (quick operation) 写进响应体
+    # - 超时或不在 webhook 上下文中的, 走 /send_group_msg 等出站接口
+    # - 固定回复会挂上预序列化模板, 两条路径都只做字节拼接
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+
+@dataclass
+class Reply:
+    """一条待发送的回复
+    segments: OneBot 消息段列表, 例如 [{"type": "text", "data": {"text": "hi"}}]
+    at_sender: 快速回复时是否 @ 发送者 (仅群聊有效)
+    template: 固定回复的预序列化模板 (PayloadTemplate), 由 MessageSender.freeze() 挂上
+    """
+    segments: List[Dict[str, Any]]
+    at_sender: bool = False
+    template: Any = field(default=None, compare=False, repr=False)
+
+    def quick_operation(self) -> Dict[str, Any]:
+        """转换为 OneBot v11 快速操作响应体"""
+        return {"reply": self.segments, "at_sender": self.at_sender}
@@ -1,7 +1,7 @@
 from pydantic import Field, field_validator
 from typing import Union
 from .base import BaseSend
-from .message_types import TextMessage, ImageMessage
+from .message import TextMessage, ImageMessage
 
 
 Message = Union[TextMessage, ImageMessage]
@@ -14,7 +14,7 @@ class SendPrivateMsg(BaseSend):
 
     @field_validator("user_id")
     def validate_user_id(cls, v):
-        if len(str(v)) < 5 or len(str(v)) > 11:
+        if not 10_000 <= v <= 99_999_999_999:
             raise ValueError("user_id 必须是 5~11 位数字")
         return v
 
@@ -26,6 +26,6 @@ class SendGroupMsg(BaseSend):
 
     @field_validator("group_id")
     def validate_group_id(cls, v):
-        if len(str(v)) < 5 or len(str(v)) > 10:
+        if not 10_000 <= v <= 9_999_999_999:
             raise ValueError("group_id 必须是 5~10 位数字")
         return v
@@ -3,5 +3,9 @@
     # 例如print重构
 
 from .Printer import Printer
+from .codec import JsonCodec, codec
+from .singleflight import SingleFlight
+from .cache import ReadThroughCache, TTLCache
+from .shared import SharedState, SharedStore
 
-__all__ = ["Printer"]
+__all__ = ["Printer", "JsonCodec", "codec", "SingleFlight", "TTLCache", "ReadThroughCache", "SharedState", "SharedStore"]
@@ -0,0 +1,143 @@
+# 有界 LRU + TTL 缓存
+    # - OrderedDict 维护最近使用顺序, 超出 maxsize 时淘汰最久未用的条目
+    # - 每个条目带过期时间 (monotonic), 读取时发现过期即删除并按未命中处理
+    # - 只在事件循环 / 单线程中使用, 不加锁
+    # - ReadThroughCache: TTLCache + SingleFlight, 并发的相同未命中只回源一次
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from .singleflight import SingleFlight
+
+MISSING = object()
+
+
+class TTLCache:
+    """
+    maxsize: 最多保留的条目数
+    ttl: 条目存活秒数
+    hits / misses / expired / evictions: 命中、未命中、过期、容量淘汰计数
+    """
+    def __init__(self, maxsize: int = 128, ttl: float = 60.0, clock: Callable[[], float] = time.monotonic):
+        if maxsize < 1 or ttl <= 0:
+            raise ValueError("maxsize 与 ttl 必须为正数")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+        self._clock = clock
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = MISSING) -> Any:
+        entry = self._data.get(key)
+        if entry is not None:
+            if entry[0] > self._clock():
+                self._data.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            del self._data[key]
+            self.expired += 1
+        self.misses += 1
+        return default
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        self._data[key] = (self._clock() + (self.ttl if ttl is None else ttl), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> bool:
+        """删除单个条目, 返回是否存在"""
+        return self._data.pop(key, None) is not None
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def keys(self) -> Tuple[Hashable, ...]:
+        """当前全部键 (含尚未清理的过期条目) 的快照"""
+        return tuple(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def snapshot(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "expired": self.expired,
+            "evictions": self.evictions,
+        }
+
+
+class ReadThroughCache:
+    """
+    读穿缓存: get(key, loader) 命中直接返回, 未命中时 await loader() 并写回
+
+    - 同一 key 的并发未命中经 SingleFlight 合并, 只调用一次 loader
+    - 某个调用者被取消 (例如命令超时) 不影响同 key 的其他等待者, 回源照常完成并写回
+    - loader 抛出的异常不缓存, 原样抛给所有等待者
+    - 回源期间发生过任何失效 (invalidate / invalidate_where / clear) 时结果不写回,
+      避免旧数据在失效之后又被放进缓存
+    """
+    def __init__(self, maxsize: int = 1024, ttl: float = 300.0, clock: Callable[[], float] = time.monotonic):
+        self.cache = TTLCache(maxsize, ttl, clock)
+        self.flights = SingleFlight()
+        self.invalidations = 0
+        self._epoch = 0
+
+    async def get(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        value = self.cache.get(key)
+        if value is not MISSING:
+            return value
+        value, _ = await self.flights.do(key, lambda: self._load(key, loader))
+        return value
+
+    async def refresh(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """跳过缓存直接回源 (仍与进行中的同 key 请求合并), 结果写回"""
+        self.cache.invalidate(key)
+        value, _ = await self.flights.do(key, lambda: self._load(key, loader))
+        return value
+
+    async def _load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        epoch = self._epoch
+        value = await loader()
+        if epoch == self._epoch:
+            self.cache.set(key, value)
+        return value
+
+    def invalidate(self, key: Hashable) -> bool:
+        self._epoch += 1
+        self.invalidations += 1
+        return self.cache.invalidate(key)
+
+    def invalidate_where(self, predicate: Callable[[Hashable], bool]) -> int:
+        """按条件批量失效 (例如某个群的全部成员), 返回删除条数"""
+        self._epoch += 1
+        keys = [k for k in self.cache.keys() if predicate(k)]
+        for key in keys:
+            self.cache.invalidate(key)
+        self.invalidations += len(keys)
+        return len(keys)
+
+    def clear(self) -> None:
+        self._epoch += 1
+        self.cache.clear()
+
+    def __len__(self) -> int:
+        return len(self.cache)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            **self.cache.snapshot(),
+            "invalidations": self.invalidations,
+            "coalesced": self.flights.hits,
+            "inflight": self.flights.inflight(),
+        }
@@ -0,0 +1,82 @@
+# JSON 编解码层（入口解码 / 出站编码共用）
+    # - 安装了 orjson 或 msgspec 时自动使用, 否则回落到标准库 json
+    # - dumps() 直接产出最终请求字节, 紧凑无缩进
+    # - ascii_only=True 时一次性输出 \uXXXX 转义 (Napcat 不支持 UTF-8 时的兼容模式),
+    #   orjson / msgspec 没有这个选项, 统一交给标准库的 C 编码器一次完成
+import json
+from typing import Any, Callable, Dict, Literal, Optional, Tuple, Union
+
+Backend = Literal["auto", "orjson", "msgspec", "json"]
+
+
+def _load_orjson() -> Optional[Tuple[Callable, Callable]]:
+    try:
+        import orjson
+    except ImportError:
+        return None
+    return orjson.loads, orjson.dumps
+
+
+def _load_msgspec() -> Optional[Tuple[Callable, Callable]]:
+    try:
+        import msgspec
+    except ImportError:
+        return None
+    return msgspec.json.decode, msgspec.json.Encoder().encode
+
+
+def _load_json() -> Tuple[Callable, Callable]:
+    encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+    def dumps(obj: Any) -> bytes:
+        return encoder.encode(obj).encode("utf-8")
+
+    return json.loads, dumps
+
+
+_BACKENDS: Dict[str, Callable[[], Optional[Tuple[Callable, Callable]]]] = {
+    "orjson": _load_orjson,
+    "msgspec": _load_msgspec,
+    "json": _load_json,
+}
+
+
+class JsonCodec:
+    """
+    可插拔 JSON 编解码器
+
+    backend="auto" 时按 orjson -> msgspec -> json 的顺序选第一个可用的;
+    显式指定的后端未安装时抛出 ImportError
+    """
+    def __init__(self, backend: Backend = "auto"):
+        if backend == "auto":
+            for name in ("orjson", "msgspec", "json"):
+                funcs = _BACKENDS[name]()
+                if funcs is not None:
+                    break
+        else:
+            if backend not in _BACKENDS:
+                raise ValueError(f"未知的 JSON 后端: {backend}")
+            name, funcs = backend, _BACKENDS[backend]()
+            if funcs is None:
+                raise ImportError(f"JSON 后端 {backend} 未安装")
+
+        self.name: str = name
+        self._loads, self._dumps = funcs
+        self._ascii = json.JSONEncoder(ensure_ascii=True, separators=(",", ":"))
+
+    def loads(self, data: Union[bytes, bytearray, str]) -> Any:
+        """解码请求体 (bytes / str 均可)"""
+        return self._loads(data)
+
+    def dumps(self, obj: Any, ascii_only: bool = False) -> bytes:
+        """编码为最终发送的字节; ascii_only=True 时非 ASCII 字符输出为 \\uXXXX"""
+        if ascii_only:
+            return self._ascii.encode(obj).encode("ascii")
+        return self._dumps(obj)
+
+    def __repr__(self) -> str:
+        return f"JsonCodec({self.name})"
+
+
+codec = JsonCodec()
@@ -0,0 +1,213 @@
+# 跨进程共享状态
+    # - 多 worker 部署时, 由主进程在 Unix socket 上启动一个协调进程 (multiprocessing BaseManager),
+    #   各 worker 通过地址与 authkey (环境变量传递) 连接; 单进程时直接使用进程内的同一份实现
+    # - 提供三类原语:
+    #     claim / publish / release / wait: 跨进程的 single-flight 与去重 (谁先 claim 谁执行, 其余等待结果)
+    #     take:                             令牌桶限流, 桶在协调进程里, 所有 worker 共用同一个额度
+    #     snapshot:                         计数统计
+    # - 远程调用是阻塞的 socket 往返, 经 asyncio.to_thread 执行, 不占用事件循环
+    # - 协调进程不可用时调用会抛出异常, 使用方应退回到进程内行为
+import asyncio
+import os
+import threading
+import time
+from multiprocessing.managers import BaseManager
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+ENV_ADDRESS = "YOSACAT_SHARED_ADDRESS"
+ENV_AUTHKEY = "YOSACAT_SHARED_AUTHKEY"
+
+_SWEEP_EVERY = 1024
+
+
+class SharedState:
+    """
+    协调进程中实际保存状态的对象 (也是单进程模式下的本地实现), 所有方法线程安全
+
+    claims:  key -> 过期时间, 过期的 claim 视为持有者已失联, 可以被重新 claim
+    results: key -> (过期时间, value), 只为等待者短暂保留
+    buckets: key -> [剩余令牌, 上次补充时间, 补满时间]
+    """
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._claims: Dict[Hashable, float] = {}
+        self._results: Dict[Hashable, Tuple[float, Any]] = {}
+        self._buckets: Dict[Hashable, list] = {}
+        self._ops = 0
+        self.stats = {"claimed": 0, "contended": 0, "published": 0, "waited": 0, "throttled": 0}
+
+    def claim(self, key: Hashable, ttl: float) -> bool:
+        """成功返回 True (调用方负责执行并 publish / release); key 已被他人持有时返回 False"""
+        now = time.monotonic()
+        with self._cond:
+            self._sweep(now)
+            deadline = self._claims.get(key)
+            if deadline is not None and deadline > now:
+                self.stats["contended"] += 1
+                return False
+            self._claims[key] = now + ttl
+            self._results.pop(key, None)
+            self.stats["claimed"] += 1
+            return True
+
+    def publish(self, key: Hashable, value: Any, ttl: float) -> None:
+        """发布结果并释放 claim, 唤醒所有等待者"""
+        with self._cond:
+            self._claims.pop(key, None)
+            self._results[key] = (time.monotonic() + ttl, value)
+            self.stats["published"] += 1
+            self._cond.notify_all()
+
+    def release(self, key: Hashable) -> None:
+        """不发布结果地释放 claim (例如结果无法跨进程传递), 等待者会自行执行"""
+        with self._cond:
+            self._claims.pop(key, None)
+            self._cond.notify_all()
+
+    def wait(self, key: Hashable, timeout: float) -> Tuple[bool, Any]:
+        """等待 key 的结果, 返回 (是否拿到, 结果); 超时或 claim 被释放却没有结果时为 (False, None)"""
+        end = time.monotonic() + timeout
+        with self._cond:
+            self.stats["waited"] += 1
+            while True:
+                now = time.monotonic()
+                result = self._results.get(key)
+                if result is not None and result[0] > now:
+                    return True, result[1]
+                deadline = self._claims.get(key)
+                if deadline is None or deadline <= now or now >= end:
+                    return False, None
+                self._cond.wait(min(end, deadline) - now)
+
+    def take(self, key: Hashable, rate: float, burst: float, n: float = 1.0) -> bool:
+        """令牌桶: 每秒补充 rate 个, 最多积攒 burst 个; 令牌足够时扣除并返回 True"""
+        now = time.monotonic()
+        with self._cond:
+            self._sweep(now)
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [float(burst), now, now]
+            else:
+                bucket[0] = min(float(burst), bucket[0] + (now - bucket[1]) * rate)
+                bucket[1] = now
+            allowed = bucket[0] >= n
+            if allowed:
+                bucket[0] -= n
+            else:
+                self.stats["throttled"] += 1
+            bucket[2] = now + (burst - bucket[0]) / rate if rate > 0 else float("inf")
+            return allowed
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                **self.stats,
+                "claims": len(self._claims),
+                "results": len(self._results),
+                "buckets": len(self._buckets),
+            }
+
+    def _sweep(self, now: float) -> None:
+        """定期清理过期的 claim / 结果, 以及已经补满的令牌桶 (补满的桶与不存在的桶等价)"""
+        self._ops += 1
+        if self._ops % _SWEEP_EVERY:
+            return
+        for key in [k for k, d in self._claims.items() if d <= now]:
+            del self._claims[key]
+        for key in [k for k, r in self._results.items() if r[0] <= now]:
+            del self._results[key]
+        for key in [k for k, b in self._buckets.items() if b[2] <= now]:
+            del self._buckets[key]
+
+
+# ------------------- 协调进程 -------------------
+_state: Optional[SharedState] = None
+
+
+def _get_state() -> SharedState:
+    """协调进程里所有连接共用同一个 SharedState"""
+    global _state
+    if _state is None:
+        _state = SharedState()
+    return _state
+
+
+class _Coordinator(BaseManager):
+    pass
+
+
+_Coordinator.register("state", callable=_get_state)
+
+
+class SharedStore:
+    """
+    SharedState 的异步门面
+
+    remote=False: 进程内实现, 方法直接调用 (wait 除外)
+    remote=True:  协调进程的代理, 每次调用都放进线程里执行
+    """
+    def __init__(self, state: Any, remote: bool = False):
+        self.state = state
+        self.remote = remote
+
+    @classmethod
+    def local(cls) -> "SharedStore":
+        return cls(SharedState())
+
+    @classmethod
+    def connect(cls, address: str, authkey: bytes) -> "SharedStore":
+        manager = _Coordinator(address=address, authkey=authkey)
+        manager.connect()
+        return cls(manager.state(), remote=True)
+
+    @staticmethod
+    def serve(address: str, authkey: bytes) -> BaseManager:
+        """在 address (Unix socket 路径) 上启动协调进程, 并通过环境变量告知之后启动的 worker"""
+        if os.path.exists(address):
+            os.remove(address)
+        manager = _Coordinator(address=address, authkey=authkey)
+        manager.start()
+        os.environ[ENV_ADDRESS] = address
+        os.environ[ENV_AUTHKEY] = authkey.hex()
+        return manager
+
+
+    # ------------------- 全局单例 -------------------
+    _global_instance: Optional["SharedStore"] = None
+
+    @classmethod
+    def init_global(cls) -> "SharedStore":
+        """环境变量中有协调进程地址时连接它, 否则使用进程内实现"""
+        if cls._global_instance is None:
+            address = os.environ.get(ENV_ADDRESS)
+            if address:
+                cls._global_instance = cls.connect(address, bytes.fromhex(os.environ.get(ENV_AUTHKEY, "")))
+            else:
+                cls._global_instance = cls.local()
+        return cls._global_instance
+
+
+    # ------------------- 原语 -------------------
+    async def claim(self, key: Hashable, ttl: float = 30.0) -> bool:
+        return await self._call("claim", key, ttl)
+
+    async def publish(self, key: Hashable, value: Any, ttl: float = 5.0) -> None:
+        await self._call("publish", key, value, ttl)
+
+    async def release(self, key: Hashable) -> None:
+        await self._call("release", key)
+
+    async def wait(self, key: Hashable, timeout: float) -> Tuple[bool, Any]:
+        return await asyncio.to_thread(self.state.wait, key, timeout)
+
+    async def take(self, key: Hashable, rate: float, burst: float, n: float = 1.0) -> bool:
+        return await self._call("take", key, rate, burst, n)
+
+    async def snapshot(self) -> Dict[str, Any]:
+        return {"remote": self.remote, **(await self._call("snapshot"))}
+
+    async def _call(self, name: str, *args: Any) -> Any:
+        fn = getattr(self.state, name)
+        if self.remote:
+            return await asyncio.to_thread(fn, *args)
+        return fn(*args)
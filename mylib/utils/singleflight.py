@@ -0,0 +1,52 @@
+# 进行中请求合并 (single-flight)
+    # - 同一个 key 同时只执行一次, 期间到达的相同请求挂到同一个 future 上等待结果
+    # - 执行结束 (无论成功失败) 立刻移除 key, 之后的请求重新执行; 结果不做缓存
+    # - 执行放在独立的 task 里: 调用者被取消不会把 CancelledError 传给其他等待者
+    # - hits: 合并掉的重复请求数, misses: 真正执行的次数
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+
+class SingleFlight:
+    """
+    协程级 single-flight
+
+    do(key, fn) 返回 (结果, 是否为合并的重复请求);
+    fn 抛出的异常会原样抛给所有等待者
+    fn 在独立的 task 中执行, 任何一个调用者 (包括第一个) 被取消都只影响它自己
+    """
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        call = self._calls.get(key)
+        shared = call is not None
+        if shared:
+            self.hits += 1
+        else:
+            self.misses += 1
+            call = self._calls[key] = asyncio.ensure_future(fn())
+            call.add_done_callback(lambda task: self._done(key, task))
+        # shield: 调用者被取消 (例如外层 wait_for 超时) 时不取消共享的执行
+        return await asyncio.shield(call), shared
+
+    def _done(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            # 所有调用者都已离开时, 避免 "exception was never retrieved" 警告
+            task.exception()
+
+    def inflight(self) -> int:
+        return len(self._calls)
+
+    def snapshot(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "inflight": len(self._calls),
+        }
@@ -0,0 +1,67 @@
+import os, sys
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import timeit
+
+from mylib import Printer
+from mylib.config.base import ConfigDictWrapper
+from mylib.handler.access import AccessControl
+
+
+SIZES = [10, 100, 1_000, 10_000, 100_000]
+
+
+def _per_call(stmt, number: int) -> float:
+    """单次调用耗时 (纳秒), 取 5 轮中最快的一轮"""
+    return min(timeit.repeat(stmt, number=number, repeat=5)) / number * 1e9
+
+
+def bench_group_check():
+    p = Printer()
+    p.cprint("cyan", "\n=== 群白名单判定: ConfigDictWrapper `in` vs AccessControl.permits ===")
+    p.cprint("magenta", f"{'groups':>8} | {'wrapper hit':>12} | {'wrapper miss':>12} | {'acl hit':>8} | {'acl miss':>8}")
+
+    for n in SIZES:
+        groups = list(range(100000000, 100000000 + n))
+        wrapper = ConfigDictWrapper(groups, "toml.group")
+        acl = AccessControl(group_allow=groups)
+
+        last, missing = groups[-1], 1
+        number = max(1, 200_000 // n)
+
+        w_hit = _per_call(lambda: last in wrapper, number)
+        w_miss = _per_call(lambda: missing in wrapper, number)
+        a_hit = _per_call(lambda: acl.permits(last, 10001), 200_000)
+        a_miss = _per_call(lambda: acl.permits(missing, 10001), 200_000)
+
+        p.cprint("green", f"{n:>8} | {w_hit:>10.0f}ns | {w_miss:>10.0f}ns | {a_hit:>6.0f}ns | {a_miss:>6.0f}ns")
+
+
+def test_semantics():
+    p = Printer()
+    p.cprint("cyan", "\n=== 访问控制语义 ===")
+    acl = AccessControl(
+        group_allow=[123456, "654321"],
+        group_deny=[654321],
+        user_deny=[10002],
+        features={"123456": {"command": False}},
+    )
+    cases = [
+        (acl.permits(123456, 10001), True),
+        (acl.permits(654321, 10001), False),
+        (acl.permits(111111, 10001), False),
+        (acl.permits(123456, 10002), False),
+        (acl.permits(None, 10001), False),
+        (acl.permits_event({"group_id": 123456, "user_id": 10001}), True),
+        (acl.feature(123456, "command"), False),
+        (acl.feature(123456, "trigger"), True),
+        (acl.feature(654321, "command"), True),
+    ]
+    for i, (got, expected) in enumerate(cases):
+        color = "green" if got == expected else "red"
+        p.cprint(color, f"  [{i}] {got} (期望 {expected})")
+
+
+if __name__ == "__main__":
+    test_semantics()
+    bench_group_check()
@@ -0,0 +1,139 @@
+import os, sys
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import json
+import timeit
+
+from mylib import Printer
+from mylib.utils import JsonCodec
+from mylib.typ.message import TextMessage, TextMessageData, ImageMessage, ImageMessageData
+from mylib.typ.send_types import SendGroupMsg
+from mylib.typ import Reply
+from mylib.api.template import PayloadTemplate
+
+
+GROUP_EVENT = {
+    "time": 1730000000, "self_id": 3000000001, "post_type": "message",
+    "message_type": "group", "sub_type": "normal", "message_id": 1234567,
+    "group_id": 123456789, "user_id": 10001,
+    "sender": {"user_id": 10001, "nickname": "恋", "card": "小恋", "role": "member"},
+    "raw_message": "[CQ:at,qq=3000000001] <msg> -i 123456 -m 小恋最喜欢你了哦",
+    "font": 14, "message_format": "array",
+    "message": [
+        {"type": "at", "data": {"qq": "3000000001"}},
+        {"type": "text", "data": {"text": " <msg> -i 123456 -m 小恋最喜欢你了哦"}},
+    ],
+}
+
+NOTICE_EVENT = {
+    "time": 1730000000, "self_id": 3000000001, "post_type": "notice",
+    "notice_type": "group_increase", "sub_type": "approve",
+    "group_id": 123456789, "user_id": 10002, "operator_id": 10001,
+}
+
+SEND_TEXT = {
+    "auto_escape": False, "group_id": 123456789,
+    "message": {"type": "text", "data": {"text": "小恋最喜欢你了哦~ miss you~"}},
+}
+
+SEND_IMAGE = {
+    "group_id": 123456789,
+    "message": [{"type": "image", "data": {"file": "https://www.loliapi.com/bg/"}}],
+}
+
+
+def _ns(stmt, number: int = 100_000) -> float:
+    return min(timeit.repeat(stmt, number=number, repeat=5)) / number * 1e9
+
+
+def _codecs():
+    found = []
+    for name in ("json", "msgspec", "orjson"):
+        try:
+            found.append(JsonCodec(name))
+        except ImportError:
+            Printer().cprint("yellow", f"  ({name} 未安装, 跳过)")
+    return found
+
+
+def bench_decode():
+    p = Printer()
+    p.cprint("cyan", "\n=== 入口解码 loads(bytes) ===")
+    for name, event in (("group_message", GROUP_EVENT), ("notice", NOTICE_EVENT)):
+        body = json.dumps(event, ensure_ascii=False).encode("utf-8")
+        for c in _codecs():
+            p.cprint("green", f"  {name:<14} {c.name:<8} {_ns(lambda: c.loads(body)):8.0f}ns")
+
+
+def bench_encode():
+    p = Printer()
+    p.cprint("cyan", "\n=== 出站编码 dumps(obj) -> bytes ===")
+    for name, payload in (("send_text", SEND_TEXT), ("send_image", SEND_IMAGE)):
+        for c in _codecs():
+            p.cprint("green", f"  {name:<12} {c.name:<8} utf-8 {_ns(lambda: c.dumps(payload)):8.0f}ns")
+        c = _codecs()[0]
+        p.cprint("green", f"  {name:<12} {'ascii':<8} 1-pass {_ns(lambda: c.dumps(payload, ascii_only=True)):7.0f}ns")
+
+        # 旧写法: model_dump_json(indent=2) 的字符串再 loads + dumps(ensure_ascii=True, indent=2)
+        indented = json.dumps(payload, ensure_ascii=False, indent=2)
+        old = _ns(lambda: json.dumps(json.loads(indented), ensure_ascii=True, indent=2).encode())
+        p.cprint("yellow", f"  {name:<12} {'ascii':<8} old    {old:7.0f}ns (loads + dumps 二次往返)")
+
+
+def test_roundtrip():
+    p = Printer()
+    p.cprint("cyan", "\n=== 往返一致性 ===")
+    for c in _codecs():
+        ok = c.loads(c.dumps(GROUP_EVENT)) == GROUP_EVENT
+        ascii_ok = c.dumps(SEND_TEXT, ascii_only=True).isascii() and c.loads(c.dumps(SEND_TEXT, ascii_only=True)) == SEND_TEXT
+        p.cprint("green" if ok and ascii_ok else "red", f"  {c.name:<8} utf-8={ok} ascii={ascii_ok}")
+
+
+def bench_send_model():
+    p = Printer()
+    p.cprint("cyan", "\n=== SendGroupMsg 构造 + 序列化: 旧链路 vs to_bytes ===")
+
+    def build():
+        return SendGroupMsg(group_id=123456789, message=TextMessage(type="text", data=TextMessageData(text="测试中文")))
+
+    def old_chain():
+        # build -> model_dump_json(indent=2) -> loads -> dumps(ensure_ascii=True, indent=2)
+        send_msg = build().model_dump_json(indent=2, ensure_ascii=False)
+        return json.dumps(json.loads(send_msg), ensure_ascii=True, indent=2).encode()
+
+    old = _ns(old_chain, 50_000)
+    new_ascii = _ns(lambda: build().to_bytes(ascii_only=True), 50_000)
+    new_utf8 = _ns(lambda: build().to_bytes(), 50_000)
+    only = build()
+    ser = _ns(lambda: only.to_bytes(ascii_only=True), 50_000)
+
+    same = json.loads(old_chain()) == json.loads(build().to_bytes(ascii_only=True))
+    p.cprint("green" if same else "red", f"  内容一致: {same}")
+    p.cprint("yellow", f"  old chain (ascii)     {old:8.0f}ns")
+    p.cprint("green", f"  to_bytes (ascii)      {new_ascii:8.0f}ns  (仅序列化 {ser:.0f}ns)")
+    p.cprint("green", f"  to_bytes (utf-8)      {new_utf8:8.0f}ns")
+
+
+def bench_template():
+    p = Printer()
+    p.cprint("cyan", "\n=== 固定回复: 每次构造模型 vs 预序列化模板 ===")
+
+    reply = Reply([{"type": "image", "data": {"file": "https://www.loliapi.com/bg/"}}])
+    template = PayloadTemplate(reply)
+
+    def build():
+        return SendGroupMsg(group_id=123456789, message=ImageMessage(type="image", data=ImageMessageData(file="https://www.loliapi.com/bg/"))).to_bytes()
+
+    rendered, built = json.loads(template.render(123456789)), json.loads(build())
+    same = rendered["group_id"] == built["group_id"] and rendered["message"] == [built["message"]]
+    p.cprint("green" if same else "red", f"  内容一致: {same}")
+    p.cprint("yellow", f"  model + to_bytes      {_ns(build, 50_000):8.0f}ns")
+    p.cprint("green", f"  template.render       {_ns(lambda: template.render(123456789)):8.0f}ns")
+
+
+if __name__ == "__main__":
+    test_roundtrip()
+    bench_decode()
+    bench_encode()
+    bench_send_model()
+    bench_template()
@@ -0,0 +1,179 @@
+import os, sys
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import shlex
+import timeit
+
+from mylib import Printer
+from mylib.command.base import CommandMeta, Param
+from mylib.command.registry import CommandRegistry
+from mylib.command.spec import CommandSpec, args_key
+from mylib.parser import CommandParser
+
+
+COMMANDS = {
+    "simple": "/ping",
+    "short": "<msg> -i 123456 -m hello",
+    "mixed": "<msg> -i 123456 -m 小恋最喜欢你了哦 -df --set=123 --output all -k=v",
+    "quoted": '<msg> -i 123456 -m ”hello 小恋“ --title "a b c" pos',
+}
+
+# (命令, 期望的 params, 期望的 args)
+EXPECTED = [
+    ('<msg> --name="hello world" -x', {"--name": "hello world", "-x": True}, ()),
+    ('<msg> -m="a b" -i 1', {"-m": "a b", "-i": "1"}, ()),
+    ('<msg> --title "a b c" pos', {"--title": "a b c"}, ("pos",)),
+    ('<msg> "-x" ”-y z“', {}, ("-x", "-y z")),
+    ('<msg> -m "" tail', {"-m": ""}, ("tail",)),
+]
+
+# bool 开关: (命令, 期望的 force, 期望的 args)
+FLAGS = [
+    ("<cmd> -f hello", True, ("hello",)),
+    ("<cmd> -f hello world -m x", True, ("hello", "world")),
+    ("<cmd> -f no", False, ()),
+    ("<cmd> --force=yes", True, ()),
+    ("<cmd> -m x", None, ()),
+]
+
+CHATS = ["早上好", "哈哈哈哈哈 今天吃什么", "  <3 你们都好可爱"]
+
+
+# ------------------- 旧写法: shlex.split + 六分支 _parse_params -------------------
+def old_parse(text):
+    text = text.strip()
+    if text.startswith("/"):
+        return ("simple", text.split()[0], {})
+    elif text.startswith("<") and ">" in text:
+        name = text[1:text.index(">")]
+        tokens = shlex.split(text[text.index(">") + 1:], posix=False)
+        return ("advanced", name, old_params(tokens))
+    raise ValueError("无法识别的命令格式")
+
+
+def old_params(tokens):
+    params = {}
+    i = 0
+    while i < len(tokens):
+        token = tokens[i]
+        if token.startswith("--") and "=" in token:
+            key, value = token.split("=", 1)
+            params[key] = value
+            i += 1
+        elif token.startswith("--"):
+            if len(token) <= 3:
+                i += 1
+                continue
+            if i + 1 < len(tokens) and not tokens[i + 1].startswith("-"):
+                params[token] = tokens[i + 1]
+                i += 2
+            else:
+                params[token] = True
+                i += 1
+        elif token.startswith("-") and "=" in token:
+            key, value = token.split("=", 1)
+            params[key] = value
+            i += 1
+        elif token.startswith("-") and not token.startswith("--") and len(token) > 2 and "=" not in token:
+            for ch in token[1:]:
+                params[f"-{ch}"] = True
+            i += 1
+        elif token.startswith("-") and not token.startswith("--"):
+            if i + 1 < len(tokens) and not tokens[i + 1].startswith("-"):
+                params[token] = tokens[i + 1]
+                i += 2
+            else:
+                params[token] = True
+                i += 1
+        else:
+            i += 1
+    return params
+
+
+def _ns(stmt, number: int = 50_000) -> float:
+    return min(timeit.repeat(stmt, number=number, repeat=5)) / number * 1e9
+
+
+def test_parse():
+    p = Printer()
+    p.cprint("cyan", "\n=== 解析结果 ===")
+    parser = CommandParser(cache_size=0)
+    for name, text in COMMANDS.items():
+        cmd = parser.parse(text)
+        p.cprint("green", f"  {name:<7} {cmd.name} {dict(cmd.params)} args={cmd.args}")
+        p.cprint("yellow", f"  {'旧':<7} {old_parse(text)[2]}")
+
+    p.cprint("cyan", "\n=== 引号与选项 ===")
+    for text, params, args in EXPECTED:
+        cmd = parser.parse(text)
+        ok = dict(cmd.params) == params and cmd.args == args
+        p.cprint("green" if ok else "red", f"  {text:<32} {dict(cmd.params)} args={cmd.args}")
+
+    p.cprint("cyan", "\n=== bool 开关后的非布尔 token 放回位置参数 ===")
+    spec = CommandSpec(CommandMeta("cmd", "", [Param("-f", "--force", bool), Param("-m", "--message", str)]))
+    for text, force, args in FLAGS:
+        cmd = parser.parse(text)
+        params, rest = spec.split_flags(cmd.params, cmd.args)
+        ns, error = spec.bind(params)
+        ok = error is None and ns.force == force and rest == args
+        p.cprint("green" if ok else "red", f"  {text:<32} force={ns.force if ns else error} args={rest}")
+
+
+def test_invalidate():
+    p = Printer()
+    p.cprint("cyan", "\n=== 结果缓存失效: 与 run() 使用同一个 key ===")
+    registry = CommandRegistry()
+    registry.register_advanced(CommandMeta("q", "", [Param("-i", "--id", int, required=True),
+                                                     Param("-t", "--tags", list)], cache_ttl=60))
+    spec, cache = registry.advanced_commands["q"].spec, registry.caches["q"]
+    for text, kwargs in (("<q> -i 01 -t a,b", {"id": 1, "tags": ["a", "b"]}),
+                         ("<q> -i 2", {"id": 2})):
+        ns, _ = spec.bind(CommandParser(cache_size=0).parse(text).params)
+        cache.set(args_key(ns), text)
+        removed = registry.invalidate("q", **kwargs)
+        p.cprint("green" if removed == 1 else "red", f"  {text:<20} invalidate(**{kwargs}) -> {removed}")
+
+    try:
+        registry.invalidate("q", idd=1)
+        p.cprint("red", "  未知参数名没有报错")
+    except KeyError as e:
+        p.cprint("green", f"  未知参数名 -> KeyError {e}")
+
+
+def bench_parse():
+    p = Printer()
+    p.cprint("cyan", "\n=== 单条命令解析耗时: shlex 旧实现 vs 单遍分词 vs LRU 命中 ===")
+    uncached = CommandParser(cache_size=0)
+    cached = CommandParser()
+    for name, text in COMMANDS.items():
+        cached.parse(text)
+        old = _ns(lambda: old_parse(text))
+        new = _ns(lambda: uncached.parse(text))
+        hit = _ns(lambda: cached.parse(text))
+        p.cprint("green", f"  {name:<7} old {old:8.0f}ns   new {new:7.0f}ns ({old / new:4.1f}x)   cached {hit:5.0f}ns")
+    p.cprint("cyan", f"  {cached.cache_info()}")
+
+
+def bench_reject():
+    p = Printer()
+    p.cprint("cyan", "\n=== 普通聊天文本: 抛出 ValueError vs 首字符分类 ===")
+    parser = CommandParser()
+
+    def old_reject(text):
+        try:
+            old_parse(text)
+        except ValueError:
+            return None
+
+    for text in CHATS:
+        old = _ns(lambda: old_reject(text), 200_000)
+        new = _ns(lambda: parser.parse(text), 200_000)
+        p.cprint("green", f"  {text[:12]:<12} old {old:6.0f}ns   new {new:5.0f}ns ({old / new:4.1f}x)")
+    p.cprint("cyan", f"  缓存未被聊天文本占用: {parser.cache_info()}")
+
+
+if __name__ == "__main__":
+    test_parse()
+    test_invalidate()
+    bench_parse()
+    bench_reject()
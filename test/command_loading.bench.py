@@ -0,0 +1,92 @@
+import os, sys
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import shutil
+import subprocess
+import tempfile
+
+from mylib import Printer
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGE = "synth_commands"
+COUNT = 500
+
+SIMPLE = '''from mylib.command.decorators import simple_command
+
+
+@simple_command("/s{i}")
+def s{i}():
+    return {i}
+'''
+
+ADVANCED = '''from mylib.command.decorators import command, argument
+from mylib.command.base import BaseCommand
+
+
+@argument("-i", "--id", int, True)
+@argument("-m", "--message", str)
+@argument("-f", "--force", bool)
+@command(name="a{i}", description="synthetic command {i}")
+class A{i}(BaseCommand):
+    def execute(self):
+        return self.ns.id
+'''
+
+# 子进程里只计时注册表的装载, mylib 自身的导入不计入
+PROBE = '''
+import sys, time
+sys.path[:0] = [{tmp!r}, {root!r}]
+from mylib.command import registry
+t = time.perf_counter()
+registry.{call}({package!r})
+load = time.perf_counter() - t
+t = time.perf_counter()
+meta = registry.get_advanced("a{last}")
+first = time.perf_counter() - t
+assert meta is not None and meta.spec.bind({{"-i": "1"}})[0].id == 1
+print(load * 1000, first * 1000, len(registry.advanced_commands) + len(registry.simple_commands))
+'''
+
+
+def make_tree(tmp: str) -> None:
+    """生成 COUNT 个命令模块: simple/ 与 advanced/ 各一半"""
+    for kind, template in (("simple", SIMPLE), ("advanced", ADVANCED)):
+        pkg = os.path.join(tmp, PACKAGE, kind)
+        os.makedirs(pkg)
+        open(os.path.join(pkg, "__init__.py"), "w").close()
+        for i in range(COUNT // 2):
+            with open(os.path.join(pkg, f"c{i}.py"), "w", encoding="utf-8") as f:
+                f.write(template.format(i=i))
+
+
+def probe(tmp: str, call: str):
+    code = PROBE.format(tmp=tmp, root=ROOT, call=call, package=PACKAGE, last=COUNT // 2 - 1)
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    load, first, registered = out.split()
+    return float(load), float(first), int(registered)
+
+
+def bench_loading():
+    p = Printer()
+    p.cprint("cyan", f"\n=== 启动装载 {COUNT} 个命令: auto_import (全部导入) vs 清单 + 按需导入 ===")
+    tmp = tempfile.mkdtemp(prefix="yosacat-cmds-")
+    try:
+        make_tree(tmp)
+
+        load, first, registered = probe(tmp, "load_manifest")
+        p.cprint("yellow", f"  清单首次生成 (ast 扫描) {load:8.1f}ms")
+
+        probe(tmp, "auto_import")  # 预热 __pycache__, 两边都按热启动比较
+        eager = min(probe(tmp, "auto_import") for _ in range(3))
+        lazy = min(probe(tmp, "load_manifest") for _ in range(3))
+
+        p.cprint("yellow", f"  eager  装载 {eager[0]:8.1f}ms  已注册 {eager[2]}")
+        p.cprint("green", f"  lazy   装载 {lazy[0]:8.1f}ms  已注册 {lazy[2]}  首次调用导入 {lazy[1]:.2f}ms")
+        p.cprint("green", f"  启动加速 {eager[0] / lazy[0]:.1f}x")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    bench_loading()
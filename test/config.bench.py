@@ -0,0 +1,83 @@
+import os, sys
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import timeit
+import tomllib
+
+from mylib import Printer
+from mylib.config.base import ConfigDictWrapper
+
+
+EXAMPLE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config.example.toml")
+
+
+# ------------------- 旧写法: 每次访问都新建包装器并拼接路径 -------------------
+class OldWrapper:
+    def __init__(self, data, path=""):
+        self._data = data
+        self._path = path
+
+    def __getattr__(self, name):
+        if name == 'raw':
+            return self._data
+        if isinstance(self._data, dict) and name in self._data:
+            new_path = f"{self._path}.{name}" if self._path else name
+            return self._wrap_value(self._data[name], new_path)
+        raise AttributeError(name)
+
+    def __getitem__(self, key):
+        if (isinstance(self._data, dict) and key in self._data) or (isinstance(self._data, list) and 0 <= key < len(self._data)):
+            return self._wrap_value(self._data[key], f"{self._path}[{key}]")
+        raise KeyError(key)
+
+    def __iter__(self):
+        if isinstance(self._data, list):
+            for i, item in enumerate(self._data):
+                yield self._wrap_value(item, f"{self._path}[{i}]")
+        else:
+            for key in self._data:
+                yield self._wrap_value(self._data[key], f"{self._path}.{key}")
+
+    def _wrap_value(self, value, path):
+        if isinstance(value, (dict, list)):
+            return OldWrapper(value, path)
+        return value
+
+    def _items(self):
+        for k, v in self._data.items():
+            yield k, self._wrap_value(v, f"{self._path}.{k}")
+
+
+# ------------------- config_loader.test.py 中的访问方式 -------------------
+PATTERNS = {
+    "Test.test":          lambda w: w.Test.test,
+    "List.item[0].name":  lambda w: w.List.item[0].name,
+    "iter List.item":     lambda w: [item.name for item in w.List.item],
+    "_items()":           lambda w: [(k, getattr(v, "raw", v)) for k, v in w._items()],
+    "List.item.raw":      lambda w: w.List.item.raw,
+}
+
+
+def _ns(stmt, number: int = 200_000) -> float:
+    return min(timeit.repeat(stmt, number=number, repeat=5)) / number * 1e9
+
+
+def bench_access():
+    p = Printer()
+    p.cprint("cyan", "\n=== ConfigDictWrapper 重复访问: 每次新建 vs 子节点缓存 ===")
+    with open(EXAMPLE, "rb") as f:
+        section = tomllib.load(f)["Lian_Love"]
+    old = OldWrapper(section, "toml.Lian_Love")
+    new = ConfigDictWrapper(section, "toml.Lian_Love")
+
+    for name, access in PATTERNS.items():
+        same = str(access(old)) == str(access(new))
+        o = _ns(lambda: access(old))
+        n = _ns(lambda: access(new))
+        p.cprint("green" if same else "red", f"  {name:<18} old {o:6.0f}ns   new {n:6.0f}ns ({o / n:4.1f}x)")
+
+    p.cprint("cyan", f"  重复访问返回同一对象: {new.List.item[0] is new.List.item[0]}")
+
+
+if __name__ == "__main__":
+    bench_access()
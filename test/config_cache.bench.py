@@ -0,0 +1,78 @@
+import os, sys
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import tempfile
+import time
+import tomllib
+
+from mylib import ConfigLoader, Printer
+from mylib.config import ParsedConfigCache, parsed_cache
+
+
+EXAMPLE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config.example.toml")
+
+
+def _make_config(directory: str, size: int = 1 << 20) -> str:
+    """在 config.example.toml 之后追加触发规则与群列表, 直到约 size 字节"""
+    with open(EXAMPLE, "r", encoding="utf-8") as f:
+        text = f.read()
+    parts = [text, "\n[Groups]\nlist = [" + ", ".join(str(100000 + i) for i in range(5000)) + "]\n"]
+    i = 0
+    while sum(len(p) for p in parts) < size:
+        parts.append(
+            f'\n[[Trigger.rules]]\nmatch = "substring"\n'
+            f'keywords = ["关键词{i}", "keyword_{i}", "kw-{i}-a", "kw-{i}-b"]\ntext = "回复 {i}"\n'
+        )
+        i += 1
+    path = os.path.join(directory, "config.toml")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("".join(parts))
+    return path
+
+
+def _us(fn, number: int = 20) -> float:
+    best = float("inf")
+    for _ in range(5):
+        t = time.perf_counter()
+        for _ in range(number):
+            fn()
+        best = min(best, (time.perf_counter() - t) / number)
+    return best * 1e6
+
+
+def _parse(path: str):
+    with open(path, "rb") as f:
+        return tomllib.load(f)
+
+
+def bench_cache():
+    p = Printer()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = _make_config(tmp)
+        p.cprint("cyan", f"\n=== 1MB TOML 加载 ({os.path.getsize(path) / 1024:.0f}KB) ===")
+
+        cold = _us(lambda: _parse(path), number=3)
+        # 每次新建缓存对象, 相当于新进程启动: 只能命中磁盘副本
+        ParsedConfigCache().load(path, _parse)
+        sidecar = _us(lambda: ParsedConfigCache().load(path, _parse))
+        shared = ParsedConfigCache(sidecar=False)
+        shared.load(path, _parse)
+        hot = _us(lambda: shared.load(path, _parse), number=2000)
+
+        p.cprint("yellow", f"  tomllib 冷解析          {cold:10.1f}us")
+        p.cprint("green", f"  磁盘副本 (新进程)       {sidecar:10.1f}us  ({cold / sidecar:6.1f}x)")
+        p.cprint("green", f"  进程内命中              {hot:10.1f}us  ({cold / hot:6.1f}x)")
+        p.cprint("blue", f"  结果一致: {shared.load(path, _parse) == _parse(path)}")
+
+        p.cprint("cyan", "\n=== ConfigLoader 构造 (discovery 模式) ===")
+        parsed_cache.sidecar = False
+        cold_loader = _us(lambda: (parsed_cache.clear(), ConfigLoader(config_path=path)), number=3)
+        hot_loader = _us(lambda: ConfigLoader(config_path=path), number=2000)
+        parsed_cache.sidecar = True
+        p.cprint("yellow", f"  每次重新解析            {cold_loader:10.1f}us")
+        p.cprint("green", f"  缓存命中                {hot_loader:10.1f}us  ({cold_loader / hot_loader:6.1f}x)")
+        p.cprint("blue", f"  parsed_cache: {parsed_cache.snapshot()}")
+
+
+if __name__ == "__main__":
+    bench_cache()
@@ -0,0 +1,55 @@
+import os, sys
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import inspect
+import time
+
+from mylib import ConfigLoader, Printer
+
+
+EXAMPLE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config.example.toml")
+
+
+# ------------------- 旧写法: 每个新公开属性 + 解析 config_path 都调用 inspect.stack() -------------------
+class LegacyLoader(ConfigLoader):
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if not name.startswith('_') and hasattr(self, "tracker"):
+            if name not in self.tracker.map:
+                caller_func = inspect.stack()[1].function
+                self._record_source(name, f"{self.__class__.__name__} -> {caller_func}")
+
+    def __init__(self, *args, **kwargs):
+        if kwargs.get("config_path") is not None:
+            inspect.stack()
+        super().__init__(*args, **kwargs)
+
+
+def _ms(factory, number: int = 50) -> float:
+    best = float("inf")
+    for _ in range(5):
+        t = time.perf_counter()
+        for _ in range(number):
+            factory()
+        best = min(best, (time.perf_counter() - t) / number)
+    return best * 1000
+
+
+def bench_startup():
+    p = Printer()
+    p.cprint("cyan", "\n=== ConfigLoader 构造耗时 (discovery 模式, config.example.toml) ===")
+    legacy = _ms(lambda: LegacyLoader(config_path=EXAMPLE))
+    debug = _ms(lambda: ConfigLoader(config_path=EXAMPLE, debug=True))
+    prod = _ms(lambda: ConfigLoader(config_path=EXAMPLE))
+
+    p.cprint("yellow", f"  inspect.stack()       {legacy:8.3f}ms")
+    p.cprint("green", f"  debug (_getframe)     {debug:8.3f}ms  ({legacy / debug:.1f}x)")
+    p.cprint("green", f"  production            {prod:8.3f}ms  ({legacy / prod:.1f}x)")
+
+    p.cprint("cyan", "\n=== 来源追踪条目 ===")
+    p.cprint("blue", f"  debug:      {len(ConfigLoader(config_path=EXAMPLE, debug=True).tracker.map)} 条")
+    p.cprint("blue", f"  production: {len(ConfigLoader(config_path=EXAMPLE).tracker.map)} 条 (仅显式登记)")
+
+
+if __name__ == "__main__":
+    bench_startup()
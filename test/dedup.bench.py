@@ -0,0 +1,71 @@
+import os, sys
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import time
+import tracemalloc
+
+from mylib import Printer
+from mylib.parser import EventDeduplicator
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _feed(dedup: EventDeduplicator, clock: FakeClock, events: int, rate: float):
+    """每 10 条新事件夹一条 Napcat 重发, 逐条产出已处理的事件数"""
+    for i in range(1, events + 1):
+        clock.now = i / rate
+        dedup.seen((3000000001, i))
+        if i % 10 == 0:
+            dedup.seen((3000000001, i - 3))
+        yield i
+
+
+def bench_sustained(events: int = 1_000_000, rate: float = 10_000.0, capacity: int = 4096, ttl: float = 0.3):
+    """按 rate 条/秒的模拟时钟持续灌入新事件, 观察单次判定耗时与内存是否封顶"""
+    p = Printer()
+    p.cprint("cyan", f"\n=== 持续 {rate:.0f} 条/秒, 共 {events} 条 (capacity={capacity}, ttl={ttl}s) ===")
+
+    clock = FakeClock()
+    dedup = EventDeduplicator(capacity=capacity, ttl=ttl, clock=clock)
+    t = time.perf_counter()
+    for _ in _feed(dedup, clock, events, rate):
+        pass
+    elapsed = time.perf_counter() - t
+    p.cprint("green", f"  {elapsed / (events + events // 10) * 1e9:6.0f}ns / 次判定")
+    p.cprint("green", f"  {dedup.snapshot()}")
+
+    # tracemalloc 会拖慢判定, 单独跑一轮观察内存
+    clock = FakeClock()
+    dedup = EventDeduplicator(capacity=capacity, ttl=ttl, clock=clock)
+    checkpoints = {events // 10, events // 2, events}
+    tracemalloc.start()
+    for i in _feed(dedup, clock, events, rate):
+        if i in checkpoints:
+            current, _ = tracemalloc.get_traced_memory()
+            p.cprint("blue", f"  {i:>9} 条后: 索引 {len(dedup):5d} 条, 追踪内存 {current / 1024:8.1f}KB")
+    tracemalloc.stop()
+
+
+def bench_keys():
+    p = Printer()
+    p.cprint("cyan", "\n=== 键计算 ===")
+    message = {"post_type": "message", "self_id": 3000000001, "message_id": 123}
+    notice = {"post_type": "notice"}
+    body = b'{"post_type":"notice","notice_type":"group_increase","group_id":123456,"user_id":1}' * 4
+    for name, data in (("message_id", message), ("payload hash", notice)):
+        n = 200_000
+        t = time.perf_counter()
+        for _ in range(n):
+            EventDeduplicator.key(data, body)
+        p.cprint("green", f"  {name:<13} {(time.perf_counter() - t) / n * 1e9:6.0f}ns")
+
+
+if __name__ == "__main__":
+    bench_sustained()
+    bench_keys()
@@ -0,0 +1,151 @@
+import os, sys
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import asyncio
+import random
+import time
+from collections import Counter
+
+from mylib import Printer
+from mylib.api import GroupAPI, UserAPI
+from mylib.handler import DispatchQueue
+from mylib.handler.event_handler import EventHandler
+from mylib.parser import EventParser
+
+
+LATENCY = 0.02
+
+
+class FakeClient:
+    """Napcat 替身: 每次调用固定延迟, 按 action 计数; 成员名片取自 cards, 便于观察失效后的新值"""
+    def __init__(self):
+        self.calls = Counter()
+        self.cards = {}
+
+    async def call(self, action, payload=None, idempotent=None, timeout=None):
+        self.calls[action] += 1
+        await asyncio.sleep(LATENCY)
+        if action == "get_group_member_info":
+            key = (payload["group_id"], payload["user_id"])
+            return {"retcode": 0, "data": {**payload, "card": self.cards.get(key, "")}}
+        if action == "get_stranger_info" and payload["user_id"] < 0:
+            return {"retcode": 100, "wording": "用户不存在", "data": None}
+        return {"retcode": 0, "data": dict(payload or {})}
+
+
+async def bench_burst(p: Printer, n: int = 200):
+    """同一时刻 n 个相同查询 (例如一条消息触发多个插件查发送者资料)"""
+    client = FakeClient()
+    groups = GroupAPI(client)
+    t = time.perf_counter()
+    results = await asyncio.gather(*(groups.get_group_member_info(123456, 1) for _ in range(n)))
+    elapsed = time.perf_counter() - t
+    ok = all(r is results[0] for r in results)
+    p.cprint("green" if ok else "red",
+             f"  {n} 个并发相同查询: 回源 {client.calls['get_group_member_info']} 次, 耗时 {elapsed * 1000:.1f}ms, "
+             f"合并 {groups.snapshot()['coalesced']} 次")
+
+
+async def bench_hit_rate(p: Printer, lookups: int = 20_000, members: int = 2_000, maxsize: int = 1024):
+    """按 Zipf 分布查询群成员 (少数活跃成员占大多数消息), 观察命中率与回源次数"""
+    client = FakeClient()
+    groups = GroupAPI(client, maxsize=maxsize)
+    weights = [1 / (rank + 1) for rank in range(members)]
+    users = random.Random(0).choices(range(members), weights, k=lookups)
+    for start in range(0, lookups, 50):
+        await asyncio.gather(*(groups.get_group_member_info(123456, uid) for uid in users[start:start + 50]))
+    stats = groups.snapshot()
+    p.cprint("green", f"  {lookups} 次查询 / {members} 名成员 (maxsize={maxsize}): 命中率 {stats['hit_rate']:.1%}, "
+                      f"回源 {client.calls['get_group_member_info']} 次 (无缓存需 {lookups} 次)")
+    p.cprint("blue", f"  {stats}")
+
+
+async def check_leader_timeout(p: Printer):
+    """第一个查询者在命令超时里被取消, 合并进来的其他查询仍拿到结果, 分发 worker 不受影响"""
+    client = FakeClient()
+    groups = GroupAPI(client)
+    leader = asyncio.create_task(asyncio.wait_for(groups.get_group_info(123456), LATENCY / 4))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(groups.get_group_info(123456))
+    leader_result, follower_result = await asyncio.gather(leader, follower, return_exceptions=True)
+    ok = isinstance(leader_result, asyncio.TimeoutError) and follower_result == {"group_id": 123456} \
+        and not follower.cancelled() and len(groups.cache) == 1
+    p.cprint("green" if ok else "red",
+             f"  首个查询超时: 首个 {type(leader_result).__name__}, 合并者 {follower_result!r}, "
+             f"回源 {client.calls['get_group_info']} 次, 结果已缓存 {len(groups.cache) == 1}")
+
+    async def lookup(timeout):
+        await asyncio.wait_for(groups.get_group_info(654321), timeout)
+
+    groups.cache.clear()
+    queue = DispatchQueue(lookup, workers=2)
+    await queue.start()
+    await queue.submit(LATENCY / 4)
+    await queue.submit(None)
+    await asyncio.sleep(LATENCY * 2)
+    alive = sum(not task.done() for task in queue._tasks)
+    stats = queue.snapshot()
+    await queue.stop()
+    p.cprint("green" if alive == 2 else "red",
+             f"  DispatchQueue(workers=2): 存活 worker {alive}, processed {stats['processed']}, failed {stats['failed']}")
+
+
+async def check_invalidation(p: Printer):
+    client = FakeClient()
+    groups, users = GroupAPI(client), UserAPI(client)
+    events = EventHandler(groups, users)
+    parser = EventParser()
+
+    def notice(**fields):
+        return parser.parse({"post_type": "notice", "self_id": 3000000001, "group_id": 123456, **fields})
+
+    client.cards[(123456, 1)] = "旧名片"
+    before = await groups.get_group_member_info(123456, 1)
+    await groups.get_group_member_list(123456)
+    await groups.get_group_info(123456)
+    client.cards[(123456, 1)] = "新名片"
+    stale = await groups.get_group_member_info(123456, 1)
+    events.handle(notice(notice_type="group_card", user_id=1, card_new="新名片", card_old="旧名片"))
+    after = await groups.get_group_member_info(123456, 1)
+    ok = before["card"] == stale["card"] == "旧名片" and after["card"] == "新名片"
+    p.cprint("green" if ok else "red", f"  group_card: 失效前 {stale['card']} -> 失效后 {after['card']}")
+
+    # 回源进行中收到失效事件: 旧结果不写回缓存
+    pending = asyncio.create_task(groups.get_group_member_info(123456, 2))
+    await asyncio.sleep(LATENCY / 2)
+    events.handle(notice(notice_type="group_admin", sub_type="set", user_id=2))
+    await pending
+    p.cprint("green" if ("member", 123456, 2) not in groups.cache.cache.keys() else "red",
+             "  回源期间失效: 结果未写回缓存")
+
+    calls = client.calls["get_group_info"]
+    events.handle(notice(notice_type="group_increase", sub_type="approve", user_id=3))
+    await groups.get_group_info(123456)
+    p.cprint("green" if client.calls["get_group_info"] == calls + 1 else "red", "  group_increase: 群信息重新回源")
+
+    events.handle(notice(notice_type="group_decrease", sub_type="kick_me", user_id=3000000001))
+    p.cprint("green" if not any(key[1:2] == (123456,) for key in groups.cache.cache.keys()) else "red",
+             "  kick_me: 该群缓存全部丢弃")
+
+    try:
+        await users.get_stranger_info(-1)
+        p.cprint("red", "  retcode 非 0 未抛出 ApiError")
+    except Exception as e:
+        p.cprint("green" if len(users.cache) == 0 else "red", f"  retcode 非 0: {type(e).__name__}, 未缓存")
+    p.cprint("blue", f"  已处理 notice: {events.snapshot()}")
+
+
+async def main():
+    p = Printer()
+    p.cprint("cyan", f"\n=== 并发相同查询 (回源延迟 {LATENCY * 1000:.0f}ms) ===")
+    await bench_burst(p)
+    p.cprint("cyan", "\n=== 命中率 ===")
+    await bench_hit_rate(p)
+    p.cprint("cyan", "\n=== 首个查询者被取消 ===")
+    await check_leader_timeout(p)
+    p.cprint("cyan", "\n=== notice 失效 ===")
+    await check_invalidation(p)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
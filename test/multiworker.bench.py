@@ -0,0 +1,88 @@
+import os, sys
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+import http.client
+import json
+import multiprocessing
+import socket
+import subprocess
+import time
+
+from mylib import Printer
+
+
+# 心跳走字节层快速路径, 群消息走 解码 -> ACL -> 队列 -> 快速回复等待 的完整入口
+HEARTBEAT = b'{"time":1730000000,"self_id":3000000001,"post_type":"meta_event","meta_event_type":"heartbeat","status":{"online":true,"good":true},"interval":30000}'
+MESSAGE = json.dumps({
+    "post_type": "message", "message_type": "group", "group_id": 123456, "user_id": 1,
+    "self_id": 3000000001, "message_id": 1,
+    "message": [{"type": "text", "data": {"text": "just chatting"}}],
+}).encode()
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _start(workers: int, port: int) -> subprocess.Popen:
+    code = f"import main; main.serve(workers={workers}, host='127.0.0.1', port={port}, log_level='warning')"
+    proc = subprocess.Popen([sys.executable, "-c", code], cwd=ROOT)
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", "/stats")
+            if conn.getresponse().status == 200:
+                return proc
+        except OSError:
+            time.sleep(0.2)
+    proc.kill()
+    raise RuntimeError("服务启动超时")
+
+
+def _client(port: int, seconds: float, body: bytes) -> int:
+    """单个客户端进程: keep-alive 连接上连续发请求, 返回完成数"""
+    conn = http.client.HTTPConnection("127.0.0.1", port)
+    headers = {"Content-Type": "application/json"}
+    done = 0
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        conn.request("POST", "/", body, headers)
+        conn.getresponse().read()
+        done += 1
+    return done
+
+
+def _load(port: int, clients: int, seconds: float, body: bytes) -> float:
+    with multiprocessing.Pool(clients) as pool:
+        counts = pool.starmap(_client, [(port, seconds, body)] * clients)
+    return sum(counts) / seconds
+
+
+def bench_scaling(seconds: float = 3.0):
+    p = Printer()
+    cores = os.cpu_count() or 1
+    levels = sorted({1, 2, min(4, cores), cores} & set(range(1, cores + 1))) if cores > 1 else [1, 2]
+    p.cprint("cyan", f"\n=== 多 worker 入口吞吐 (CPU {cores} 核, 客户端进程数 = 2 x workers) ===")
+    if cores == 1:
+        p.cprint("yellow", "  只有 1 个核心, 无法观察扩展性, 结果仅作对照")
+
+    base = {}
+    for workers in levels:
+        port = _free_port()
+        proc = _start(workers, port)
+        try:
+            for name, body in (("heartbeat", HEARTBEAT), ("message", MESSAGE)):
+                rps = _load(port, 2 * workers, seconds, body)
+                base.setdefault(name, rps)
+                p.cprint("green", f"  workers={workers:<3} {name:<10} {rps:10.0f} req/s  ({rps / base[name]:4.2f}x)")
+        finally:
+            proc.terminate()
+            proc.wait(timeout=10)
+
+
+if __name__ == "__main__":
+    bench_scaling()
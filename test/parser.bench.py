@@ -0,0 +1,86 @@
+import os, sys
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import timeit
+
+from mylib import Printer
+from mylib.parser import EventParser
+
+
+GROUP_TEXT = {
+    "time": 1730000000, "self_id": 3000000001, "post_type": "message",
+    "message_type": "group", "sub_type": "normal", "message_id": 1234567,
+    "group_id": 123456789, "user_id": 10001,
+    "sender": {"user_id": 10001, "nickname": "恋", "card": "", "role": "member"},
+    "raw_message": "miss you", "font": 14, "message_format": "array",
+    "message": [{"type": "text", "data": {"text": "miss you"}}],
+}
+
+GROUP_MIXED = dict(GROUP_TEXT, message=[
+    {"type": "reply", "data": {"id": "7654321"}},
+    {"type": "at", "data": {"qq": "3000000001"}},
+    {"type": "text", "data": {"text": " <msg> -i 123456 -m "}},
+    {"type": "image", "data": {"file": "https://example.com/a.png"}},
+    {"type": "text", "data": {"text": "hello 小恋"}},
+])
+
+NOTICE = {
+    "time": 1730000000, "self_id": 3000000001, "post_type": "notice",
+    "notice_type": "group_increase", "sub_type": "approve",
+    "group_id": 123456789, "user_id": 10002, "operator_id": 10001,
+}
+
+
+# ------------------- 旧写法: 每次访问都重新索引原始字典 -------------------
+def _get_id(data):
+    try:
+        return data["group_id"]
+    except (KeyError, IndexError, TypeError):
+        return None
+
+
+def _get_text(data):
+    try:
+        return str(data["message"][0]["data"]["text"])
+    except (KeyError, IndexError, TypeError):
+        return None
+
+
+def old_dispatch(data):
+    """原 Cerebrum.command_mind 的访问模式: _get_id 1 次 + _get_text 最多 5 次"""
+    _get_id(data)
+    for _ in range(5):
+        _get_text(data)
+
+
+def new_dispatch(parser, data):
+    """新 Cerebrum 的访问模式: 解析一次, 之后只读属性"""
+    event = parser.parse(data)
+    event.group_id
+    event.text
+
+
+def test_parse():
+    p = Printer()
+    p.cprint("cyan", "\n=== ParsedEvent 解析结果 ===")
+    parser = EventParser()
+    for name, data in (("group_text", GROUP_TEXT), ("group_mixed", GROUP_MIXED), ("notice", NOTICE)):
+        event = parser.parse(data)
+        p.cprint("green", f"  {name}: {event!r} text={event.text!r}")
+
+
+def bench_parse():
+    p = Printer()
+    parser = EventParser()
+    number = 200_000
+    p.cprint("cyan", "\n=== 单事件处理耗时: 逐次取值 vs 一次解析 ===")
+    for name, data in (("group_text", GROUP_TEXT), ("group_mixed", GROUP_MIXED), ("notice", NOTICE)):
+        old = min(timeit.repeat(lambda: old_dispatch(data), number=number, repeat=5)) / number * 1e9
+        new = min(timeit.repeat(lambda: new_dispatch(parser, data), number=number, repeat=5)) / number * 1e9
+        only = min(timeit.repeat(lambda: parser.parse(data), number=number, repeat=5)) / number * 1e9
+        p.cprint("green", f"  {name:<12} old={old:7.0f}ns  new={new:7.0f}ns  (parse only {only:.0f}ns)")
+
+
+if __name__ == "__main__":
+    test_parse()
+    bench_parse()
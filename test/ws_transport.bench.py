@@ -0,0 +1,260 @@
+import os, sys
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import asyncio
+import http.client
+import json
+import socket
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import uvicorn
+from fastapi import FastAPI, Request, WebSocket
+from websockets.asyncio.client import connect
+from websockets.asyncio.server import serve
+
+from mylib import Printer
+from mylib.api import HTTPClient, StarletteConnection, WSClient
+
+
+EVENT = {
+    "post_type": "message", "message_type": "group", "group_id": 123456, "user_id": 1,
+    "self_id": 3000000001, "message_id": 1,
+    "message": [{"type": "text", "data": {"text": "hi"}}],
+}
+REPLY = b'{"group_id":123456,"message":[{"type":"text","data":{"text":"miss you~"}}]}'
+ROUNDS = 300
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _ms(samples) -> str:
+    samples = sorted(samples)
+    return f"p50 {statistics.median(samples) * 1000:6.3f}ms  p99 {samples[int(len(samples) * 0.99) - 1] * 1000:6.3f}ms"
+
+
+# ------------------- 本地 Napcat 替身 -------------------
+class FakeNapcatWS:
+    """WebSocket 服务端: 回应 API 帧, 并能主动推送事件; 记录每个 API 帧的到达时间"""
+    def __init__(self):
+        self.conns = set()
+        self.arrivals = asyncio.Queue()
+
+    async def handler(self, ws):
+        self.conns.add(ws)
+        try:
+            async for frame in ws:
+                await self.arrivals.put(time.perf_counter())
+                request = json.loads(frame)
+                # get_msg 的响应 data 是一条完整的消息事件 (带 post_type)
+                data = EVENT if request["action"] == "get_msg" else {"message_id": 1}
+                await ws.send(json.dumps({"status": "ok", "retcode": 0, "data": data, "echo": request["echo"]}))
+        finally:
+            self.conns.discard(ws)
+
+    async def push(self, event: dict) -> None:
+        for ws in list(self.conns):
+            await ws.send(json.dumps(event))
+
+    async def drop_all(self) -> None:
+        for ws in list(self.conns):
+            await ws.close()
+
+
+class FakeNapcatHTTP(BaseHTTPRequestHandler):
+    """HTTP 接口替身, 记录请求到达时间"""
+    arrivals: "asyncio.Queue" = None
+    loop: asyncio.AbstractEventLoop = None
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        # 响应头与响应体分两次写出, 不关 Nagle 会撞上延迟确认 (约 40ms), 真实 Napcat 没有这个问题
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def do_POST(self):
+        arrived = time.perf_counter()
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        body = b'{"status":"ok","retcode":0,"data":{"message_id":1}}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        self.loop.call_soon_threadsafe(self.arrivals.put_nowait, arrived)
+
+    def log_message(self, *args):
+        pass
+
+
+async def _uvicorn(app: FastAPI, port: int):
+    """在当前事件循环里启动 uvicorn, 返回 (server, 任务)"""
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+    return server, task
+
+
+async def _shutdown(server: uvicorn.Server, task: asyncio.Task) -> None:
+    server.should_exit = True
+    await task
+
+
+# ------------------- forward WebSocket vs HTTP -------------------
+async def bench_forward(p: Printer):
+    napcat = FakeNapcatWS()
+    port = _free_port()
+    async with serve(napcat.handler, "127.0.0.1", port):
+        client = WSClient("forward", url=f"ws://127.0.0.1:{port}", backoff=0.05, backoff_max=0.2)
+        client.on_event = lambda frame, data: client.call("send_group_msg", REPLY)
+        await client.start()
+        await client.call("get_status")
+        await napcat.arrivals.get()
+
+        calls = []
+        for _ in range(ROUNDS):
+            t = time.perf_counter()
+            result = await client.call("send_group_msg", REPLY)
+            calls.append(time.perf_counter() - t)
+            await napcat.arrivals.get()
+        assert result["data"]["message_id"] == 1
+
+        events = []
+        for _ in range(ROUNDS):
+            t = time.perf_counter()
+            await napcat.push(EVENT)
+            events.append(await napcat.arrivals.get() - t)
+
+        # 响应里嵌着事件的接口仍按 echo 返回, 不会被当成事件
+        events_before = client.events
+        message = await client.call("get_msg", {"message_id": 1})
+        nested_ok = message["data"]["post_type"] == "message" and client.events == events_before
+
+        # 不是合法 JSON 对象的帧被丢弃, 读循环不中断
+        for ws in list(napcat.conns):
+            await ws.send("{not json")
+            await ws.send("[1, 2]")
+        status = await asyncio.wait_for(client.call("get_status"), 2)
+        garbage_ok = status["status"] == "ok" and client.events == events_before
+
+        # 断线重连: 断开后发起的幂等调用会等到重连完成
+        await napcat.drop_all()
+        t = time.perf_counter()
+        await client.call("get_status")
+        reconnect = time.perf_counter() - t
+        await client.stop()
+
+    p.cprint("green", f"  ws   API 调用往返          {_ms(calls)}")
+    p.cprint("green", f"  ws   事件 -> 回复到达      {_ms(events)}")
+    p.cprint("blue", f"  断线后调用完成 {reconnect * 1000:.1f}ms, 连接次数 {client.connects}")
+    p.cprint("green" if nested_ok else "red", f"  get_msg (data 内含 post_type) 按 echo 返回: {nested_ok}")
+    p.cprint("green" if garbage_ok else "red", f"  非 JSON / 非对象帧被丢弃, 连接继续可用: {garbage_ok}")
+    return calls, events
+
+
+async def bench_http(p: Printer):
+    loop = asyncio.get_running_loop()
+    FakeNapcatHTTP.arrivals, FakeNapcatHTTP.loop = asyncio.Queue(), loop
+    napcat = ThreadingHTTPServer(("127.0.0.1", 0), FakeNapcatHTTP)
+    threading.Thread(target=napcat.serve_forever, daemon=True).start()
+    client = HTTPClient(f"http://127.0.0.1:{napcat.server_address[1]}")
+
+    calls = []
+    for _ in range(ROUNDS):
+        t = time.perf_counter()
+        await client.call("send_group_msg", REPLY)
+        calls.append(time.perf_counter() - t)
+        await FakeNapcatHTTP.arrivals.get()
+
+    # webhook: Napcat POST 事件 -> 我们再 POST /send_group_msg
+    app = FastAPI()
+
+    @app.post("/")
+    async def webhook(request: Request):
+        await request.body()
+        await client.call("send_group_msg", REPLY)
+        return {}
+
+    port = _free_port()
+    server, task = await _uvicorn(app, port)
+    conn = http.client.HTTPConnection("127.0.0.1", port)
+    body = json.dumps(EVENT).encode()
+
+    def post():
+        conn.request("POST", "/", body, {"Content-Type": "application/json"})
+        conn.getresponse().read()
+
+    events = []
+    for _ in range(ROUNDS):
+        t = time.perf_counter()
+        await asyncio.to_thread(post)
+        events.append(await FakeNapcatHTTP.arrivals.get() - t)
+
+    conn.close()
+    await _shutdown(server, task)
+    napcat.shutdown()
+    client.close()
+    p.cprint("yellow", f"  http API 调用往返          {_ms(calls)}")
+    p.cprint("yellow", f"  http 事件 -> 回复到达      {_ms(events)}")
+    return calls, events
+
+
+# ------------------- reverse WebSocket -------------------
+async def check_reverse(p: Printer):
+    client = WSClient("reverse", token="secret")
+    client.on_event = lambda frame, data: client.call("send_group_msg", REPLY)
+    app = FastAPI()
+
+    @app.websocket(client.path)
+    async def onebot_ws(ws: WebSocket):
+        if not client.authorized(ws.headers.get("authorization"), ws.query_params.get("access_token")):
+            await ws.close(code=1008)
+            return
+        await ws.accept()
+        await client.attach(StarletteConnection(ws))
+
+    port = _free_port()
+    server, task = await _uvicorn(app, port)
+    url = f"ws://127.0.0.1:{port}{client.path}"
+
+    rejected = False
+    try:
+        async with connect(url) as ws:
+            await ws.recv()
+    except Exception:
+        rejected = True
+
+    async with connect(url, additional_headers={"Authorization": "Bearer secret"}) as ws:
+        await ws.send(json.dumps(EVENT))
+        request = json.loads(await ws.recv())
+        await ws.send(json.dumps({"status": "ok", "retcode": 0, "data": None, "echo": request["echo"]}))
+        await asyncio.sleep(0.05)
+        ok = request["action"] == "send_group_msg" and request["params"]["group_id"] == 123456
+    await asyncio.sleep(0.05)
+    await _shutdown(server, task)
+
+    p.cprint("green" if ok and rejected else "red",
+             f"  reverse: 无 token 被拒绝 {rejected}, 事件 -> send_group_msg 帧 {ok}, "
+             f"断开后 connected={client.connected}")
+
+
+async def main():
+    p = Printer()
+    p.cprint("cyan", f"\n=== 本地替身 Napcat, 各 {ROUNDS} 轮 ===")
+    ws_calls, ws_events = await bench_forward(p)
+    http_calls, http_events = await bench_http(p)
+    p.cprint("cyan", f"  API 调用 ws 快 {statistics.median(http_calls) / statistics.median(ws_calls):.1f}x, "
+                     f"事件 -> 回复 ws 快 {statistics.median(http_events) / statistics.median(ws_events):.1f}x")
+    p.cprint("cyan", "\n=== reverse 模式 ===")
+    await check_reverse(p)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())